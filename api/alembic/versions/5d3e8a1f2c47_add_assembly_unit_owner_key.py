@@ -0,0 +1,50 @@
+"""add assembly unit owner key
+
+Revision ID: 5d3e8a1f2c47
+Revises: 1b0d4b81b5a4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.features.assemblies.owners import normalize_owner_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5d3e8a1f2c47"
+down_revision: Union[str, Sequence[str], None] = "1b0d4b81b5a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("assembly_units", sa.Column("owner_key", sa.String(length=255), nullable=True))
+
+    units = sa.table(
+        "assembly_units",
+        sa.column("id", sa.Integer),
+        sa.column("owner_name", sa.String),
+        sa.column("owner_key", sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(sa.select(units.c.id, units.c.owner_name)).all()
+    if rows:
+        bind.execute(
+            units.update().where(units.c.id == sa.bindparam("unit_id")),
+            [{"unit_id": unit_id, "owner_key": normalize_owner_name(owner_name)} for unit_id, owner_name in rows],
+        )
+
+    op.alter_column("assembly_units", "owner_key", nullable=False)
+    op.drop_index("idx_assembly_units_owner", table_name="assembly_units")
+    op.create_index("idx_assembly_units_owner_key", "assembly_units", ["assembly_id", "owner_key"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("idx_assembly_units_owner_key", table_name="assembly_units")
+    op.create_index("idx_assembly_units_owner", "assembly_units", ["owner_name"], unique=False)
+    op.drop_column("assembly_units", "owner_key")
@@ -0,0 +1,54 @@
+"""add attendance stats
+
+Revision ID: 8e1f0c6d4b93
+Revises: 5d3e8a1f2c47
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e1f0c6d4b93"
+down_revision: Union[str, Sequence[str], None] = "5d3e8a1f2c47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "attendance_stats",
+        sa.Column("assembly_id", sa.Integer(), nullable=False),
+        sa.Column("total_units", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("total_fraction", sa.Numeric(precision=10, scale=2), server_default="0", nullable=False),
+        sa.Column("units_present", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("fraction_present", sa.Numeric(precision=10, scale=2), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["assembly_id"], ["assemblies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("assembly_id"),
+    )
+    op.execute(
+        """
+        INSERT INTO attendance_stats (assembly_id, total_units, total_fraction, units_present, fraction_present)
+        SELECT
+            u.assembly_id,
+            COUNT(*),
+            SUM(u.ideal_fraction),
+            COUNT(present.assembly_unit_id),
+            COALESCE(SUM(CASE WHEN present.assembly_unit_id IS NOT NULL THEN u.ideal_fraction END), 0)
+        FROM assembly_units u
+        LEFT JOIN (
+            SELECT DISTINCT assembly_unit_id FROM qr_code_assigned_units
+        ) present ON present.assembly_unit_id = u.id
+        GROUP BY u.assembly_id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("attendance_stats")
@@ -0,0 +1,65 @@
+"""unique assigned unit
+
+Revision ID: e2b7c9d4a1f3
+Revises: c4a7e2d9f1b6
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b7c9d4a1f3"
+down_revision: Union[str, Sequence[str], None] = "c4a7e2d9f1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Units checked in twice must be resolved by hand (votes may have been
+    # cast through either link), so refuse to run instead of picking one.
+    duplicates = [
+        row[0]
+        for row in op.get_bind().execute(
+            sa.text(
+                """
+                SELECT assembly_unit_id FROM qr_code_assigned_units
+                GROUP BY assembly_unit_id HAVING COUNT(*) > 1
+                ORDER BY assembly_unit_id
+                """
+            )
+        )
+    ]
+    if duplicates:
+        raise RuntimeError(
+            "Units checked in more than once; undo the extra check-ins before upgrading "
+            f"(qr_code_assigned_units.assembly_unit_id): {', '.join(map(str, duplicates))}"
+        )
+    op.drop_index("idx_qr_assigned_units_unit", table_name="qr_code_assigned_units")
+    op.create_unique_constraint("uq_assigned_unit", "qr_code_assigned_units", ["assembly_unit_id"])
+    # Totals may still count duplicates undone before this upgrade.
+    op.execute(
+        """
+        UPDATE attendance_stats SET
+            units_present = (
+                SELECT COUNT(*) FROM assembly_units u
+                JOIN qr_code_assigned_units qau ON qau.assembly_unit_id = u.id
+                WHERE u.assembly_id = attendance_stats.assembly_id
+            ),
+            fraction_present = (
+                SELECT COALESCE(SUM(u.ideal_fraction), 0) FROM assembly_units u
+                JOIN qr_code_assigned_units qau ON qau.assembly_unit_id = u.id
+                WHERE u.assembly_id = attendance_stats.assembly_id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_assigned_unit", "qr_code_assigned_units", type_="unique")
+    op.create_index("idx_qr_assigned_units_unit", "qr_code_assigned_units", ["assembly_unit_id"], unique=False)
@@ -0,0 +1,109 @@
+"""Bounded in-process caches."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache whose entries also expire after a TTL.
+
+    Every invalidation bumps a generation counter; loaders capture it before
+    reading the database and pass it to ``set`` so a value loaded before an
+    invalidation is never stored afterwards.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Current invalidation generation."""
+        return self._generation
+
+    def get(self, key: K) -> Optional[V]:
+        """Return cached value or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, generation: Optional[int] = None) -> None:
+        """Store a value, unless an invalidation happened since ``generation``."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionCounter(Generic[K]):
+    """Thread-safe per-key change counters (e.g. for ETags).
+
+    Versions are drawn from one increasing sequence. ``bump_all`` raises a
+    floor that every key reads at least, so keys never seen in this process
+    change too and no earlier version is handed out again.
+    """
+
+    def __init__(self) -> None:
+        self._versions: dict[K, int] = {}
+        self._sequence = 0
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> int:
+        """Return current version for a key."""
+        return max(self._versions.get(key, 0), self._floor)
+
+    def bump(self, key: K) -> int:
+        """Record a change and return the new version."""
+        with self._lock:
+            self._sequence += 1
+            self._versions[key] = self._sequence
+            return self._sequence
+
+    def bump_all(self) -> None:
+        """Record a change on every key, known or not."""
+        with self._lock:
+            self._sequence += 1
+            self._floor = self._sequence
+            self._versions.clear()
+
+    def clear(self) -> None:
+        """Reset every counter."""
+        with self._lock:
+            self._versions.clear()
+            self._sequence = 0
+            self._floor = 0
@@ -2,7 +2,7 @@
 Application settings using Pydantic BaseSettings.
 Loads from environment variables with validation.
 """
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 
 from pydantic import ConfigDict, field_validator
 from pydantic_settings import BaseSettings
@@ -18,6 +18,33 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+
+    # Worker threads used to run blocking (sync DB) request handlers
+    THREADPOOL_SIZE: int = 40
+
+    # Real-time fan-out: "memory" (single process) or "postgres" (LISTEN/NOTIFY across workers)
+    BROADCAST_BACKEND: Literal["memory", "postgres"] = "memory"
+    BROADCAST_CHANNEL: str = "delibera_events"
+    # Connections per worker used to send NOTIFY (postgres backend)
+    BROADCAST_PUBLISH_CONNECTIONS: int = 4
+    # Pending events per SSE connection; a full queue coalesces state events or disconnects
+    SSE_QUEUE_SIZE: int = 64
+    SSE_SLOW_CONSUMER_POLICY: Literal["coalesce", "disconnect"] = "coalesce"
+    SSE_REPLAY_BUFFER_SIZE: int = 256
+    # How long an assembly's replay buffer is kept after its last connection closes
+    SSE_REPLAY_RETENTION_SECONDS: float = 300.0
+    SSE_HEARTBEAT_SECONDS: float = 30.0
+    # vote_update events per agenda per second (votes in between are batched)
+    VOTE_UPDATE_MAX_PER_SECOND: float = 4.0
+    # Bearer token of GET /realtime/metrics (platform-wide; the endpoint is off when unset)
+    REALTIME_METRICS_TOKEN: Optional[str] = None
+
+    # Public voting caches
+    QR_TOKEN_CACHE_SIZE: int = 10000
+    QR_TOKEN_CACHE_TTL_SECONDS: int = 300
 
     # Security
     SECRET_KEY: str
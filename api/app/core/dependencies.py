@@ -2,6 +2,7 @@
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status, Cookie
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
@@ -14,11 +15,15 @@ from app.features.users.models import User
 security = HTTPBearer()
 
 
-async def get_current_user(
-    access_token: Optional[str] = Cookie(None),
-    db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token in httpOnly cookie."""
+def _get_user(db: Session, user_id: int) -> Optional[User]:
+    return db.query(User).filter(
+        User.id == user_id,
+        User.deleted_at.is_(None),
+    ).first()
+
+
+def decode_access_token(access_token: Optional[str]) -> int:
+    """Return the user id of a valid access token (401 otherwise)."""
     if not access_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
 
@@ -27,23 +32,30 @@ async def get_current_user(
         raw_user_id = payload.get("sub")
         if raw_user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-        user_id = int(raw_user_id)
+        return int(raw_user_id)
     except JWTError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     except (TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.deleted_at.is_(None),
-    ).first()
 
+def get_active_user(db: Session, user_id: int) -> User:
+    """Load an active user (401 if missing or inactive)."""
+    user = _get_user(db, user_id)
     if user is None or user.status != UserStatus.active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-
     return user
 
 
+async def get_current_user(
+    access_token: Optional[str] = Cookie(None),
+    db: Session = Depends(get_db),
+) -> User:
+    """Get current authenticated user from JWT token in httpOnly cookie."""
+    user_id = decode_access_token(access_token)
+    return await run_in_threadpool(get_active_user, db, user_id)
+
+
 async def get_current_tenant(current_user: User = Depends(get_current_user)) -> int:
     """Get current tenant ID from authenticated user."""
     return current_user.tenant_id
@@ -0,0 +1,37 @@
+"""Conditional GET helpers (ETag / If-None-Match)."""
+from __future__ import annotations
+
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Request, Response, status
+
+# Distinguishes in-process version counters across restarts and workers.
+BOOT_ID = uuid4().hex[:12]
+
+# Clients may store the response but must revalidate before reuse.
+NO_CACHE = "no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from version parts."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match matches ``etag``."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    """Build an empty 304 response."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
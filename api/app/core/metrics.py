@@ -0,0 +1,37 @@
+"""Lightweight in-process metrics."""
+from __future__ import annotations
+
+import bisect
+from typing import Sequence
+
+# Seconds; the last bucket (+Inf) is implicit.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (Prometheus-style cumulative output).
+
+    Observed from the event loop only, so it needs no lock.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        seconds = max(seconds, 0.0)
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> dict:
+        """Return cumulative bucket counts, total count and sum."""
+        cumulative = 0
+        buckets = []
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            cumulative += count
+            buckets.append({"le": "+Inf" if bound == float("inf") else str(bound), "count": cumulative})
+        return {"buckets": buckets, "count": self.count, "sum": self.sum}
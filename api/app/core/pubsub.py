@@ -0,0 +1,291 @@
+"""
+Process-to-process publish/subscribe.
+Carries SSE events and cache invalidations. The in-memory backend (default)
+only reaches the current process; the Postgres backend uses LISTEN/NOTIFY so
+every worker and node sees every message.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from anyio import to_thread
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process so it can ignore its own cache invalidations.
+PROCESS_ID = uuid4().hex
+
+Handler = Callable[[dict], None]
+
+
+class PubSubBackend(ABC):
+    """Delivers messages published on a channel to its local subscriber.
+
+    Handlers run on the event loop thread and must not block.
+    """
+
+    #: True when messages reach other processes.
+    shared = False
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, Handler] = {}
+        self._reconnect_hooks: list[Callable[[], None]] = []
+
+    def subscribe(self, channel: str, handler: Handler) -> None:
+        """Register the handler for a channel."""
+        self._handlers[channel] = handler
+
+    def on_reconnect(self, hook: Callable[[], None]) -> None:
+        """Register a hook run (on the event loop) after messages may have been missed."""
+        self._reconnect_hooks.append(hook)
+
+    def _run_reconnect_hooks(self) -> None:
+        for hook in self._reconnect_hooks:
+            try:
+                hook()
+            except Exception:
+                logger.exception("Reconnect hook failed")
+
+    async def start(self) -> None:
+        """Start receiving messages."""
+
+    async def stop(self) -> None:
+        """Stop receiving messages and release resources."""
+
+    @abstractmethod
+    def publish(self, channel: str, message: dict) -> None:
+        """Publish from sync code (any thread)."""
+
+    async def publish_async(self, channel: str, message: dict) -> None:
+        """Publish from the event loop."""
+        self.publish(channel, message)
+
+    def _dispatch(self, channel: str, message: dict) -> None:
+        handler = self._handlers.get(channel)
+        if handler is not None:
+            handler(message)
+
+
+class InMemoryBackend(PubSubBackend):
+    """Delivers messages to subscribers of this process only."""
+
+    def publish(self, channel: str, message: dict) -> None:
+        self._dispatch(channel, message)
+
+
+class PostgresNotifyBackend(PubSubBackend):
+    """Fans messages out to every process through Postgres LISTEN/NOTIFY.
+
+    Published messages are delivered back to this process through LISTEN as
+    well, so every process sees the same order. NOTIFY payloads are limited
+    to 8000 bytes, which is plenty for the event payloads we send.
+
+    NOTIFY goes through a small pool of connections, so publishing threads
+    do not queue behind one socket. A message that cannot be sent is lost
+    for every process, including this one, so the reconnect hooks run as if
+    LISTEN had dropped.
+    """
+
+    shared = True
+
+    def __init__(self, dsn: str, channel: str, publish_connections: int = 4) -> None:
+        super().__init__()
+        self.dsn = dsn
+        self.channel = channel
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_conn = None
+        self._idle_conns: list = []
+        self._idle_lock = threading.Lock()
+        self._publish_slots = threading.BoundedSemaphore(publish_connections)
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._closing = False
+        await self._listen()
+
+    async def _listen(self) -> None:
+        from psycopg2 import sql
+
+        conn = await to_thread.run_sync(self._connect)
+        with conn.cursor() as cursor:
+            cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        self._listen_conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _on_readable(self) -> None:
+        import psycopg2
+
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except psycopg2.Error:
+            logger.warning("Lost LISTEN connection; reconnecting", exc_info=True)
+            self._drop_listener()
+            self._reconnect_task = self._loop.create_task(self._reconnect())
+            return
+
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+                self._dispatch(payload["channel"], payload["message"])
+            except Exception:
+                logger.exception("Failed to handle notification")
+
+    def _drop_listener(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is None:
+            return
+        try:
+            self._loop.remove_reader(conn.fileno())
+        except (ValueError, OSError):
+            pass
+        conn.close()
+
+    async def _reconnect(self) -> None:
+        import psycopg2
+
+        delay = 1.0
+        while not self._closing:
+            try:
+                await self._listen()
+            except psycopg2.Error:
+                logger.warning("LISTEN reconnect failed; retrying in %.0fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+                continue
+            self._run_reconnect_hooks()
+            return
+
+    def publish(self, channel: str, message: dict) -> None:
+        import psycopg2
+
+        payload = json.dumps({"channel": channel, "message": message}, separators=(",", ":"))
+        with self._publish_slots:
+            for attempt in range(2):
+                with self._idle_lock:
+                    conn = self._idle_conns.pop() if self._idle_conns else None
+                try:
+                    if conn is None or conn.closed:
+                        conn = self._connect()
+                    with conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+                except psycopg2.Error:
+                    if conn is not None:
+                        conn.close()
+                    if attempt:
+                        logger.warning("Failed to publish on %s; resetting caches", channel, exc_info=True)
+                    continue
+                with self._idle_lock:
+                    self._idle_conns.append(conn)
+                return
+        self._publish_failed()
+
+    def _publish_failed(self) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self._run_reconnect_hooks()
+        else:
+            loop.call_soon_threadsafe(self._run_reconnect_hooks)
+
+    async def publish_async(self, channel: str, message: dict) -> None:
+        await to_thread.run_sync(self.publish, channel, message)
+
+    async def stop(self) -> None:
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        self._drop_listener()
+        with self._idle_lock:
+            conns, self._idle_conns = self._idle_conns, []
+        for conn in conns:
+            conn.close()
+
+
+class CacheSync:
+    """Propagates in-process cache invalidations to the other processes.
+
+    Each cache registers a topic with a handler that drops the key locally
+    (without publishing again) and a reset used after a LISTEN reconnect or
+    a failed publish, when invalidations may have been missed.
+    """
+
+    CHANNEL = "cache"
+
+    def __init__(self, backend: PubSubBackend) -> None:
+        self.backend = backend
+        self._handlers: dict[str, Callable[[Any], None]] = {}
+        self._resets: list[Callable[[], None]] = []
+        backend.subscribe(self.CHANNEL, self._on_message)
+        backend.on_reconnect(self.reset)
+
+    def register(
+        self,
+        topic: str,
+        handler: Callable[[Any], None],
+        reset: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Register how a cache applies remote invalidations (``reset`` may be shared by topics)."""
+        self._handlers[topic] = handler
+        if reset is not None:
+            self._resets.append(reset)
+
+    def publish(self, topic: str, key: Any) -> None:
+        """Tell the other processes that ``key`` changed (no-op when not shared)."""
+        if self.backend.shared:
+            self.backend.publish(self.CHANNEL, {"origin": PROCESS_ID, "topic": topic, "key": key})
+
+    async def publish_async(self, topic: str, key: Any) -> None:
+        """Like ``publish``, from the event loop (never blocks it)."""
+        if self.backend.shared:
+            await self.backend.publish_async(self.CHANNEL, {"origin": PROCESS_ID, "topic": topic, "key": key})
+
+    def _on_message(self, message: dict) -> None:
+        if message.get("origin") == PROCESS_ID:
+            return
+        handler = self._handlers.get(message.get("topic"))
+        if handler is not None:
+            handler(message["key"])
+
+    def reset(self) -> None:
+        """Drop every registered cache."""
+        for reset in self._resets:
+            reset()
+
+
+def _postgres_dsn(database_url: str) -> str:
+    return make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def create_backend() -> PubSubBackend:
+    """Build the backend selected by BROADCAST_BACKEND."""
+    if settings.BROADCAST_BACKEND == "postgres":
+        return PostgresNotifyBackend(
+            _postgres_dsn(settings.DATABASE_URL),
+            settings.BROADCAST_CHANNEL,
+            settings.BROADCAST_PUBLISH_CONNECTIONS,
+        )
+    return InMemoryBackend()
+
+
+pubsub = create_backend()
+cache_sync = CacheSync(pubsub)
@@ -2,9 +2,11 @@
 from math import ceil
 
 from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.enums import AgendaStatus
 from app.core.dependencies import get_current_tenant, require_property_manager
 from app.features.agendas import service
 from app.features.realtime.sse import notify_agenda_status
@@ -20,7 +22,7 @@ router = APIRouter()
     summary="Create agenda",
     dependencies=[Depends(require_property_manager)],
 )
-async def create_agenda(
+def create_agenda(
     agenda: AgendaCreate,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -36,7 +38,7 @@ async def create_agenda(
     summary="List agendas",
     dependencies=[Depends(require_property_manager)],
 )
-async def list_agendas(
+def list_agendas(
     page: int = 1,
     page_size: int = 20,
     include_cancelled: bool = False,
@@ -65,7 +67,7 @@ async def list_agendas(
     summary="Get agenda",
     dependencies=[Depends(require_property_manager)],
 )
-async def get_agenda(
+def get_agenda(
     agenda_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -88,9 +90,9 @@ async def update_agenda(
     tenant_id: int = Depends(get_current_tenant),
 ) -> AgendaResponse:
     """Update agenda."""
-    existing_agenda = service.get_agenda(db, agenda_id, tenant_id)
+    existing_agenda = await run_in_threadpool(service.get_agenda, db, agenda_id, tenant_id)
     previous_status = existing_agenda.status
-    db_agenda = service.update_agenda(db, agenda_id, agenda, tenant_id)
+    db_agenda = await run_in_threadpool(service.update_agenda, db, agenda_id, agenda, tenant_id)
     if db_agenda.status != previous_status:
         await notify_agenda_status(db_agenda.assembly_id, db_agenda.id, db_agenda.status.value)
     return AgendaResponse.model_validate(db_agenda)
@@ -108,4 +110,8 @@ async def delete_agenda(
     tenant_id: int = Depends(get_current_tenant),
 ) -> None:
     """Cancel agenda."""
-    service.delete_agenda(db, agenda_id, tenant_id)
+    existing_agenda = await run_in_threadpool(service.get_agenda, db, agenda_id, tenant_id)
+    previous_status = existing_agenda.status
+    await run_in_threadpool(service.delete_agenda, db, agenda_id, tenant_id)
+    if previous_status != AgendaStatus.cancelled:
+        await notify_agenda_status(existing_agenda.assembly_id, agenda_id, AgendaStatus.cancelled.value)
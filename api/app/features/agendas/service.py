@@ -8,6 +8,8 @@ from app.features.agendas.models import Agenda, AgendaOption
 from app.features.agendas.schemas import AgendaCreate, AgendaUpdate
 from app.features.assemblies.models import Assembly
 from app.features.condominiums.models import Condominium
+from app.features.voting.ballot import ballot_cache
+from app.features.voting.tally import tally_registry
 
 
 def _get_assembly(db: Session, assembly_id: int, tenant_id: int) -> Assembly:
@@ -138,7 +140,11 @@ def update_agenda(db: Session, agenda_id: int, agenda_update: AgendaUpdate, tena
         db.add_all(db_options)
 
     db.commit()
+    if options_data is not None:
+        tally_registry.invalidate(agenda.id)
     db.refresh(agenda)
+    if "status" in update_data or agenda.status == AgendaStatus.open:
+        ballot_cache.refresh(db, agenda.assembly_id, tenant_id)
 
     return agenda
 
@@ -150,3 +156,4 @@ def delete_agenda(db: Session, agenda_id: int, tenant_id: int) -> None:
         return
     agenda.status = AgendaStatus.cancelled
     db.commit()
+    ballot_cache.invalidate(agenda.assembly_id)
@@ -0,0 +1,32 @@
+"""Cache of the tenant owning each assembly, used to authorize SSE streams."""
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.features.assemblies.models import Assembly
+from app.features.condominiums.models import Condominium
+
+# An assembly never changes tenant (it can only move between condominiums of
+# the same tenant and is cancelled, not deleted), so entries need no
+# invalidation; the TTL only bounds memory.
+assembly_tenant_cache: TTLCache[int, int] = TTLCache(maxsize=1024, ttl_seconds=3600)
+
+
+def get_assembly_tenant(db: Session, assembly_id: int) -> Optional[int]:
+    """Return the tenant of an assembly (None if it does not exist)."""
+    tenant_id = assembly_tenant_cache.get(assembly_id)
+    if tenant_id is not None:
+        return tenant_id
+
+    tenant_id = (
+        db.query(Condominium.tenant_id)
+        .join(Assembly, Assembly.condominium_id == Condominium.id)
+        .filter(Assembly.id == assembly_id)
+        .scalar()
+    )
+    if tenant_id is not None:
+        assembly_tenant_cache.set(assembly_id, tenant_id)
+    return tenant_id
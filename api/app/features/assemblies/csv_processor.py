@@ -11,9 +11,13 @@ from io import StringIO
 from typing import Any, Dict, List
 
 from fastapi import HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.features.assemblies.models import AssemblyUnit
+from app.features.checkin.attendance import record_attendance_change
+from app.features.checkin.models import AttendanceStats
+from app.features.checkin.search import invalidate_unit_search
 
 
 class CSVValidationError(Exception):
@@ -271,6 +275,11 @@ async def import_csv_units(db: Session, file: UploadFile, assembly_id: int) -> L
         unit_numbers_seen.add(validated["unit_number"])
         validated_rows.append(validated)
 
+    return await run_in_threadpool(save_units, db, validated_rows, assembly_id)
+
+
+def save_units(db: Session, validated_rows: List[Dict[str, Any]], assembly_id: int) -> List[AssemblyUnit]:
+    """Persist validated rows as the assembly unit snapshot."""
     existing_units = (
         db.query(AssemblyUnit).filter(AssemblyUnit.assembly_id == assembly_id).first()
     )
@@ -292,7 +301,19 @@ async def import_csv_units(db: Session, file: UploadFile, assembly_id: int) -> L
     ]
 
     db.bulk_save_objects(units)
+    # Nobody can be checked in before the units exist.
+    db.merge(
+        AttendanceStats(
+            assembly_id=assembly_id,
+            total_units=len(validated_rows),
+            total_fraction=sum((Decimal(str(row["ideal_fraction"])) for row in validated_rows), Decimal("0")),
+            units_present=0,
+            fraction_present=0,
+        )
+    )
     db.commit()
+    record_attendance_change(assembly_id)
+    invalidate_unit_search(assembly_id)
 
     return (
         db.query(AssemblyUnit)
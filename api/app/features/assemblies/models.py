@@ -14,9 +14,11 @@ from sqlalchemy import (
     text,
     func,
 )
+from sqlalchemy.orm import validates
 
 from app.core.database import Base
 from app.core.enums import AssemblyStatus, AssemblyType
+from app.features.assemblies.owners import normalize_owner_name
 
 
 class Assembly(Base):
@@ -48,13 +50,19 @@ class AssemblyUnit(Base):
         CheckConstraint("ideal_fraction > 0 AND ideal_fraction <= 100", name="chk_unit_ideal_fraction"),
         UniqueConstraint("assembly_id", "unit_number", name="uq_assembly_unit_number"),
         Index("idx_assembly_units_assembly", "assembly_id"),
-        Index("idx_assembly_units_owner", "owner_name"),
+        Index("idx_assembly_units_owner_key", "assembly_id", "owner_key"),
     )
 
     id = Column(Integer, primary_key=True)
     assembly_id = Column(Integer, ForeignKey("assemblies.id", ondelete="CASCADE"), nullable=False)
     unit_number = Column(String(50), nullable=False)
     owner_name = Column(String(255), nullable=False)
+    owner_key = Column(String(255), nullable=False)
     ideal_fraction = Column(Numeric(5, 2), nullable=False)
     cpf_cnpj = Column(String(18), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
+
+    @validates("owner_name")
+    def _set_owner_key(self, _key: str, owner_name: str) -> str:
+        self.owner_key = normalize_owner_name(owner_name)
+        return owner_name
@@ -0,0 +1,11 @@
+"""Normalized owner names, used to look units up by owner."""
+from __future__ import annotations
+
+import unicodedata
+
+
+def normalize_owner_name(owner_name: str) -> str:
+    """Fold case and accents and collapse whitespace ("  José  da Silva" -> "jose da silva")."""
+    decomposed = unicodedata.normalize("NFKD", owner_name)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
@@ -1,11 +1,13 @@
 """Assembly CRUD endpoints."""
 from math import ceil
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_tenant, require_property_manager
+from app.core.etag import NO_CACHE, is_not_modified, not_modified
 from app.features.assemblies import service
 from app.features.assemblies.csv_processor import import_csv_units, preview_csv_import
 from app.features.assemblies.schemas import (
@@ -19,6 +21,9 @@ from app.features.assemblies.schemas import (
 
 router = APIRouter()
 
+# Unit snapshots are immutable once imported.
+UNITS_CACHE_CONTROL = "private, max-age=86400, immutable"
+
 
 @router.post(
     "/",
@@ -27,7 +32,7 @@ router = APIRouter()
     summary="Create assembly",
     dependencies=[Depends(require_property_manager)],
 )
-async def create_assembly(
+def create_assembly(
     assembly: AssemblyCreate,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -42,7 +47,7 @@ async def create_assembly(
     response_model=AssemblyListResponse,
     summary="List assemblies",
 )
-async def list_assemblies(
+def list_assemblies(
     page: int = 1,
     page_size: int = 20,
     status: str = "active",
@@ -74,7 +79,7 @@ async def list_assemblies(
     response_model=AssemblyResponse,
     summary="Get assembly",
 )
-async def get_assembly(
+def get_assembly(
     assembly_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -89,12 +94,22 @@ async def get_assembly(
     response_model=AssemblyUnitsListResponse,
     summary="List imported assembly units",
 )
-async def list_units(
+def list_units(
     assembly_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
 ) -> AssemblyUnitsListResponse:
     """List imported units for an assembly snapshot."""
+    etag, total = service.get_units_etag(db, assembly_id, tenant_id)
+    # Nothing imported yet: the list will change on import, keep revalidating.
+    cache_control = UNITS_CACHE_CONTROL if total else NO_CACHE
+    if is_not_modified(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
     units, total, fraction_sum = service.list_assembly_units(db, assembly_id, tenant_id)
     return AssemblyUnitsListResponse(
         items=[AssemblyUnitResponse.model_validate(unit) for unit in units],
@@ -109,7 +124,7 @@ async def list_units(
     summary="Update assembly",
     dependencies=[Depends(require_property_manager)],
 )
-async def update_assembly(
+def update_assembly(
     assembly_id: int,
     assembly: AssemblyUpdate,
     db: Session = Depends(get_db),
@@ -126,7 +141,7 @@ async def update_assembly(
     summary="Delete assembly",
     dependencies=[Depends(require_property_manager)],
 )
-async def delete_assembly(
+def delete_assembly(
     assembly_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -147,7 +162,7 @@ async def preview_units_import(
     tenant_id: int = Depends(get_current_tenant),
 ) -> dict:
     """Preview CSV import (first 10 lines + validation)."""
-    service.get_assembly(db, assembly_id, tenant_id)
+    await run_in_threadpool(service.get_assembly, db, assembly_id, tenant_id)
     return await preview_csv_import(file, assembly_id)
 
 
@@ -163,7 +178,7 @@ async def import_units(
     tenant_id: int = Depends(get_current_tenant),
 ) -> dict:
     """Import units from CSV (creates immutable snapshot)."""
-    service.get_assembly(db, assembly_id, tenant_id)
+    await run_in_threadpool(service.get_assembly, db, assembly_id, tenant_id)
     units = await import_csv_units(db, file, assembly_id)
     return {
         "message": "Units imported successfully",
@@ -6,10 +6,12 @@ from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.core.enums import AssemblyStatus, CondominiumStatus
+from app.core.etag import make_etag
 from app.features.assemblies.models import Assembly, AssemblyUnit
 from app.features.assemblies.schemas import AssemblyCreate, AssemblyUpdate
 from app.features.condominiums.models import Condominium
 from app.features.users.models import User
+from app.features.voting.ballot import ballot_cache
 
 
 def _get_condominium(db: Session, condominium_id: int, tenant_id: int) -> Condominium:
@@ -115,6 +117,30 @@ def list_assemblies(
     return assemblies, total
 
 
+def get_units_etag(db: Session, assembly_id: int, tenant_id: int) -> tuple[str, int]:
+    """Return (ETag, unit count) of the unit snapshot in a single query.
+
+    Units are imported once and never edited, so count and highest id identify
+    the snapshot across processes and restarts.
+    """
+    row = (
+        db.query(func.count(AssemblyUnit.id), func.max(AssemblyUnit.id))
+        .select_from(Assembly)
+        .join(Condominium, Assembly.condominium_id == Condominium.id)
+        .outerjoin(AssemblyUnit, AssemblyUnit.assembly_id == Assembly.id)
+        .filter(
+            Assembly.id == assembly_id,
+            Condominium.tenant_id == tenant_id,
+        )
+        .group_by(Assembly.id)
+        .first()
+    )
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+    total, max_id = row
+    return make_etag("units", assembly_id, total, max_id or 0), total
+
+
 def list_assembly_units(
     db: Session,
     assembly_id: int,
@@ -170,6 +196,7 @@ def update_assembly(
         setattr(assembly, field, value)
 
     db.commit()
+    ballot_cache.invalidate(assembly.id)
     db.refresh(assembly)
 
     return assembly
@@ -184,3 +211,4 @@ def delete_assembly(db: Session, assembly_id: int, tenant_id: int) -> None:
 
     assembly.status = AssemblyStatus.cancelled
     db.commit()
+    ballot_cache.invalidate(assembly.id)
@@ -26,7 +26,7 @@ def _cookie_kwargs() -> dict[str, object]:
 
 
 @router.post("/login")
-async def login(credentials: LoginRequest, response: Response, db: Session = Depends(get_db)) -> UserResponse:
+def login(credentials: LoginRequest, response: Response, db: Session = Depends(get_db)) -> UserResponse:
     """Login endpoint - authenticates user and sets httpOnly cookies."""
     user = authenticate_user(db, credentials.email, credentials.password)
 
@@ -51,7 +51,7 @@ async def login(credentials: LoginRequest, response: Response, db: Session = Dep
 
 
 @router.post("/refresh")
-async def refresh_token(
+def refresh_token(
     response: Response,
     db: Session = Depends(get_db),
     refresh_token: str | None = Cookie(None),
@@ -0,0 +1,34 @@
+"""
+Attendance change tracking.
+Totals live in the attendance_stats table (see checkin.service); this module
+versions them per assembly, in every process, for quorum and results ETags.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.core.cache import VersionCounter
+from app.core.pubsub import cache_sync
+
+# Bumped after every committed check-in, undo check-in or unit import.
+attendance_versions: VersionCounter[int] = VersionCounter()
+
+
+@dataclass(frozen=True)
+class AttendanceSnapshot:
+    """Attendance totals of an assembly."""
+
+    assembly_id: int
+    total_units: int
+    total_fraction: float
+    units_present: int
+    fraction_present: float
+
+
+def record_attendance_change(assembly_id: int) -> None:
+    """Bump the attendance version after a committed change (in every process)."""
+    attendance_versions.bump(assembly_id)
+    cache_sync.publish("attendance", assembly_id)
+
+
+cache_sync.register("attendance", attendance_versions.bump, attendance_versions.bump_all)
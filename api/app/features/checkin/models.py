@@ -1,5 +1,17 @@
 """SQLAlchemy models for QR code assignments."""
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Boolean, UniqueConstraint, func
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 
 from app.core.database import Base
 
@@ -25,11 +37,45 @@ class QRCodeAssignedUnit(Base):
     __tablename__ = "qr_code_assigned_units"
     __table_args__ = (
         UniqueConstraint("assignment_id", "assembly_unit_id", name="uq_assignment_unit"),
+        # A unit is checked in at most once; concurrent desks cannot both claim it.
+        UniqueConstraint("assembly_unit_id", name="uq_assigned_unit"),
         Index("idx_qr_assigned_units_assignment", "assignment_id"),
-        Index("idx_qr_assigned_units_unit", "assembly_unit_id"),
     )
 
     id = Column(Integer, primary_key=True)
     assignment_id = Column(Integer, ForeignKey("qr_code_assignments.id", ondelete="CASCADE"), nullable=False)
     assembly_unit_id = Column(Integer, ForeignKey("assembly_units.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
+
+
+class AttendanceStats(Base):
+    """Attendance totals of an assembly, kept in step with imports and check-ins."""
+
+    __tablename__ = "attendance_stats"
+
+    assembly_id = Column(Integer, ForeignKey("assemblies.id", ondelete="CASCADE"), primary_key=True)
+    total_units = Column(Integer, nullable=False, server_default="0")
+    total_fraction = Column(Numeric(10, 2), nullable=False, server_default="0")
+    units_present = Column(Integer, nullable=False, server_default="0")
+    fraction_present = Column(Numeric(10, 2), nullable=False, server_default="0")
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class ProcessedSyncOperation(Base):
+    """Outcome of a desk sync operation, keyed by its client idempotency key."""
+
+    __tablename__ = "checkin_sync_operations"
+    __table_args__ = (
+        UniqueConstraint("assembly_id", "idempotency_key", name="uq_sync_operation_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    assembly_id = Column(Integer, ForeignKey("assemblies.id", ondelete="CASCADE"), nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    operation = Column(String(16), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    detail = Column(Text, nullable=True)
+    # Not a foreign key: the assignment may be undone by a later operation.
+    assignment_id = Column(Integer, nullable=True)
+    processed_by = Column(Integer, ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+    processed_at = Column(DateTime, server_default=func.now())
@@ -1,18 +1,26 @@
 """Check-in endpoints."""
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_tenant, get_current_user, require_operator_or_manager
 from app.features.checkin import service
-from app.features.realtime.sse import notify_checkin
+from app.features.realtime.sse import notify_checkin, notify_checkin_removed
 from app.features.checkin.schemas import (
+    MAX_ATTENDANCE_PAGE_SIZE,
     AttendanceListResponse,
+    BulkCheckInRequest,
+    BulkCheckInResponse,
     CheckInRequest,
     CheckInResponse,
+    CheckInSyncRequest,
+    CheckInSyncResponse,
     SelectUnitsByOwnerRequest,
+    UnitSearchResponse,
 )
 
 router = APIRouter()
@@ -33,7 +41,8 @@ async def checkin(
     current_user=Depends(get_current_user),
 ) -> CheckInResponse:
     """Assign QR code to units (check-in process)."""
-    assignment = service.assign_qr_code(
+    assignment = await run_in_threadpool(
+        service.assign_qr_code,
         db,
         assembly_id,
         checkin_data.qr_token,
@@ -43,11 +52,94 @@ async def checkin(
         current_user.id,
         tenant_id,
     )
-    units_present, fraction_present = service.get_attendance_summary(db, assembly_id, tenant_id)
+    units_present, fraction_present = await run_in_threadpool(
+        service.get_attendance_summary,
+        db,
+        assembly_id,
+        tenant_id,
+    )
     await notify_checkin(assembly_id, units_present, fraction_present)
     return CheckInResponse.model_validate(assignment)
 
 
+@router.post(
+    "/assemblies/{assembly_id}/checkin/bulk",
+    response_model=BulkCheckInResponse,
+    summary="Check-in many QR codes at once",
+    dependencies=[Depends(require_operator_or_manager)],
+)
+async def bulk_checkin(
+    assembly_id: int,
+    payload: BulkCheckInRequest,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant),
+    current_user=Depends(get_current_user),
+) -> BulkCheckInResponse:
+    """Assign QR codes to units for a whole list; invalid entries are reported, not fatal."""
+    assignments, errors = await run_in_threadpool(
+        service.bulk_assign_qr_codes,
+        db,
+        assembly_id,
+        payload.entries,
+        current_user.id,
+        tenant_id,
+    )
+    if assignments:
+        units_present, fraction_present = await run_in_threadpool(
+            service.get_attendance_summary,
+            db,
+            assembly_id,
+            tenant_id,
+        )
+        await notify_checkin(assembly_id, units_present, fraction_present)
+    return BulkCheckInResponse(
+        created=[CheckInResponse.model_validate(assignment) for assignment in assignments],
+        errors=errors,
+    )
+
+
+@router.post(
+    "/assemblies/{assembly_id}/checkin/sync",
+    response_model=CheckInSyncResponse,
+    summary="Sync a desk's queued check-in operations",
+    dependencies=[Depends(require_operator_or_manager)],
+)
+async def sync_checkin(
+    assembly_id: int,
+    payload: CheckInSyncRequest,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant),
+    current_user=Depends(get_current_user),
+) -> CheckInSyncResponse:
+    """Apply check-ins and undos queued offline, at most once per idempotency key.
+
+    Retrying a sync is safe: operations already processed are reported with
+    ``replayed`` set. The response carries the resulting attendance so the
+    desk can replace its local state.
+    """
+    results, undone_ids, changed = await run_in_threadpool(
+        service.sync_checkin_operations,
+        db,
+        assembly_id,
+        payload.operations,
+        current_user.id,
+        tenant_id,
+    )
+    attendance = await run_in_threadpool(service.get_assembly_attendance, db, assembly_id, tenant_id)
+    present_unit_ids = await run_in_threadpool(service.get_present_unit_ids, db, assembly_id)
+    for assignment_id in undone_ids:
+        await notify_checkin_removed(assembly_id, assignment_id)
+    if changed:
+        await notify_checkin(assembly_id, attendance.units_present, attendance.fraction_present)
+    return CheckInSyncResponse(
+        results=results,
+        total_units=attendance.total_units,
+        units_present=attendance.units_present,
+        fraction_present=attendance.fraction_present,
+        checked_in_unit_ids=present_unit_ids,
+    )
+
+
 @router.delete(
     "/assignments/{assignment_id}",
     status_code=status.HTTP_204_NO_CONTENT,
@@ -60,8 +152,14 @@ async def undo_checkin(
     tenant_id: int = Depends(get_current_tenant),
 ) -> None:
     """Remove QR code assignment (undo check-in)."""
-    assembly_id = service.unassign_qr_code(db, assignment_id, tenant_id)
-    units_present, fraction_present = service.get_attendance_summary(db, assembly_id, tenant_id)
+    assembly_id = await run_in_threadpool(service.unassign_qr_code, db, assignment_id, tenant_id)
+    await notify_checkin_removed(assembly_id, assignment_id)
+    units_present, fraction_present = await run_in_threadpool(
+        service.get_attendance_summary,
+        db,
+        assembly_id,
+        tenant_id,
+    )
     await notify_checkin(assembly_id, units_present, fraction_present)
 
 
@@ -70,14 +168,53 @@ async def undo_checkin(
     response_model=AttendanceListResponse,
     summary="Get attendance list",
 )
-async def get_attendance(
+def get_attendance(
     assembly_id: int,
+    cursor: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_ATTENDANCE_PAGE_SIZE),
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
 ) -> AttendanceListResponse:
-    """Get attendance list for assembly."""
-    attendance = service.get_attendance_list(db, assembly_id, tenant_id)
-    return AttendanceListResponse(items=attendance)
+    """Get attendance list for assembly.
+
+    Pass ``limit`` to page through it; ``next_cursor`` is the ``cursor`` for
+    the next page (null on the last one).
+    """
+    attendance, next_cursor = service.get_attendance_page(db, assembly_id, tenant_id, cursor, limit)
+    return AttendanceListResponse(items=attendance, next_cursor=next_cursor)
+
+
+@router.get(
+    "/assemblies/{assembly_id}/attendance/stream",
+    summary="Stream attendance list as NDJSON",
+    response_class=StreamingResponse,
+)
+def stream_attendance(
+    assembly_id: int,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant),
+) -> StreamingResponse:
+    """Stream the attendance list, one JSON attendance item per line."""
+    lines = service.stream_attendance(db, assembly_id, tenant_id)
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+
+@router.get(
+    "/assemblies/{assembly_id}/units/search",
+    response_model=UnitSearchResponse,
+    summary="Search units for check-in",
+    dependencies=[Depends(require_operator_or_manager)],
+)
+def search_units(
+    assembly_id: int,
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant),
+) -> UnitSearchResponse:
+    """Find units by CPF/CNPJ, unit number prefix or owner name as the operator types."""
+    items = service.search_units(db, assembly_id, q, limit, tenant_id)
+    return UnitSearchResponse(items=items)
 
 
 @router.post(
@@ -85,7 +222,7 @@ async def get_attendance(
     response_model=List[int],
     summary="Select all units by owner",
 )
-async def select_units_by_owner(
+def select_units_by_owner(
     assembly_id: int,
     request: SelectUnitsByOwnerRequest,
     db: Session = Depends(get_db),
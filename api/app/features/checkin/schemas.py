@@ -1,9 +1,21 @@
 """Pydantic schemas for check-in operations."""
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+MAX_BULK_CHECKIN_ENTRIES = 500
+MAX_ATTENDANCE_PAGE_SIZE = 500
+MAX_SYNC_OPERATIONS = 500
+
+
+def _check_unit_ids(value: List[int]) -> List[int]:
+    if not value:
+        raise ValueError("unit_ids must not be empty")
+    if len(value) != len(set(value)):
+        raise ValueError("unit_ids must be unique")
+    return value
 
 
 class CheckInRequest(BaseModel):
@@ -25,11 +37,7 @@ class CheckInRequest(BaseModel):
     @field_validator("unit_ids")
     @classmethod
     def validate_unit_ids(cls, value: List[int]) -> List[int]:
-        if not value:
-            raise ValueError("unit_ids must not be empty")
-        if len(value) != len(set(value)):
-            raise ValueError("unit_ids must be unique")
-        return value
+        return _check_unit_ids(value)
 
     @field_validator("qr_visual_number")
     @classmethod
@@ -52,6 +60,98 @@ class CheckInResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BulkCheckInRequest(BaseModel):
+    """Schema for a batch of check-ins (e.g. a pre-registered proxy list)."""
+
+    entries: List[CheckInRequest]
+
+    @field_validator("entries")
+    @classmethod
+    def validate_entries(cls, value: List[CheckInRequest]) -> List[CheckInRequest]:
+        if not value:
+            raise ValueError("entries must not be empty")
+        if len(value) > MAX_BULK_CHECKIN_ENTRIES:
+            raise ValueError(f"entries must have at most {MAX_BULK_CHECKIN_ENTRIES} items")
+        return value
+
+
+class BulkCheckInError(BaseModel):
+    """Schema for a rejected batch entry."""
+
+    index: int
+    status_code: int
+    detail: str
+
+
+class BulkCheckInResponse(BaseModel):
+    """Schema for batch check-in response (accepted entries in request order)."""
+
+    created: List[CheckInResponse]
+    errors: List[BulkCheckInError]
+
+
+class CheckInSyncOperation(CheckInRequest):
+    """Schema for one queued desk operation.
+
+    ``checkin`` is validated like a CheckInRequest; ``undo`` removes the
+    check-in of the QR code in this assembly and takes no ``unit_ids``.
+    """
+
+    idempotency_key: str = Field(min_length=1, max_length=64)
+    operation: Literal["checkin", "undo"]
+    unit_ids: List[int] = Field(default_factory=list)
+
+    @field_validator("unit_ids")
+    @classmethod
+    def validate_unit_ids(cls, value: List[int]) -> List[int]:
+        # Depends on the operation, checked once every field is set.
+        return value
+
+    @model_validator(mode="after")
+    def validate_operation(self) -> "CheckInSyncOperation":
+        if self.operation == "checkin":
+            _check_unit_ids(self.unit_ids)
+        elif self.unit_ids:
+            raise ValueError("unit_ids are only allowed for checkin")
+        return self
+
+
+class CheckInSyncRequest(BaseModel):
+    """Schema for an ordered log of desk operations."""
+
+    operations: List[CheckInSyncOperation]
+
+    @field_validator("operations")
+    @classmethod
+    def validate_operations(cls, value: List[CheckInSyncOperation]) -> List[CheckInSyncOperation]:
+        if not value:
+            raise ValueError("operations must not be empty")
+        if len(value) > MAX_SYNC_OPERATIONS:
+            raise ValueError(f"operations must have at most {MAX_SYNC_OPERATIONS} items")
+        return value
+
+
+class CheckInSyncResult(BaseModel):
+    """Schema for the outcome of a desk operation (``replayed`` if applied by an earlier sync)."""
+
+    idempotency_key: str
+    operation: str
+    status_code: int
+    detail: Optional[str] = None
+    assignment_id: Optional[int] = None
+    replayed: bool
+
+
+class CheckInSyncResponse(BaseModel):
+    """Schema for sync outcomes and the resulting attendance of the assembly."""
+
+    results: List[CheckInSyncResult]
+    total_units: int
+    units_present: int
+    fraction_present: float
+    checked_in_unit_ids: List[int]
+
+
 class AttendanceUnit(BaseModel):
     """Schema for unit details in attendance list."""
 
@@ -77,6 +177,24 @@ class AttendanceListResponse(BaseModel):
     """Schema for attendance list response."""
 
     items: List[AttendanceItem]
+    next_cursor: Optional[int] = None
+
+
+class UnitSearchItem(BaseModel):
+    """Schema for a unit search result."""
+
+    id: int
+    unit_number: str
+    owner_name: str
+    ideal_fraction: float
+    cpf_cnpj: str
+    checked_in: bool
+
+
+class UnitSearchResponse(BaseModel):
+    """Schema for unit search results (best matches first)."""
+
+    items: List[UnitSearchItem]
 
 
 class SelectUnitsByOwnerRequest(BaseModel):
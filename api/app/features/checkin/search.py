@@ -0,0 +1,166 @@
+"""
+Typeahead search over an assembly's units for the check-in desk.
+Units are an immutable snapshot once imported, so each assembly gets a
+sorted in-memory index that is only dropped when units are imported.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.pubsub import cache_sync
+from app.features.assemblies.models import AssemblyUnit
+from app.features.assemblies.owners import normalize_owner_name
+
+# Sorts after every character, so [prefix, prefix + _PREFIX_END) spans all
+# keys starting with prefix.
+_PREFIX_END = "\U0010ffff"
+
+_DOCUMENT_SEPARATORS = re.compile(r"[.\-/\s]")
+
+
+@dataclass(frozen=True)
+class IndexedUnit:
+    """Unit fields returned by a search."""
+
+    id: int
+    unit_number: str
+    owner_name: str
+    ideal_fraction: float
+    cpf_cnpj: str
+
+
+def _document_digits(value: str) -> str:
+    return _DOCUMENT_SEPARATORS.sub("", value)
+
+
+class _PrefixIndex:
+    """Sorted (key, unit id) pairs answering prefix queries by bisection."""
+
+    def __init__(self, pairs: Iterable[tuple[str, int]]) -> None:
+        ordered = sorted(pairs)
+        self._keys = [key for key, _ in ordered]
+        self._ids = [unit_id for _, unit_id in ordered]
+
+    def match(self, prefix: str) -> list[int]:
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _PREFIX_END, start)
+        return self._ids[start:end]
+
+
+class UnitSearchIndex:
+    """Search index over the units of one assembly.
+
+    Matches, in this order: exact CPF/CNPJ (with or without punctuation),
+    unit number prefix, and owner names where every query word is a prefix
+    of some word of the name (case and accents ignored).
+    """
+
+    def __init__(self, assembly_id: int, units: Iterable[IndexedUnit]) -> None:
+        self.assembly_id = assembly_id
+        self.units = {unit.id: unit for unit in units}
+        self._documents: dict[str, list[int]] = {}
+        for unit in self.units.values():
+            self._documents.setdefault(_document_digits(unit.cpf_cnpj), []).append(unit.id)
+        self._unit_numbers = _PrefixIndex((unit.unit_number.casefold(), unit.id) for unit in self.units.values())
+        self._owner_tokens = _PrefixIndex(
+            (token, unit.id)
+            for unit in self.units.values()
+            for token in set(normalize_owner_name(unit.owner_name).split())
+        )
+        # Tie-break for owner matches: name, then unit number.
+        self._owner_order = {
+            unit.id: position
+            for position, unit in enumerate(
+                sorted(self.units.values(), key=lambda unit: (normalize_owner_name(unit.owner_name), unit.unit_number))
+            )
+        }
+
+    def search(self, query: str, limit: int) -> list[IndexedUnit]:
+        """Return up to ``limit`` units matching the query, best matches first."""
+        matches: dict[int, None] = {}
+
+        def extend(unit_ids: Iterable[int]) -> None:
+            for unit_id in unit_ids:
+                if len(matches) >= limit:
+                    return
+                matches.setdefault(unit_id)
+
+        document = _document_digits(query)
+        if document.isdigit():
+            extend(self._documents.get(document, ()))
+
+        number = query.strip().casefold()
+        if number:
+            extend(self._unit_numbers.match(number))
+
+        tokens = normalize_owner_name(query).split()
+        if tokens and len(matches) < limit:
+            owners: Optional[set[int]] = None
+            for token in tokens:
+                found = set(self._owner_tokens.match(token))
+                owners = found if owners is None else owners & found
+                if not owners:
+                    break
+            if owners:
+                extend(sorted(owners, key=self._owner_order.__getitem__))
+
+        return [self.units[unit_id] for unit_id in matches]
+
+
+def build_unit_search_index(db: Session, assembly_id: int) -> UnitSearchIndex:
+    """Build the index from the assembly's unit snapshot."""
+    rows = (
+        db.query(
+            AssemblyUnit.id,
+            AssemblyUnit.unit_number,
+            AssemblyUnit.owner_name,
+            AssemblyUnit.ideal_fraction,
+            AssemblyUnit.cpf_cnpj,
+        )
+        .filter(AssemblyUnit.assembly_id == assembly_id)
+        .all()
+    )
+    units = [
+        IndexedUnit(
+            id=unit_id,
+            unit_number=unit_number,
+            owner_name=owner_name,
+            ideal_fraction=float(ideal_fraction),
+            cpf_cnpj=cpf_cnpj,
+        )
+        for unit_id, unit_number, owner_name, ideal_fraction, cpf_cnpj in rows
+    ]
+    return UnitSearchIndex(assembly_id, units)
+
+
+unit_search_cache: TTLCache[int, UnitSearchIndex] = TTLCache(maxsize=64, ttl_seconds=6 * 3600)
+
+
+def get_unit_search_index(db: Session, assembly_id: int) -> UnitSearchIndex:
+    """Return the cached index for an assembly, building it on a miss.
+
+    Callers check that the assembly belongs to the current tenant.
+    """
+    index = unit_search_cache.get(assembly_id)
+    if index is not None:
+        return index
+
+    generation = unit_search_cache.generation
+    index = build_unit_search_index(db, assembly_id)
+    unit_search_cache.set(assembly_id, index, generation)
+    return index
+
+
+def invalidate_unit_search(assembly_id: int) -> None:
+    """Drop the index after units were imported (in every process)."""
+    unit_search_cache.invalidate(assembly_id)
+    cache_sync.publish("unit_search", assembly_id)
+
+
+cache_sync.register("unit_search", unit_search_cache.invalidate, unit_search_cache.clear)
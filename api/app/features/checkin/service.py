@@ -1,22 +1,40 @@
 """Business logic for check-in operations."""
 from __future__ import annotations
 
-from typing import List
+import json
+from decimal import Decimal
+from typing import Iterable, Iterator, List
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from sqlalchemy import Select, and_, exists, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select
 from sqlalchemy.sql import func
 
+from app.core import database
 from app.core.enums import QRCodeStatus
 from app.core.exceptions import QRCodeAlreadyAssignedError
+from app.features.assemblies.cache import get_assembly_tenant
 from app.features.assemblies.models import Assembly, AssemblyUnit
-from app.features.checkin.models import QRCodeAssignment, QRCodeAssignedUnit
+from app.features.assemblies.owners import normalize_owner_name
+from app.features.checkin.attendance import AttendanceSnapshot, record_attendance_change
+from app.features.checkin.models import (
+    AttendanceStats,
+    ProcessedSyncOperation,
+    QRCodeAssignedUnit,
+    QRCodeAssignment,
+)
+from app.features.checkin.schemas import CheckInRequest, CheckInSyncOperation
+from app.features.checkin.search import get_unit_search_index
 from app.features.condominiums.models import Condominium
+from app.features.qr_codes.cache import invalidate_qr_token
 from app.features.qr_codes.models import QRCode
 from app.features.voting.models import Vote
 
+# Rows fetched per round trip when streaming the attendance list.
+ATTENDANCE_STREAM_BATCH_SIZE = 500
+
 
 def _get_assembly(db: Session, assembly_id: int, tenant_id: int) -> Assembly:
     assembly = (
@@ -33,64 +51,238 @@ def _get_assembly(db: Session, assembly_id: int, tenant_id: int) -> Assembly:
     return assembly
 
 
-def _get_qr_code_by_token(db: Session, qr_token: UUID, tenant_id: int) -> QRCode | None:
-    return (
-        db.query(QRCode)
+def _create_attendance_stats(db: Session, assembly_id: int) -> bool:
+    """Insert an assembly's attendance_stats row computed from units and check-ins.
+
+    Only needed when units were created without an import. Returns False if
+    another transaction created the row first.
+    """
+    db.flush()
+    total_units, total_fraction = (
+        db.query(func.count(AssemblyUnit.id), func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0))
+        .filter(AssemblyUnit.assembly_id == assembly_id)
+        .one()
+    )
+    # IN rather than a join, so each present unit counts once.
+    units_present, fraction_present = (
+        db.query(func.count(AssemblyUnit.id), func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0))
         .filter(
-            QRCode.token == qr_token,
-            QRCode.tenant_id == tenant_id,
-            QRCode.deleted_at.is_(None),
-            QRCode.status == QRCodeStatus.active,
+            AssemblyUnit.assembly_id == assembly_id,
+            AssemblyUnit.id.in_(select(QRCodeAssignedUnit.assembly_unit_id)),
         )
-        .first()
+        .one()
     )
+    try:
+        with db.begin_nested():
+            db.execute(
+                insert(AttendanceStats).values(
+                    assembly_id=assembly_id,
+                    total_units=total_units,
+                    total_fraction=total_fraction,
+                    units_present=units_present,
+                    fraction_present=fraction_present,
+                )
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def _apply_attendance_delta(db: Session, assembly_id: int, fractions: List[Decimal], sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) present units in the current transaction."""
+    statement = (
+        update(AttendanceStats)
+        .where(AttendanceStats.assembly_id == assembly_id)
+        .values(
+            units_present=AttendanceStats.units_present + sign * len(fractions),
+            fraction_present=AttendanceStats.fraction_present + sign * sum(fractions, Decimal("0")),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(statement).rowcount == 0 and not _create_attendance_stats(db, assembly_id):
+        # Created concurrently from data committed without this change.
+        db.execute(statement)
 
 
-def _get_qr_code_by_visual_number(db: Session, qr_visual_number: int, tenant_id: int) -> QRCode | None:
-    return (
-        db.query(QRCode)
-        .filter(
-            QRCode.visual_number == qr_visual_number,
+def _check_assignment(
+    db: Session,
+    assembly_id: int,
+    qr_token: UUID | None,
+    qr_visual_number: int | None,
+    unit_ids: List[int],
+    tenant_id: int,
+):
+    """Run every check-in pre-check in one statement.
+
+    A one-row ``checks`` CTE (assembly, QR code, existing assignment) is
+    joined to the requested units, so the result has one row per unit found
+    (or a single row with no unit) carrying its fraction and whether it is
+    already checked in.
+    """
+    qr_filter = QRCode.token == qr_token if qr_token is not None else QRCode.visual_number == qr_visual_number
+    qr_code = (
+        select(QRCode.id, QRCode.token)
+        .where(
+            qr_filter,
             QRCode.tenant_id == tenant_id,
             QRCode.deleted_at.is_(None),
             QRCode.status == QRCodeStatus.active,
         )
-        .first()
+        .limit(1)
+        .cte("qr_code")
     )
+    checks = select(
+        select(Assembly.id)
+        .join(Condominium, Assembly.condominium_id == Condominium.id)
+        .where(Assembly.id == assembly_id, Condominium.tenant_id == tenant_id)
+        .scalar_subquery()
+        .label("assembly_id"),
+        select(qr_code.c.id).scalar_subquery().label("qr_code_id"),
+        select(qr_code.c.token).scalar_subquery().label("qr_token"),
+        exists()
+        .where(
+            QRCodeAssignment.assembly_id == assembly_id,
+            QRCodeAssignment.qr_code_id.in_(select(qr_code.c.id)),
+        )
+        .label("qr_assigned"),
+    ).cte("checks")
+    unit_taken = exists().where(QRCodeAssignedUnit.assembly_unit_id == AssemblyUnit.id)
+    return db.execute(
+        select(
+            checks.c.assembly_id,
+            checks.c.qr_code_id,
+            checks.c.qr_token,
+            checks.c.qr_assigned,
+            AssemblyUnit.id,
+            AssemblyUnit.ideal_fraction,
+            unit_taken.label("unit_taken"),
+        )
+        .select_from(checks)
+        .outerjoin(
+            AssemblyUnit,
+            and_(AssemblyUnit.assembly_id == assembly_id, AssemblyUnit.id.in_(unit_ids)),
+        )
+    ).all()
 
 
-def _resolve_qr_code(
-    db: Session,
-    tenant_id: int,
-    qr_token: UUID | None = None,
-    qr_visual_number: int | None = None,
-) -> QRCode:
-    qr_code = None
-    if qr_token is not None:
-        qr_code = _get_qr_code_by_token(db, qr_token, tenant_id)
-    elif qr_visual_number is not None:
-        qr_code = _get_qr_code_by_visual_number(db, qr_visual_number, tenant_id)
-
-    if not qr_code:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR code not found")
-    return qr_code
+def _assignment_conflict(db: Session, assembly_id: int, qr_code_ids: List[int]) -> HTTPException:
+    """Error for check-ins that lost a race on one of their unique constraints."""
+    qr_assigned = db.query(
+        exists().where(
+            QRCodeAssignment.assembly_id == assembly_id,
+            QRCodeAssignment.qr_code_id.in_(qr_code_ids),
+        )
+    ).scalar()
+    if qr_assigned:
+        return QRCodeAlreadyAssignedError()
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="One or more units are already checked in",
+    )
 
 
-def _get_units(db: Session, assembly_id: int, unit_ids: List[int]) -> List[AssemblyUnit]:
-    units = (
-        db.query(AssemblyUnit)
-        .filter(
-            AssemblyUnit.assembly_id == assembly_id,
-            AssemblyUnit.id.in_(unit_ids),
-        )
-        .all()
+def _write_assignments(
+    db: Session,
+    assembly_id: int,
+    entries: List[tuple[int, bool, List[tuple[int, Decimal]]]],
+    assigned_by: int,
+) -> List[QRCodeAssignment]:
+    """Insert validated check-ins and add them to attendance_stats (no commit).
+
+    ``entries`` are (QR code ID, is_proxy, [(unit ID, ideal fraction)]).
+    Assignments are inserted with RETURNING, in request order, inside a
+    savepoint: if another desk claimed one of the QR codes or units after
+    validation, nothing is written and the matching 400 is raised.
+    """
+    try:
+        with db.begin_nested():
+            created = db.execute(
+                insert(QRCodeAssignment).returning(
+                    QRCodeAssignment.id,
+                    QRCodeAssignment.assigned_at,
+                    sort_by_parameter_order=True,
+                ),
+                [
+                    {
+                        "assembly_id": assembly_id,
+                        "qr_code_id": qr_code_id,
+                        "is_proxy": is_proxy,
+                        "assigned_by": assigned_by,
+                    }
+                    for qr_code_id, is_proxy, _ in entries
+                ],
+            ).all()
+            db.execute(
+                insert(QRCodeAssignedUnit),
+                [
+                    {"assignment_id": assignment_id, "assembly_unit_id": unit_id}
+                    for (assignment_id, _), (_, _, units) in zip(created, entries)
+                    for unit_id, _ in units
+                ],
+            )
+    except IntegrityError as exc:
+        raise _assignment_conflict(db, assembly_id, [qr_code_id for qr_code_id, _, _ in entries]) from exc
+    _apply_attendance_delta(
+        db,
+        assembly_id,
+        [fraction for _, _, units in entries for _, fraction in units],
+        1,
     )
+    return [
+        QRCodeAssignment(
+            id=assignment_id,
+            assembly_id=assembly_id,
+            qr_code_id=qr_code_id,
+            is_proxy=is_proxy,
+            assigned_at=assigned_at,
+            assigned_by=assigned_by,
+        )
+        for (assignment_id, assigned_at), (qr_code_id, is_proxy, _) in zip(created, entries)
+    ]
+
+
+def _insert_assignment(
+    db: Session,
+    assembly_id: int,
+    qr_token: UUID | None,
+    qr_visual_number: int | None,
+    unit_ids: List[int],
+    is_proxy: bool,
+    assigned_by: int,
+    tenant_id: int,
+) -> tuple[QRCodeAssignment, UUID]:
+    """Validate and insert a check-in in the current transaction (no commit).
+
+    Returns the assignment and the token of its QR code. Nothing is written
+    when validation fails.
+    """
+    rows = _check_assignment(db, assembly_id, qr_token, qr_visual_number, unit_ids, tenant_id)
+    found_assembly_id, qr_code_id, token, qr_assigned, _, _, _ = rows[0]
+    if found_assembly_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+    if qr_code_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR code not found")
+    if qr_assigned:
+        raise QRCodeAlreadyAssignedError()
+    units = [(row[4], row[5], row[6]) for row in rows if row[4] is not None]
     if len(units) != len(unit_ids):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="One or more units not found for this assembly",
         )
-    return units
+    if any(taken for _, _, taken in units):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="One or more units are already checked in",
+        )
+
+    (assignment,) = _write_assignments(
+        db,
+        assembly_id,
+        [(qr_code_id, is_proxy, [(unit_id, Decimal(fraction)) for unit_id, fraction, _ in units])],
+        assigned_by,
+    )
+    return assignment, token
 
 
 def assign_qr_code(
@@ -103,76 +295,142 @@ def assign_qr_code(
     assigned_by: int,
     tenant_id: int,
 ) -> QRCodeAssignment:
-    """Assign QR code to units (check-in)."""
+    """Assign QR code to units (check-in).
+
+    One statement validates everything, the assignment and its units are
+    inserted with RETURNING. Unique constraints settle races between desks.
+    """
+    assignment, token = _insert_assignment(
+        db, assembly_id, qr_token, qr_visual_number, unit_ids, is_proxy, assigned_by, tenant_id
+    )
+    db.commit()
+    invalidate_qr_token(token)
+    record_attendance_change(assembly_id)
+    return assignment
+
+
+def bulk_assign_qr_codes(
+    db: Session,
+    assembly_id: int,
+    entries: List[CheckInRequest],
+    assigned_by: int,
+    tenant_id: int,
+) -> tuple[List[QRCodeAssignment], List[dict]]:
+    """Check in many QR codes at once.
+
+    Every entry is validated against a few set-based queries (QR codes,
+    units, existing assignments); valid entries go through the same write
+    as a single check-in, in one transaction, and invalid ones are reported
+    as errors with their index. Entries of the same batch cannot reuse a QR
+    code or a unit; if another desk claims one meanwhile, the batch fails
+    with that 400.
+    """
     _get_assembly(db, assembly_id, tenant_id)
-    qr_code = _resolve_qr_code(db, tenant_id, qr_token, qr_visual_number)
 
-    existing_assignment = (
-        db.query(QRCodeAssignment)
+    tokens = {entry.qr_token for entry in entries if entry.qr_token is not None}
+    visual_numbers = {entry.qr_visual_number for entry in entries if entry.qr_visual_number is not None}
+    qr_filters = []
+    if tokens:
+        qr_filters.append(QRCode.token.in_(tokens))
+    if visual_numbers:
+        qr_filters.append(QRCode.visual_number.in_(visual_numbers))
+    qr_codes = (
+        db.query(QRCode.id, QRCode.token, QRCode.visual_number)
         .filter(
-            QRCodeAssignment.assembly_id == assembly_id,
-            QRCodeAssignment.qr_code_id == qr_code.id,
+            or_(*qr_filters),
+            QRCode.tenant_id == tenant_id,
+            QRCode.deleted_at.is_(None),
+            QRCode.status == QRCodeStatus.active,
         )
-        .first()
+        .all()
     )
-    if existing_assignment:
-        raise QRCodeAlreadyAssignedError()
+    qr_by_token = {token: (qr_id, token) for qr_id, token, _ in qr_codes}
+    qr_by_visual_number = {visual_number: (qr_id, token) for qr_id, token, visual_number in qr_codes}
 
-    _get_units(db, assembly_id, unit_ids)
-
-    assigned_unit_ids = (
-        db.query(QRCodeAssignedUnit.assembly_unit_id)
+    unit_ids = {unit_id for entry in entries for unit_id in entry.unit_ids}
+    unit_fractions = dict(
+        db.query(AssemblyUnit.id, AssemblyUnit.ideal_fraction)
+        .filter(
+            AssemblyUnit.assembly_id == assembly_id,
+            AssemblyUnit.id.in_(unit_ids),
+        )
+        .all()
+    )
+    assigned_qr_ids = {
+        row[0]
+        for row in db.query(QRCodeAssignment.qr_code_id)
+        .filter(
+            QRCodeAssignment.assembly_id == assembly_id,
+            QRCodeAssignment.qr_code_id.in_([qr_id for qr_id, _, _ in qr_codes]),
+        )
+        .all()
+    }
+    assigned_unit_ids = {
+        row[0]
+        for row in db.query(QRCodeAssignedUnit.assembly_unit_id)
         .join(QRCodeAssignment, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
         .filter(
             QRCodeAssignment.assembly_id == assembly_id,
             QRCodeAssignedUnit.assembly_unit_id.in_(unit_ids),
         )
         .all()
+    }
+
+    errors: List[dict] = []
+    accepted: list[tuple[CheckInRequest, int, UUID]] = []
+    for index, entry in enumerate(entries):
+        if entry.qr_token is not None:
+            qr_code = qr_by_token.get(entry.qr_token)
+        else:
+            qr_code = qr_by_visual_number.get(entry.qr_visual_number)
+        error: HTTPException | None = None
+        if qr_code is None:
+            error = HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR code not found")
+        elif qr_code[0] in assigned_qr_ids:
+            error = QRCodeAlreadyAssignedError()
+        elif any(unit_id not in unit_fractions for unit_id in entry.unit_ids):
+            error = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more units not found for this assembly",
+            )
+        elif any(unit_id in assigned_unit_ids for unit_id in entry.unit_ids):
+            error = HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more units are already checked in",
+            )
+        if error is not None:
+            errors.append({"index": index, "status_code": error.status_code, "detail": error.detail})
+            continue
+        assigned_qr_ids.add(qr_code[0])
+        assigned_unit_ids.update(entry.unit_ids)
+        accepted.append((entry, qr_code[0], qr_code[1]))
+
+    if not accepted:
+        return [], errors
+
+    assignments = _write_assignments(
+        db,
+        assembly_id,
+        [
+            (qr_code_id, entry.is_proxy, [(unit_id, Decimal(unit_fractions[unit_id])) for unit_id in entry.unit_ids])
+            for entry, qr_code_id, _ in accepted
+        ],
+        assigned_by,
     )
-    if assigned_unit_ids:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="One or more units are already checked in",
-        )
-
-    assignment = QRCodeAssignment(
-        assembly_id=assembly_id,
-        qr_code_id=qr_code.id,
-        is_proxy=is_proxy,
-        assigned_by=assigned_by,
-    )
-    db.add(assignment)
-    db.flush()
-
-    links = [
-        QRCodeAssignedUnit(assignment_id=assignment.id, assembly_unit_id=unit_id)
-        for unit_id in unit_ids
-    ]
-    db.add_all(links)
     db.commit()
-    db.refresh(assignment)
-    return assignment
 
+    for _, _, qr_token in accepted:
+        invalidate_qr_token(qr_token)
+    record_attendance_change(assembly_id)
+    return assignments, errors
 
-def unassign_qr_code(db: Session, assignment_id: int, tenant_id: int) -> int:
-    """Undo check-in (remove QR assignment)."""
-    assignment = (
-        db.query(QRCodeAssignment)
-        .join(Assembly, QRCodeAssignment.assembly_id == Assembly.id)
-        .join(Condominium, Assembly.condominium_id == Condominium.id)
-        .filter(
-            QRCodeAssignment.id == assignment_id,
-            Condominium.tenant_id == tenant_id,
-        )
-        .first()
-    )
-    if not assignment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
 
-    assembly_id = assignment.assembly_id
+def _delete_assignment(db: Session, assignment: QRCodeAssignment) -> None:
+    """Undo a check-in in the current transaction (no commit); refused once its units voted."""
     assigned_units = (
-        db.query(QRCodeAssignedUnit.assembly_unit_id)
-        .filter(QRCodeAssignedUnit.assignment_id == assignment_id)
+        db.query(QRCodeAssignedUnit.assembly_unit_id, AssemblyUnit.ideal_fraction)
+        .join(AssemblyUnit, AssemblyUnit.id == QRCodeAssignedUnit.assembly_unit_id)
+        .filter(QRCodeAssignedUnit.assignment_id == assignment.id)
         .all()
     )
     unit_ids = [row[0] for row in assigned_units]
@@ -188,17 +446,218 @@ def unassign_qr_code(db: Session, assignment_id: int, tenant_id: int) -> int:
                 detail="Cannot undo check-in because votes already exist",
             )
 
+    # Links are removed explicitly so the units count as free again for the
+    # rest of the transaction, whether or not the cascade is enforced.
+    db.query(QRCodeAssignedUnit).filter(QRCodeAssignedUnit.assignment_id == assignment.id).delete(
+        synchronize_session=False
+    )
     db.delete(assignment)
+    _apply_attendance_delta(db, assignment.assembly_id, [Decimal(row[1]) for row in assigned_units], -1)
+
+
+def unassign_qr_code(db: Session, assignment_id: int, tenant_id: int) -> int:
+    """Undo check-in (remove QR assignment)."""
+    result = (
+        db.query(QRCodeAssignment, QRCode.token)
+        .join(QRCode, QRCodeAssignment.qr_code_id == QRCode.id)
+        .join(Assembly, QRCodeAssignment.assembly_id == Assembly.id)
+        .join(Condominium, Assembly.condominium_id == Condominium.id)
+        .filter(
+            QRCodeAssignment.id == assignment_id,
+            Condominium.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    assignment, qr_token = result
+
+    assembly_id = assignment.assembly_id
+    _delete_assignment(db, assignment)
     db.commit()
+    invalidate_qr_token(qr_token)
+    record_attendance_change(assembly_id)
     return assembly_id
 
 
-def get_attendance_list(db: Session, assembly_id: int, tenant_id: int) -> list[dict]:
-    """Get attendance list for an assembly."""
+def _find_assignment_by_qr(
+    db: Session,
+    assembly_id: int,
+    qr_token: UUID | None,
+    qr_visual_number: int | None,
+    tenant_id: int,
+) -> tuple[QRCodeAssignment, UUID]:
+    query = (
+        db.query(QRCodeAssignment, QRCode.token)
+        .join(QRCode, QRCodeAssignment.qr_code_id == QRCode.id)
+        .filter(
+            QRCodeAssignment.assembly_id == assembly_id,
+            QRCode.tenant_id == tenant_id,
+        )
+    )
+    if qr_token is not None:
+        query = query.filter(QRCode.token == qr_token)
+    else:
+        query = query.filter(QRCode.visual_number == qr_visual_number, QRCode.deleted_at.is_(None))
+    result = query.first()
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assignment not found")
+    return result
+
+
+def _apply_sync_operation(
+    db: Session,
+    assembly_id: int,
+    operation: CheckInSyncOperation,
+    processed_by: int,
+    tenant_id: int,
+) -> tuple[ProcessedSyncOperation, UUID | None, int | None]:
+    """Apply one operation and record its outcome, in a savepoint.
+
+    Returns the record, the QR token to invalidate and the undone assignment
+    ID (if any).
+    """
+    token: UUID | None = None
+    undone_id: int | None = None
+    with db.begin_nested():
+        record = ProcessedSyncOperation(
+            assembly_id=assembly_id,
+            idempotency_key=operation.idempotency_key,
+            operation=operation.operation,
+            processed_by=processed_by,
+        )
+        try:
+            if operation.operation == "checkin":
+                assignment, token = _insert_assignment(
+                    db,
+                    assembly_id,
+                    operation.qr_token,
+                    operation.qr_visual_number,
+                    operation.unit_ids,
+                    operation.is_proxy,
+                    processed_by,
+                    tenant_id,
+                )
+                record.status_code = status.HTTP_201_CREATED
+                record.assignment_id = assignment.id
+            else:
+                assignment, token = _find_assignment_by_qr(
+                    db, assembly_id, operation.qr_token, operation.qr_visual_number, tenant_id
+                )
+                undone_id = assignment.id
+                _delete_assignment(db, assignment)
+                record.status_code = status.HTTP_200_OK
+                record.assignment_id = undone_id
+        except HTTPException as exc:
+            # Validation failed before anything was written.
+            token = undone_id = None
+            record.status_code = exc.status_code
+            record.detail = exc.detail
+        db.add(record)
+        db.flush()
+    return record, token, undone_id
+
+
+def _sync_result(record: ProcessedSyncOperation, replayed: bool) -> dict:
+    return {
+        "idempotency_key": record.idempotency_key,
+        "operation": record.operation,
+        "status_code": record.status_code,
+        "detail": record.detail,
+        "assignment_id": record.assignment_id,
+        "replayed": replayed,
+    }
+
+
+def sync_checkin_operations(
+    db: Session,
+    assembly_id: int,
+    operations: List[CheckInSyncOperation],
+    processed_by: int,
+    tenant_id: int,
+) -> tuple[List[dict], List[int], bool]:
+    """Apply a desk's queued check-in/undo log in order, in one transaction.
+
+    Operations whose idempotency key was already processed are not applied
+    again; their recorded outcome is returned instead. Rejected operations
+    are recorded too, so a retry always gets the same answer.
+
+    Returns the results, the undone assignment IDs and whether attendance
+    changed.
+    """
     _get_assembly(db, assembly_id, tenant_id)
 
-    rows = (
-        db.query(
+    keys = {operation.idempotency_key for operation in operations}
+    processed = {
+        record.idempotency_key: record
+        for record in db.query(ProcessedSyncOperation).filter(
+            ProcessedSyncOperation.assembly_id == assembly_id,
+            ProcessedSyncOperation.idempotency_key.in_(keys),
+        )
+    }
+
+    results: List[dict] = []
+    tokens: set[UUID] = set()
+    undone_ids: List[int] = []
+    changed = False
+    for operation in operations:
+        record = processed.get(operation.idempotency_key)
+        if record is not None:
+            results.append(_sync_result(record, replayed=True))
+            continue
+        try:
+            record, token, undone_id = _apply_sync_operation(db, assembly_id, operation, processed_by, tenant_id)
+        except IntegrityError as exc:
+            # The same key was synced concurrently; the other transaction has
+            # committed by now.
+            record = (
+                db.query(ProcessedSyncOperation)
+                .filter(
+                    ProcessedSyncOperation.assembly_id == assembly_id,
+                    ProcessedSyncOperation.idempotency_key == operation.idempotency_key,
+                )
+                .first()
+            )
+            if record is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Conflicting concurrent check-in; retry the sync",
+                ) from exc
+            processed[operation.idempotency_key] = record
+            results.append(_sync_result(record, replayed=True))
+            continue
+        processed[operation.idempotency_key] = record
+        results.append(_sync_result(record, replayed=False))
+        if token is not None:
+            tokens.add(token)
+            changed = True
+        if undone_id is not None:
+            undone_ids.append(undone_id)
+
+    db.commit()
+    for token in tokens:
+        invalidate_qr_token(token)
+    if changed:
+        record_attendance_change(assembly_id)
+    return results, undone_ids, changed
+
+
+def get_present_unit_ids(db: Session, assembly_id: int) -> List[int]:
+    """Return IDs of the units checked in to an assembly."""
+    return list(
+        db.execute(
+            select(QRCodeAssignedUnit.assembly_unit_id)
+            .join(QRCodeAssignment, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
+            .where(QRCodeAssignment.assembly_id == assembly_id)
+            .order_by(QRCodeAssignedUnit.assembly_unit_id)
+        ).scalars()
+    )
+
+
+def _attendance_rows(assembly_id: int) -> Select:
+    """Assignment x unit rows of an assembly, ordered by assignment."""
+    return (
+        select(
             QRCodeAssignment.id,
             QRCodeAssignment.is_proxy,
             QRCode.visual_number,
@@ -211,12 +670,14 @@ def get_attendance_list(db: Session, assembly_id: int, tenant_id: int) -> list[d
         .join(QRCode, QRCodeAssignment.qr_code_id == QRCode.id)
         .join(QRCodeAssignedUnit, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
         .join(AssemblyUnit, AssemblyUnit.id == QRCodeAssignedUnit.assembly_unit_id)
-        .filter(QRCodeAssignment.assembly_id == assembly_id)
+        .where(QRCodeAssignment.assembly_id == assembly_id)
         .order_by(QRCodeAssignment.id, AssemblyUnit.unit_number.asc())
-        .all()
     )
 
-    items: dict[int, dict] = {}
+
+def _group_attendance(rows: Iterable) -> Iterator[dict]:
+    """Fold rows ordered by assignment into one attendance item per assignment."""
+    item: dict | None = None
     for (
         assignment_id,
         is_proxy,
@@ -227,17 +688,17 @@ def get_attendance_list(db: Session, assembly_id: int, tenant_id: int) -> list[d
         ideal_fraction,
         cpf_cnpj,
     ) in rows:
-        item = items.setdefault(
-            assignment_id,
-            {
+        if item is None or item["assignment_id"] != assignment_id:
+            if item is not None:
+                yield item
+            item = {
                 "assignment_id": assignment_id,
                 "qr_visual_number": qr_visual_number,
                 "is_proxy": is_proxy,
                 "units": [],
                 "owner_names": [],
                 "total_fraction": 0.0,
-            },
-        )
+            }
         item["units"].append(
             {
                 "id": unit_id,
@@ -249,30 +710,105 @@ def get_attendance_list(db: Session, assembly_id: int, tenant_id: int) -> list[d
         )
         item["owner_names"].append(owner_name)
         item["total_fraction"] += float(ideal_fraction)
+    if item is not None:
+        yield item
 
-    return list(items.values())
 
+def get_attendance_page(
+    db: Session,
+    assembly_id: int,
+    tenant_id: int,
+    cursor: int | None = None,
+    limit: int | None = None,
+) -> tuple[list[dict], int | None]:
+    """Get attendance items after ``cursor`` (an assignment ID) and the next cursor.
 
-def get_attendance_summary(db: Session, assembly_id: int, tenant_id: int) -> tuple[int, float]:
-    """Return units present and fraction present for SSE updates."""
+    Without a limit every remaining item is returned and the next cursor is None.
+    """
     _get_assembly(db, assembly_id, tenant_id)
 
-    present_unit_ids = (
-        select(QRCodeAssignedUnit.assembly_unit_id)
-        .join(QRCodeAssignment, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
-        .filter(QRCodeAssignment.assembly_id == assembly_id)
-        .distinct()
-    )
+    rows = _attendance_rows(assembly_id)
+    if cursor is not None:
+        rows = rows.where(QRCodeAssignment.id > cursor)
+    if limit is None:
+        return list(_group_attendance(db.execute(rows))), None
+
+    # A page holds whole assignments, so the limit applies to assignment IDs.
+    page = select(QRCodeAssignment.id).where(QRCodeAssignment.assembly_id == assembly_id)
+    if cursor is not None:
+        page = page.where(QRCodeAssignment.id > cursor)
+    assignment_ids = db.execute(page.order_by(QRCodeAssignment.id).limit(limit + 1)).scalars().all()
 
-    present_units_subquery = present_unit_ids.subquery()
-    units_present = db.query(func.count()).select_from(present_units_subquery).scalar() or 0
-    fraction_present = (
-        db.query(func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0.0))
-        .filter(AssemblyUnit.id.in_(present_unit_ids))
-        .scalar()
-        or 0.0
+    next_cursor = None
+    if len(assignment_ids) > limit:
+        assignment_ids = assignment_ids[:limit]
+        next_cursor = assignment_ids[-1]
+    if not assignment_ids:
+        return [], None
+
+    rows = rows.where(QRCodeAssignment.id <= assignment_ids[-1])
+    return list(_group_attendance(db.execute(rows))), next_cursor
+
+
+def iter_attendance(db: Session, assembly_id: int) -> Iterator[dict]:
+    """Yield attendance items read through a server-side cursor.
+
+    Callers check that the assembly belongs to the current tenant.
+    """
+    rows = db.execute(_attendance_rows(assembly_id).execution_options(yield_per=ATTENDANCE_STREAM_BATCH_SIZE))
+    try:
+        yield from _group_attendance(rows)
+    finally:
+        rows.close()
+
+
+def stream_attendance(db: Session, assembly_id: int, tenant_id: int) -> Iterator[bytes]:
+    """Return the attendance list as NDJSON lines, one assignment per line.
+
+    The tenant is checked right away; rows are read lazily in a session of
+    their own, held only while the response is being sent.
+    """
+    _get_assembly(db, assembly_id, tenant_id)
+
+    def lines() -> Iterator[bytes]:
+        with database.SessionLocal() as stream_db:
+            for item in iter_attendance(stream_db, assembly_id):
+                yield json.dumps(item, separators=(",", ":")).encode() + b"\n"
+
+    return lines()
+
+
+def get_assembly_attendance(db: Session, assembly_id: int, tenant_id: int) -> AttendanceSnapshot:
+    """Return attendance totals (a primary-key read of attendance_stats)."""
+    if get_assembly_tenant(db, assembly_id) != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+
+    columns = (
+        AttendanceStats.total_units,
+        AttendanceStats.total_fraction,
+        AttendanceStats.units_present,
+        AttendanceStats.fraction_present,
+    )
+    row = db.query(*columns).filter(AttendanceStats.assembly_id == assembly_id).first()
+    if row is None:
+        # Created in a savepoint and kept only if the caller commits; the
+        # next write (check-in, undo, import) persists it otherwise.
+        _create_attendance_stats(db, assembly_id)
+        row = db.query(*columns).filter(AttendanceStats.assembly_id == assembly_id).one()
+    total_units, total_fraction, units_present, fraction_present = row
+    return AttendanceSnapshot(
+        assembly_id=assembly_id,
+        total_units=total_units,
+        total_fraction=float(total_fraction),
+        units_present=units_present,
+        fraction_present=float(fraction_present),
     )
-    return units_present, float(fraction_present)
+
+
+def get_attendance_summary(db: Session, assembly_id: int, tenant_id: int) -> tuple[int, float]:
+    """Return units present and fraction present for SSE updates."""
+    attendance = get_assembly_attendance(db, assembly_id, tenant_id)
+    return attendance.units_present, attendance.fraction_present
 
 
 def select_units_by_owner(
@@ -285,11 +821,38 @@ def select_units_by_owner(
     """Select all unit IDs for a given owner in an assembly."""
     _get_assembly(db, assembly_id, tenant_id)
 
-    owner_name = owner_name.strip()
     query = db.query(AssemblyUnit.id).filter(
         AssemblyUnit.assembly_id == assembly_id,
-        func.lower(func.trim(AssemblyUnit.owner_name)) == owner_name.lower(),
+        AssemblyUnit.owner_key == normalize_owner_name(owner_name),
     )
     if cpf_cnpj:
         query = query.filter(AssemblyUnit.cpf_cnpj == cpf_cnpj)
     return [row[0] for row in query.all()]
+
+
+def search_units(db: Session, assembly_id: int, query: str, limit: int, tenant_id: int) -> list[dict]:
+    """Search units by CPF/CNPJ, unit number prefix or owner name, with check-in status."""
+    if get_assembly_tenant(db, assembly_id) != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+
+    units = get_unit_search_index(db, assembly_id).search(query, limit)
+    present: set[int] = set()
+    if units:
+        present = set(
+            db.execute(
+                select(QRCodeAssignedUnit.assembly_unit_id).where(
+                    QRCodeAssignedUnit.assembly_unit_id.in_([unit.id for unit in units])
+                )
+            ).scalars()
+        )
+    return [
+        {
+            "id": unit.id,
+            "unit_number": unit.unit_number,
+            "owner_name": unit.owner_name,
+            "ideal_fraction": unit.ideal_fraction,
+            "cpf_cnpj": unit.cpf_cnpj,
+            "checked_in": unit.id in present,
+        }
+        for unit in units
+    ]
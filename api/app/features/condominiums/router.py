@@ -25,7 +25,7 @@ router = APIRouter()
     summary="Create condominium",
     dependencies=[Depends(require_property_manager)],
 )
-async def create_condominium(
+def create_condominium(
     condominium: CondominiumCreate,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -40,7 +40,7 @@ async def create_condominium(
     response_model=CondominiumListResponse,
     summary="List condominiums",
 )
-async def list_condominiums(
+def list_condominiums(
     page: int = 1,
     page_size: int = 20,
     status: str = "active",
@@ -73,7 +73,7 @@ async def list_condominiums(
     response_model=CondominiumResponse,
     summary="Get condominium",
 )
-async def get_condominium(
+def get_condominium(
     condominium_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -89,7 +89,7 @@ async def get_condominium(
     summary="Update condominium",
     dependencies=[Depends(require_property_manager)],
 )
-async def update_condominium(
+def update_condominium(
     condominium_id: int,
     condominium: CondominiumUpdate,
     db: Session = Depends(get_db),
@@ -106,7 +106,7 @@ async def update_condominium(
     summary="Deactivate condominium",
     dependencies=[Depends(require_property_manager)],
 )
-async def delete_condominium(
+def delete_condominium(
     condominium_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
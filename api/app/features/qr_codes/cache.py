@@ -0,0 +1,59 @@
+"""Cache of QR token resolution used by the public voting endpoints."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.pubsub import cache_sync
+
+
+@dataclass(frozen=True)
+class AssignedUnit:
+    """Unit linked to a QR code at check-in (immutable snapshot data)."""
+
+    id: int
+    unit_number: str
+    owner_name: str
+
+
+@dataclass(frozen=True)
+class QRTokenEntry:
+    """Resolved state of a QR token.
+
+    Only changes on check-in, undo check-in or QR code update/deactivation,
+    which invalidate the entry explicitly.
+    """
+
+    qr_code_id: int
+    tenant_id: int
+    is_active: bool
+    assignment_id: Optional[int]
+    assembly_id: Optional[int]
+    units: tuple[AssignedUnit, ...]
+    units_json: bytes = b"[]"
+
+    @property
+    def unit_ids(self) -> list[int]:
+        return [unit.id for unit in self.units]
+
+
+qr_token_cache: TTLCache[UUID, QRTokenEntry] = TTLCache(
+    maxsize=settings.QR_TOKEN_CACHE_SIZE,
+    ttl_seconds=settings.QR_TOKEN_CACHE_TTL_SECONDS,
+)
+
+
+def invalidate_qr_token(qr_token: UUID) -> None:
+    """Drop cached resolution for a QR token (in every process)."""
+    qr_token_cache.invalidate(qr_token)
+    cache_sync.publish("qr_token", str(qr_token))
+
+
+cache_sync.register(
+    "qr_token",
+    lambda key: qr_token_cache.invalidate(UUID(key)),
+    qr_token_cache.clear,
+)
@@ -25,7 +25,7 @@ router = APIRouter()
     summary="Create QR code",
     dependencies=[Depends(require_property_manager)],
 )
-async def create_qr_code(
+def create_qr_code(
     qr_code: QRCodeCreate,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -41,7 +41,7 @@ async def create_qr_code(
     summary="List QR codes",
     dependencies=[Depends(require_property_manager)],
 )
-async def list_qr_codes(
+def list_qr_codes(
     page: int = 1,
     page_size: int = 20,
     status: str = "active",
@@ -75,7 +75,7 @@ async def list_qr_codes(
     summary="Get QR code",
     dependencies=[Depends(require_property_manager)],
 )
-async def get_qr_code(
+def get_qr_code(
     qr_code_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -91,7 +91,7 @@ async def get_qr_code(
     summary="Update QR code",
     dependencies=[Depends(require_property_manager)],
 )
-async def update_qr_code(
+def update_qr_code(
     qr_code_id: int,
     qr_code: QRCodeUpdate,
     db: Session = Depends(get_db),
@@ -108,7 +108,7 @@ async def update_qr_code(
     summary="Deactivate QR code",
     dependencies=[Depends(require_property_manager)],
 )
-async def delete_qr_code(
+def delete_qr_code(
     qr_code_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
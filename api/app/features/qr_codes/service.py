@@ -3,6 +3,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.enums import QRCodeStatus
+from app.features.qr_codes.cache import invalidate_qr_token
 from app.features.qr_codes.models import QRCode
 from app.features.qr_codes.schemas import QRCodeCreate, QRCodeUpdate
 
@@ -65,7 +66,9 @@ def update_qr_code(db: Session, qr_code_id: int, qr_code_update: QRCodeUpdate, t
     for field, value in update_data.items():
         setattr(qr_code, field, value)
 
+    qr_token = qr_code.token
     db.commit()
+    invalidate_qr_token(qr_token)
     db.refresh(qr_code)
     return qr_code
 
@@ -76,4 +79,6 @@ def delete_qr_code(db: Session, qr_code_id: int, tenant_id: int) -> None:
     if qr_code.status == QRCodeStatus.inactive:
         return
     qr_code.status = QRCodeStatus.inactive
+    qr_token = qr_code.token
     db.commit()
+    invalidate_qr_token(qr_token)
@@ -0,0 +1,50 @@
+"""Pydantic schemas for real-time metrics."""
+from typing import List
+
+from pydantic import BaseModel
+
+
+class LatencyBucketResponse(BaseModel):
+    """Cumulative count of observations up to ``le`` seconds."""
+
+    le: str
+    count: int
+
+
+class LatencyHistogramResponse(BaseModel):
+    """Fan-out latency from broadcast to the write of the frame."""
+
+    buckets: List[LatencyBucketResponse]
+    count: int
+    sum: float
+
+
+class AssemblyConnectionMetrics(BaseModel):
+    """Open SSE connections of one assembly."""
+
+    assembly_id: int
+    connections: int
+    queued_events: int
+    max_queue_depth: int
+
+
+class ChannelMetrics(BaseModel):
+    """Counters of one broadcaster (operator or voter channel)."""
+
+    channel: str
+    connections: int
+    published: int
+    delivered: int
+    coalesced: int
+    dropped: int
+    disconnected: int
+    fanout_latency: LatencyHistogramResponse
+    assemblies: List[AssemblyConnectionMetrics]
+
+
+class RealtimeMetricsResponse(BaseModel):
+    """Real-time metrics of the process that answered."""
+
+    process_id: str
+    backend: str
+    channels: List[ChannelMetrics]
@@ -1,109 +1,438 @@
 """
 Server-Sent Events (SSE) for real-time updates.
-Single global connection broadcasts events to operator dashboard.
+Operator dashboards subscribe per assembly; voter phones subscribe per QR token
+to a separate channel that only carries ballot events.
 """
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
+import secrets
+import time
+import weakref
+from collections import deque
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Cookie, Depends, Header, HTTPException, Query, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_tenant, get_current_user
-from app.features.assemblies.models import Assembly
-from app.features.condominiums.models import Condominium
+from app.core import database
+from app.core.config import settings
+from app.core.dependencies import decode_access_token, get_active_user
+from app.core.metrics import LatencyHistogram
+from app.core.enums import AgendaStatus
+from app.core.pubsub import PROCESS_ID, InMemoryBackend, PubSubBackend, cache_sync, pubsub
+from app.features.assemblies.cache import get_assembly_tenant
+from app.features.qr_codes.cache import QRTokenEntry
+from app.features.realtime.schemas import RealtimeMetricsResponse
+from app.features.realtime.vote_updates import VoteUpdateCoalescer
+from app.features.voting.service import get_agenda_tally, resolve_qr_token
+from app.features.voting.tally import TallySnapshot
 
 router = APIRouter()
 
 
+def encode_frame(event_type: str, data: dict, event_id: Optional[str] = None) -> bytes:
+    """Encode a complete SSE frame (id, event and data lines)."""
+    payload = json.dumps(data, separators=(",", ":"))
+    id_line = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{id_line}event: {event_type}\ndata: {payload}\n\n".encode()
+
+
+HEARTBEAT_FRAME = encode_frame("heartbeat", {"status": "alive"})
+HEARTBEAT_EVENT = {"type": "heartbeat", "data": {"status": "alive"}, "frame": HEARTBEAT_FRAME}
+# Sent on reconnect when the missed events are no longer buffered.
+RESYNC_FRAME = encode_frame("resync", {"reason": "events_expired"})
+RESYNC_EVENT = {"type": "resync", "data": {"reason": "events_expired"}, "frame": RESYNC_FRAME}
+
+
+def _coalesce_key(event: dict) -> tuple:
+    """Events with the same key carry state, so only the latest one matters."""
+    return event["type"], event["data"].get("agenda_id"), event.get("recipient")
+
+
+class SubscriberQueue(asyncio.Queue):
+    """Bounded per-connection queue that never blocks the publisher.
+
+    When full, a new event replaces a pending event with the same coalesce key
+    ("coalesce" policy); if there is none, or under the "disconnect" policy,
+    the queue is closed and its stream ends so the client reconnects.
+    """
+
+    def __init__(self, maxsize: int, policy: str = "coalesce", recipient: Optional[int] = None) -> None:
+        super().__init__(maxsize=maxsize)
+        self.policy = policy
+        self.recipient = recipient
+        self.closed = False
+        # Monotonic time of the last event or heartbeat put on the queue.
+        self.last_event = time.monotonic()
+
+    def offer(self, event: dict) -> str:
+        """Enqueue without blocking; return "queued", "coalesced" or "closed"."""
+        if self.closed:
+            return "closed"
+        self.last_event = time.monotonic()
+        if not self.full():
+            self.put_nowait(event)
+            return "queued"
+        if self.policy == "coalesce":
+            key = _coalesce_key(event)
+            for index, pending in enumerate(self._queue):
+                if _coalesce_key(pending) == key:
+                    self._queue[index] = event
+                    return "coalesced"
+        self.closed = True
+        return "closed"
+
+
+class HeartbeatTicker:
+    """One timer per process that keeps idle SSE connections alive.
+
+    Every half ``interval``, connections that got no event for at least that
+    long receive the pre-built heartbeat, so none stays silent for a full
+    ``interval``, instead of each connection running its own timeout. The
+    task starts with the first connection and ends once no connection is left.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.broadcasters: weakref.WeakSet[EventBroadcaster] = weakref.WeakSet()
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, broadcaster: EventBroadcaster) -> None:
+        """Include a broadcaster's connections in the ticks."""
+        self.broadcasters.add(broadcaster)
+
+    def ensure_running(self) -> None:
+        """Start the ticker on the running loop if it is not running."""
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval / 2)
+            if not self.tick():
+                return
+
+    def tick(self, now: Optional[float] = None) -> int:
+        """Send heartbeats to idle connections; return the open connections."""
+        if now is None:
+            now = time.monotonic()
+        idle_after = self.interval / 2
+        connections = 0
+        for broadcaster in list(self.broadcasters):
+            for queues in broadcaster.connections.values():
+                for queue in queues:
+                    connections += 1
+                    if now - queue.last_event >= idle_after and queue.empty():
+                        queue.put_nowait(HEARTBEAT_EVENT)
+                        queue.last_event = now
+        return connections
+
+    def stop(self) -> None:
+        """Cancel the ticker task."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+heartbeat = HeartbeatTicker(settings.SSE_HEARTBEAT_SECONDS)
+
+
 class EventBroadcaster:
-    """Manages SSE connections and broadcasts events."""
+    """Manages SSE connections and broadcasts events.
 
-    def __init__(self) -> None:
-        self.connections: dict[int, set[asyncio.Queue]] = {}
+    Events go through a pub/sub backend: the in-memory default delivers to
+    this process, the Postgres backend to the connections of every worker.
+    Fan-out never waits on a connection: slow consumers are coalesced or
+    disconnected (see SubscriberQueue). An assembly's replay buffer outlives
+    its last connection by ``replay_retention`` seconds, for reconnects.
+    """
 
-    async def connect(self, assembly_id: int) -> asyncio.Queue:
-        """Add new connection for an assembly."""
-        queue: asyncio.Queue = asyncio.Queue()
+    def __init__(
+        self,
+        channel: str = "events",
+        backend: Optional[PubSubBackend] = None,
+        queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        replay_size: Optional[int] = None,
+        ticker: Optional[HeartbeatTicker] = None,
+        replay_retention: Optional[float] = None,
+    ) -> None:
+        self.connections: dict[int, set[SubscriberQueue]] = {}
+        self.history: dict[int, deque[dict]] = {}
+        self.replay_size = replay_size or settings.SSE_REPLAY_BUFFER_SIZE
+        self.replay_retention = (
+            settings.SSE_REPLAY_RETENTION_SECONDS if replay_retention is None else replay_retention
+        )
+        # Assemblies whose last connection closed, and when.
+        self._idle_since: dict[int, float] = {}
+        self.channel = channel
+        self.backend = backend or InMemoryBackend()
+        self.backend.subscribe(channel, self._deliver)
+        self.backend.on_reconnect(self.resync)
+        self.queue_size = queue_size or settings.SSE_QUEUE_SIZE
+        self.policy = policy or settings.SSE_SLOW_CONSUMER_POLICY
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.disconnected = 0
+        self.fanout_latency = LatencyHistogram()
+        self._event_ids = itertools.count(1)
+        self.ticker = ticker or heartbeat
+        self.ticker.register(self)
+
+    async def connect(self, assembly_id: int, recipient: Optional[int] = None) -> SubscriberQueue:
+        """Add new connection for an assembly (optionally for one recipient only)."""
+        queue = SubscriberQueue(self.queue_size, self.policy, recipient)
         self.connections.setdefault(assembly_id, set()).add(queue)
+        self._idle_since.pop(assembly_id, None)
+        if assembly_id not in self.history:
+            self.history[assembly_id] = deque(maxlen=self.replay_size)
+        self.ticker.ensure_running()
         return queue
 
+    def replay(
+        self,
+        assembly_id: int,
+        last_event_id: str,
+        recipient: Optional[int] = None,
+    ) -> list[bytes]:
+        """Return frames broadcast after ``last_event_id``.
+
+        If that event is no longer buffered (too old, or sent before a
+        restart) a single resync frame tells the client to refetch.
+        Call right before ``connect`` so no event falls in between.
+        """
+        events = list(self.history.get(assembly_id, ()))
+        for index in range(len(events) - 1, -1, -1):
+            if events[index]["id"] == last_event_id:
+                break
+        else:
+            return [RESYNC_FRAME]
+
+        frames: list[bytes] = []
+        for event in events[index + 1:]:
+            event_recipient = event.get("recipient")
+            if event_recipient is not None and recipient is not None and event_recipient != recipient:
+                continue
+            if "frame" not in event:
+                event["frame"] = encode_frame(event["type"], event["data"], event["id"])
+            frames.append(event["frame"])
+        return frames
+
     async def disconnect(self, assembly_id: int, queue: asyncio.Queue) -> None:
         """Remove connection."""
         if assembly_id in self.connections:
             self.connections[assembly_id].discard(queue)
             if not self.connections[assembly_id]:
-                del self.connections[assembly_id]
+                self._close_assembly(assembly_id)
+        self.prune()
 
-    async def broadcast(self, assembly_id: int, event_type: str, data: dict) -> None:
-        """Broadcast event to all connections for an assembly."""
-        if assembly_id not in self.connections:
+    def _close_assembly(self, assembly_id: int) -> None:
+        del self.connections[assembly_id]
+        self._idle_since[assembly_id] = time.monotonic()
+
+    def prune(self) -> None:
+        """Forget replay buffers of assemblies idle for longer than the retention."""
+        now = time.monotonic()
+        for assembly_id, since in list(self._idle_since.items()):
+            if now - since >= self.replay_retention:
+                del self._idle_since[assembly_id]
+                self.history.pop(assembly_id, None)
+
+    async def broadcast(
+        self,
+        assembly_id: int,
+        event_type: str,
+        data: dict,
+        recipient: Optional[int] = None,
+    ) -> None:
+        """Broadcast event to all connections for an assembly.
+
+        When ``recipient`` is set, only generators subscribed for that
+        recipient (QR assignment) forward the event.
+        """
+        if not self.backend.shared and assembly_id not in self.history:
             return
 
         event = {
+            "id": f"{PROCESS_ID[:8]}-{next(self._event_ids)}",
             "type": event_type,
             "data": data,
             "timestamp": datetime.utcnow().isoformat(),
+            "published_at": time.time(),
         }
+        if recipient is not None:
+            event["recipient"] = recipient
+        self.published += 1
+
+        await self.backend.publish_async(self.channel, {"assembly_id": assembly_id, "event": event})
 
-        for queue in self.connections[assembly_id]:
-            await queue.put(event)
+    def _deliver(self, message: dict) -> None:
+        """Hand a published event to this process's connections.
 
+        While an assembly has (or recently had) a stream here, every event is
+        kept in its replay buffer; the SSE frame is encoded once and shared
+        by every connection.
+        """
+        assembly_id = message["assembly_id"]
+        event = message["event"]
+        if assembly_id in self._idle_since:
+            self.prune()
+        history = self.history.get(assembly_id)
+        if history is None:
+            return
+        history.append(event)
+        if assembly_id not in self.connections:
+            return
+        event["frame"] = encode_frame(event["type"], event["data"], event.get("id"))
+        recipient = event.get("recipient")
+        slow: list[SubscriberQueue] = []
+        for queue in self.connections.get(assembly_id, ()):
+            if recipient is not None and queue.recipient is not None and queue.recipient != recipient:
+                continue
+            outcome = queue.offer(event)
+            if outcome == "queued":
+                self.delivered += 1
+            elif outcome == "coalesced":
+                self.coalesced += 1
+            elif outcome == "closed":
+                self.dropped += 1
+                slow.append(queue)
+        for queue in slow:
+            self.disconnected += 1
+            self.connections[assembly_id].discard(queue)
+        if assembly_id in self.connections and not self.connections[assembly_id]:
+            self._close_assembly(assembly_id)
+
+    def resync(self) -> None:
+        """Tell every connection to refetch after events may have been missed.
 
-broadcaster = EventBroadcaster()
+        Replay buffers are emptied too: they have a gap, so a client resuming
+        from an earlier id gets a resync instead of an incomplete replay.
+        """
+        for history in self.history.values():
+            history.clear()
+        for assembly_id, queues in list(self.connections.items()):
+            for queue in list(queues):
+                if queue.offer(RESYNC_EVENT) == "closed":
+                    self.disconnected += 1
+                    queues.discard(queue)
+            if not queues:
+                self._close_assembly(assembly_id)
+
+    def metrics(self) -> dict:
+        """Return counters, latency and per-assembly connections."""
+        assemblies = []
+        for assembly_id, queues in sorted(self.connections.items()):
+            depths = [queue.qsize() for queue in queues]
+            assemblies.append(
+                {
+                    "assembly_id": assembly_id,
+                    "connections": len(depths),
+                    "queued_events": sum(depths),
+                    "max_queue_depth": max(depths, default=0),
+                }
+            )
+        return {
+            "channel": self.channel,
+            "connections": sum(len(queues) for queues in self.connections.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+            "fanout_latency": self.fanout_latency.snapshot(),
+            "assemblies": assemblies,
+        }
+
+
+broadcaster = EventBroadcaster("operator", pubsub)
+voter_broadcaster = EventBroadcaster("voter", pubsub)
 
 
 async def event_generator(
-    request: Request,
     assembly_id: int,
     queue: asyncio.Queue,
-) -> AsyncGenerator[str, None]:
-    """Generate SSE events from queue."""
+    source: Optional[EventBroadcaster] = None,
+    recipient: Optional[int] = None,
+    replay: Optional[list[bytes]] = None,
+) -> AsyncGenerator[bytes, None]:
+    """Generate SSE frames from queue, one write per event.
+
+    ``replay`` frames (missed while reconnecting) are sent first; heartbeats
+    arrive through the queue from the shared ticker. Client disconnects are
+    noticed by StreamingResponse, which listens on the ASGI receive channel
+    and cancels this generator (on ASGI 2.4 servers, the next write fails).
+    """
+    source = source or broadcaster
     try:
+        for frame in replay or ():
+            yield frame
         while True:
-            if await request.is_disconnected():
+            event = await queue.get()
+            if isinstance(queue, SubscriberQueue) and queue.closed:
+                # Evicted as a slow consumer: end the stream so the client reconnects.
                 break
-
-            try:
-                event = await asyncio.wait_for(queue.get(), timeout=30.0)
-                yield f"event: {event['type']}\n"
-                yield f"data: {json.dumps(event['data'])}\n\n"
-            except asyncio.TimeoutError:
-                yield "event: heartbeat\n"
-                yield f"data: {json.dumps({'status': 'alive'})}\n\n"
+            if event.get("recipient", recipient) != recipient:
+                continue
+            frame = event.get("frame")
+            yield frame if frame is not None else encode_frame(event["type"], event["data"], event.get("id"))
+            # Resumed once the frame was written.
+            published_at = event.get("published_at")
+            if published_at is not None:
+                source.fanout_latency.observe(time.time() - published_at)
     finally:
-        await broadcaster.disconnect(assembly_id, queue)
+        await source.disconnect(assembly_id, queue)
+
+
+def _authorize_stream(user_id: int, assembly_id: int) -> None:
+    """Check that the user may watch the assembly, in a short-lived session.
+
+    Streams last for hours, so they must not hold a pooled connection: the
+    session is closed before streaming starts.
+    """
+    with database.SessionLocal() as db:
+        user = get_active_user(db, user_id)
+        tenant_id = get_assembly_tenant(db, assembly_id)
+    if tenant_id is None or tenant_id != user.tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+
+
+def _resolve_voter(qr_token: UUID) -> QRTokenEntry:
+    """Resolve a QR token in a short-lived session (usually a cache hit)."""
+    with database.SessionLocal() as db:
+        return resolve_qr_token(db, qr_token)
 
 
 @router.get("/assemblies/{assembly_id}/stream")
 async def stream_events(
     assembly_id: int,
-    request: Request,
-    db: Session = Depends(get_db),
-    tenant_id: int = Depends(get_current_tenant),
-    current_user=Depends(get_current_user),
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    access_token: Optional[str] = Cookie(None),
 ) -> StreamingResponse:
-    """SSE endpoint for real-time assembly updates."""
-    assembly = (
-        db.query(Assembly)
-        .join(Condominium, Assembly.condominium_id == Condominium.id)
-        .filter(
-            Assembly.id == assembly_id,
-            Condominium.tenant_id == tenant_id,
-        )
-        .first()
-    )
-    if not assembly:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+    """SSE endpoint for real-time assembly updates.
 
+    Reconnecting clients send the last event id they saw (header, or the
+    ``last_event_id`` query param for a fresh EventSource) to get what they missed.
+    """
+    user_id = decode_access_token(access_token)
+    await run_in_threadpool(_authorize_stream, user_id, assembly_id)
+
+    resume_from = last_event_id_header or last_event_id
+    replay = broadcaster.replay(assembly_id, resume_from) if resume_from else None
     queue = await broadcaster.connect(assembly_id)
     return StreamingResponse(
-        event_generator(request, assembly_id, queue),
+        event_generator(assembly_id, queue, replay=replay),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -113,15 +442,86 @@ async def stream_events(
     )
 
 
-async def notify_vote_cast(assembly_id: int, agenda_id: int, votes_count: int) -> None:
-    """Notify vote was cast."""
-    await broadcaster.broadcast(
-        assembly_id,
-        "vote_update",
-        {"agenda_id": agenda_id, "votes_count": votes_count},
+@router.get("/voting/{qr_token}/stream")
+async def stream_voter_events(
+    qr_token: UUID,
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """Public SSE endpoint for a voter's phone (agenda and has-voted changes)."""
+    entry = await run_in_threadpool(_resolve_voter, qr_token)
+    if entry.assignment_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Aguardando check-in. Procure o secretario",
+        )
+
+    resume_from = last_event_id_header or last_event_id
+    replay = (
+        voter_broadcaster.replay(entry.assembly_id, resume_from, recipient=entry.assignment_id)
+        if resume_from
+        else None
+    )
+    queue = await voter_broadcaster.connect(entry.assembly_id, recipient=entry.assignment_id)
+    return StreamingResponse(
+        event_generator(
+            entry.assembly_id,
+            queue,
+            source=voter_broadcaster,
+            recipient=entry.assignment_id,
+            replay=replay,
+        ),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
     )
 
 
+def _require_metrics_token(authorization: Optional[str] = Header(None)) -> None:
+    """Allow only the platform operator's ``REALTIME_METRICS_TOKEN`` (404 when unset)."""
+    expected = settings.REALTIME_METRICS_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+
+@router.get("/metrics", response_model=RealtimeMetricsResponse, dependencies=[Depends(_require_metrics_token)])
+async def get_realtime_metrics() -> RealtimeMetricsResponse:
+    """Broadcaster metrics of this process, across every tenant."""
+    return RealtimeMetricsResponse(
+        process_id=PROCESS_ID[:8],
+        backend=settings.BROADCAST_BACKEND,
+        channels=[broadcaster.metrics(), voter_broadcaster.metrics()],
+    )
+
+
+async def _send_vote_update(assembly_id: int, data: dict) -> None:
+    await broadcaster.broadcast(assembly_id, "vote_update", data)
+
+
+def _load_tally(assembly_id: int, agenda_id: int) -> Optional[TallySnapshot]:
+    """Rebuild an agenda tally for vote_update events, in a short-lived session."""
+    with database.SessionLocal() as db:
+        tenant_id = get_assembly_tenant(db, assembly_id)
+        if tenant_id is None:
+            return None
+        return get_agenda_tally(db, agenda_id, tenant_id).snapshot()
+
+
+vote_updates = VoteUpdateCoalescer(settings.VOTE_UPDATE_MAX_PER_SECOND, _send_vote_update, _load_tally)
+cache_sync.register("vote_updates", vote_updates.forget, vote_updates.reset)
+
+
+async def notify_vote_cast(assembly_id: int, agenda_id: int) -> None:
+    """Notify vote was cast (batched into rate-limited vote_update events)."""
+    vote_updates.mark(assembly_id, agenda_id)
+
+
 async def notify_checkin(assembly_id: int, units_present: int, fraction_present: float) -> None:
     """Notify new check-in."""
     await broadcaster.broadcast(
@@ -132,9 +532,36 @@ async def notify_checkin(assembly_id: int, units_present: int, fraction_present:
 
 
 async def notify_agenda_status(assembly_id: int, agenda_id: int, status_value: str) -> None:
-    """Notify agenda status changed (opened/closed)."""
-    await broadcaster.broadcast(
+    """Notify agenda status changed (opened/closed/cancelled)."""
+    if status_value in (AgendaStatus.closed.value, AgendaStatus.cancelled.value):
+        # No more votes: release its vote_update state in every process.
+        vote_updates.forget(agenda_id)
+        await cache_sync.publish_async("vote_updates", agenda_id)
+    data = {"agenda_id": agenda_id, "status": status_value}
+    await broadcaster.broadcast(assembly_id, "agenda_update", data)
+    await voter_broadcaster.broadcast(assembly_id, "agenda_update", data)
+
+
+async def notify_ballot_update(
+    assembly_id: int,
+    assignment_id: int,
+    agenda_id: int,
+    has_voted: bool,
+) -> None:
+    """Notify a voter's phone that its has-voted state changed."""
+    await voter_broadcaster.broadcast(
         assembly_id,
-        "agenda_update",
-        {"agenda_id": agenda_id, "status": status_value},
+        "ballot_update",
+        {"agenda_id": agenda_id, "has_voted": has_voted},
+        recipient=assignment_id,
+    )
+
+
+async def notify_checkin_removed(assembly_id: int, assignment_id: int) -> None:
+    """Notify a voter's phone that its check-in was undone."""
+    await voter_broadcaster.broadcast(
+        assembly_id,
+        "checkin_update",
+        {"checked_in": False},
+        recipient=assignment_id,
     )
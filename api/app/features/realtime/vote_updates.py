@@ -0,0 +1,129 @@
+"""
+Rate-limited vote_update events per agenda.
+A vote only marks its agenda; at most ``rate`` times per second an event
+carries the latest totals from the in-memory tally and, per option, the
+change since the previous event.
+
+Totals are authoritative. Deltas are hints: each worker keeps its own
+baseline, so with several workers a delta is relative to the previous event
+sent by the same worker, not to what a client last received.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.features.voting.tally import TallyRegistry, TallySnapshot, tally_registry
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[int, dict], Awaitable[None]]
+Load = Callable[[int, int], Optional[TallySnapshot]]
+
+
+class VoteUpdateCoalescer:
+    """Batches vote_update events per agenda.
+
+    The first vote of a quiet agenda is announced right away; votes arriving
+    within ``1 / rate`` seconds of the last event share the next one. Counts
+    come from the tally, which ``load`` rebuilds (in the threadpool, off the
+    vote request) when it is not cached.
+    """
+
+    def __init__(self, rate: float, send: Send, load: Load, registry: TallyRegistry = tally_registry) -> None:
+        self.interval = 1.0 / rate
+        self.send = send
+        self.load = load
+        self.registry = registry
+        self._scheduled: dict[int, asyncio.Task] = {}
+        self._last_flush: dict[int, float] = {}
+        self._sent: dict[int, dict[int, tuple[int, float]]] = {}
+
+    def mark(self, assembly_id: int, agenda_id: int) -> None:
+        """Schedule a vote_update for an agenda unless one is already pending."""
+        loop = asyncio.get_running_loop()
+        task = self._scheduled.get(agenda_id)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        delay = self._last_flush.get(agenda_id, float("-inf")) + self.interval - time.monotonic()
+        self._scheduled[agenda_id] = loop.create_task(self._flush(assembly_id, agenda_id, max(delay, 0.0)))
+
+    async def _flush(self, assembly_id: int, agenda_id: int, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        # Votes recorded from here on schedule the next event.
+        self._scheduled.pop(agenda_id, None)
+        self._last_flush[agenda_id] = time.monotonic()
+        try:
+            tally = self.registry.get(agenda_id)
+            if tally is not None:
+                snapshot = tally.snapshot()
+            else:
+                snapshot = await run_in_threadpool(self.load, assembly_id, agenda_id)
+            data = self._update(snapshot) if snapshot is not None else None
+            if data is not None:
+                await self.send(assembly_id, data)
+        except Exception:
+            logger.exception("Failed to send vote_update for agenda %s", agenda_id)
+
+    def _update(self, snapshot: TallySnapshot) -> Optional[dict]:
+        """Build the event payload (None if nothing changed since the last one)."""
+        previous = self._sent.get(snapshot.agenda_id, {})
+        current = {
+            option.option_id: (
+                snapshot.option_counts.get(option.option_id, 0),
+                snapshot.option_fractions.get(option.option_id, 0.0),
+            )
+            for option in snapshot.options
+        }
+        if current == previous:
+            return None
+        self._sent[snapshot.agenda_id] = current
+
+        options = []
+        for option_id, (votes_count, fraction_sum) in current.items():
+            previous_count, previous_fraction = previous.get(option_id, (0, 0.0))
+            options.append(
+                {
+                    "option_id": option_id,
+                    "votes_count": votes_count,
+                    "fraction_sum": fraction_sum,
+                    "votes_delta": votes_count - previous_count,
+                    "fraction_delta": round(fraction_sum - previous_fraction, 6),
+                }
+            )
+        return {
+            "agenda_id": snapshot.agenda_id,
+            "votes_count": snapshot.total_units_voted,
+            "fraction_voted": snapshot.total_fraction_voted,
+            "options": options,
+        }
+
+    def forget(self, agenda_id: int) -> None:
+        """Drop an agenda's baseline once it closes (a pending event is still sent)."""
+        task = self._scheduled.get(agenda_id)
+        if task is not None and not task.done():
+            task.add_done_callback(lambda _: self._forget(agenda_id))
+        else:
+            self._forget(agenda_id)
+
+    def _forget(self, agenda_id: int) -> None:
+        self._last_flush.pop(agenda_id, None)
+        self._sent.pop(agenda_id, None)
+
+    def reset(self) -> None:
+        """Drop every baseline, keeping pending events."""
+        self._last_flush.clear()
+        self._sent.clear()
+
+    def clear(self) -> None:
+        """Forget pending events and sent counts."""
+        for task in self._scheduled.values():
+            task.cancel()
+        self._scheduled.clear()
+        self._last_flush.clear()
+        self._sent.clear()
@@ -14,9 +14,9 @@ from weasyprint import HTML
 from app.core.enums import AssemblyType
 from app.features.agendas.models import Agenda
 from app.features.assemblies.models import Assembly
-from app.features.checkin.service import get_attendance_list
+from app.features.checkin.service import iter_attendance
 from app.features.condominiums.models import Condominium
-from app.features.voting.service import calculate_quorum, calculate_results
+from app.features.voting.service import calculate_assembly_results, calculate_quorum, calculate_results
 
 template_env = Environment(
     loader=FileSystemLoader("app/features/reports/templates"),
@@ -74,7 +74,7 @@ def _assembly_type_label(assembly_type: AssemblyType | str) -> str:
 def generate_attendance_pdf(db: Session, assembly_id: int, tenant_id: int) -> BytesIO:
     """Generate attendance list PDF."""
     assembly, condominium = _get_assembly_with_condominium(db, assembly_id, tenant_id)
-    attendance = get_attendance_list(db, assembly_id, tenant_id)
+    attendance = iter_attendance(db, assembly_id)
     quorum = calculate_quorum(db, assembly_id, tenant_id)
 
     context = {
@@ -132,28 +132,20 @@ def generate_final_report_pdf(db: Session, assembly_id: int, tenant_id: int) ->
     """Generate final assembly report (attendance + all agenda results)."""
     assembly, condominium = _get_assembly_with_condominium(db, assembly_id, tenant_id)
 
-    agendas = (
-        db.query(Agenda)
-        .filter(Agenda.assembly_id == assembly_id)
-        .order_by(Agenda.display_order.asc())
-        .all()
-    )
-
-    agenda_results = []
-    for agenda in agendas:
-        results = calculate_results(db, agenda.id, tenant_id)
-        agenda_results.append(
-            {
-                "title": agenda.title,
-                "description": agenda.description or "",
-                "status": agenda.status.value,
-                "results": results.results,
-                "total_units_voted": results.total_units_voted,
-                "total_fraction_voted": results.total_fraction_voted,
-            }
-        )
-
-    attendance = get_attendance_list(db, assembly_id, tenant_id)
+    results = calculate_assembly_results(db, assembly_id, tenant_id)
+    agenda_results = [
+        {
+            "title": agenda.title,
+            "description": agenda.description or "",
+            "status": agenda.status,
+            "results": agenda.results,
+            "total_units_voted": agenda.total_units_voted,
+            "total_fraction_voted": agenda.total_fraction_voted,
+        }
+        for agenda in results.agendas
+    ]
+
+    attendance = iter_attendance(db, assembly_id)
     quorum = calculate_quorum(db, assembly_id, tenant_id)
 
     context = {
@@ -16,7 +16,7 @@ router = APIRouter()
     "/assemblies/{assembly_id}/attendance",
     summary="Generate attendance list PDF",
 )
-async def generate_attendance_report(
+def generate_attendance_report(
     assembly_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -36,7 +36,7 @@ async def generate_attendance_report(
     "/agendas/{agenda_id}/results",
     summary="Generate agenda results PDF",
 )
-async def generate_agenda_report(
+def generate_agenda_report(
     agenda_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -56,7 +56,7 @@ async def generate_agenda_report(
     "/assemblies/{assembly_id}/final",
     summary="Generate final assembly report PDF",
 )
-async def generate_final_report(
+def generate_final_report(
     assembly_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -20,7 +20,7 @@ router = APIRouter()
     summary="Create user",
     dependencies=[Depends(require_property_manager)],
 )
-async def create_user(
+def create_user(
     user: UserCreate,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -36,7 +36,7 @@ async def create_user(
     summary="List users",
     dependencies=[Depends(require_property_manager)],
 )
-async def list_users(
+def list_users(
     page: int = 1,
     page_size: int = 20,
     status: str = "active",
@@ -70,7 +70,7 @@ async def list_users(
     summary="Get user",
     dependencies=[Depends(require_property_manager)],
 )
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -86,7 +86,7 @@ async def get_user(
     summary="Update user",
     dependencies=[Depends(require_property_manager)],
 )
-async def update_user(
+def update_user(
     user_id: int,
     user: UserUpdate,
     db: Session = Depends(get_db),
@@ -103,7 +103,7 @@ async def update_user(
     summary="Deactivate user",
     dependencies=[Depends(require_property_manager)],
 )
-async def delete_user(
+def delete_user(
     user_id: int,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
@@ -0,0 +1,187 @@
+"""Pre-serialized ballot snapshot per assembly, shared by every voter."""
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.enums import AgendaStatus
+from app.core.etag import BOOT_ID, make_etag
+from app.core.pubsub import cache_sync
+from app.features.agendas.models import Agenda, AgendaOption
+from app.features.assemblies.models import Assembly
+from app.features.condominiums.models import Condominium
+from app.features.qr_codes.cache import QRTokenEntry
+from app.features.voting.schemas import (
+    VotingStatusAgendaResponse,
+    VotingStatusAssemblyResponse,
+    VotingStatusOptionResponse,
+)
+
+
+@dataclass(frozen=True)
+class BallotSnapshot:
+    """Serialized assembly header and open agenda for an assembly."""
+
+    assembly_id: int
+    tenant_id: int
+    version: int
+    agenda_id: Optional[int]
+    assembly_json: bytes
+    agenda_json: bytes
+
+    def render(self, units_json: bytes, has_voted: bool) -> bytes:
+        """Compose a VotingStatusResponse body around per-token data."""
+        return b"".join(
+            (
+                b'{"assembly":',
+                self.assembly_json,
+                b',"agenda":',
+                self.agenda_json,
+                b',"units":',
+                units_json,
+                b',"has_voted":',
+                b"true" if has_voted else b"false",
+                b"}",
+            )
+        )
+
+
+@dataclass(frozen=True)
+class VotingStatusView:
+    """Voting status of a QR token, rendered lazily."""
+
+    ballot: BallotSnapshot
+    entry: QRTokenEntry
+    has_voted: bool
+
+    @property
+    def etag(self) -> str:
+        return make_etag(
+            BOOT_ID,
+            "status",
+            self.ballot.version,
+            self.entry.assignment_id,
+            int(self.has_voted),
+        )
+
+    def render(self) -> bytes:
+        """Serialize as a VotingStatusResponse body."""
+        return self.ballot.render(self.entry.units_json, self.has_voted)
+
+
+def build_ballot(db: Session, assembly_id: int, tenant_id: int, version: int) -> Optional[BallotSnapshot]:
+    """Build the ballot snapshot for an assembly (None if not found for tenant)."""
+    assembly = (
+        db.query(Assembly)
+        .join(Condominium, Assembly.condominium_id == Condominium.id)
+        .filter(
+            Assembly.id == assembly_id,
+            Condominium.tenant_id == tenant_id,
+        )
+        .first()
+    )
+    if not assembly:
+        return None
+
+    agenda = (
+        db.query(Agenda)
+        .filter(
+            Agenda.assembly_id == assembly.id,
+            Agenda.status == AgendaStatus.open,
+        )
+        .order_by(Agenda.display_order.asc(), Agenda.opened_at.asc())
+        .first()
+    )
+
+    agenda_json = b"null"
+    if agenda:
+        options = (
+            db.query(AgendaOption)
+            .filter(AgendaOption.agenda_id == agenda.id)
+            .order_by(AgendaOption.display_order.asc())
+            .all()
+        )
+        agenda_json = VotingStatusAgendaResponse(
+            id=agenda.id,
+            assembly_id=agenda.assembly_id,
+            title=agenda.title,
+            description=agenda.description,
+            status=agenda.status.value,
+            display_order=agenda.display_order,
+            options=[VotingStatusOptionResponse.model_validate(option) for option in options],
+        ).model_dump_json().encode()
+
+    return BallotSnapshot(
+        assembly_id=assembly.id,
+        tenant_id=tenant_id,
+        version=version,
+        agenda_id=agenda.id if agenda else None,
+        assembly_json=VotingStatusAssemblyResponse.model_validate(assembly).model_dump_json().encode(),
+        agenda_json=agenda_json,
+    )
+
+
+class BallotCache:
+    """Ballot snapshots per assembly, built at most once at a time per assembly."""
+
+    def __init__(self) -> None:
+        self._snapshots: TTLCache[int, BallotSnapshot] = TTLCache(maxsize=1024, ttl_seconds=3600)
+        self._versions = itertools.count(1)
+        self._lock = threading.Lock()
+        self._build_locks: dict[int, threading.Lock] = {}
+
+    def get(self, assembly_id: int) -> Optional[BallotSnapshot]:
+        """Return cached snapshot, if any."""
+        return self._snapshots.get(assembly_id)
+
+    def get_or_build(self, db: Session, assembly_id: int, tenant_id: int) -> BallotSnapshot:
+        """Return snapshot for an assembly, building it once on a miss."""
+        snapshot = self._snapshots.get(assembly_id)
+        if snapshot is None:
+            with self._build_lock(assembly_id):
+                snapshot = self._snapshots.get(assembly_id)
+                if snapshot is None:
+                    snapshot = self._build(db, assembly_id, tenant_id)
+        if snapshot is None or snapshot.tenant_id != tenant_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+        return snapshot
+
+    def refresh(self, db: Session, assembly_id: int, tenant_id: int) -> Optional[BallotSnapshot]:
+        """Rebuild snapshot after an agenda change."""
+        with self._build_lock(assembly_id):
+            self.invalidate(assembly_id)
+            return self._build(db, assembly_id, tenant_id)
+
+    def _build_lock(self, assembly_id: int) -> threading.Lock:
+        with self._lock:
+            return self._build_locks.setdefault(assembly_id, threading.Lock())
+
+    def _build(self, db: Session, assembly_id: int, tenant_id: int) -> Optional[BallotSnapshot]:
+        generation = self._snapshots.generation
+        snapshot = build_ballot(db, assembly_id, tenant_id, next(self._versions))
+        if snapshot is not None:
+            self._snapshots.set(assembly_id, snapshot, generation)
+        return snapshot
+
+    def invalidate(self, assembly_id: int) -> None:
+        """Drop snapshot so the next read rebuilds it (in every process)."""
+        self.drop(assembly_id)
+        cache_sync.publish("ballot", assembly_id)
+
+    def drop(self, assembly_id: int) -> None:
+        """Drop snapshot in this process only."""
+        self._snapshots.invalidate(assembly_id)
+
+    def clear(self) -> None:
+        """Drop every snapshot."""
+        self._snapshots.clear()
+
+
+ballot_cache = BallotCache()
+cache_sync.register("ballot", ballot_cache.drop, ballot_cache.clear)
@@ -1,17 +1,18 @@
 """Voting endpoints."""
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.core.dependencies import get_current_tenant, get_current_user, require_operator_or_manager
-from app.features.agendas import service as agendas_service
-from app.features.realtime.sse import notify_vote_cast
+from app.core.etag import NO_CACHE, is_not_modified, not_modified
+from app.features.realtime.sse import notify_ballot_update, notify_vote_cast
 from app.features.voting import service
-from app.features.voting.models import Vote
 from app.features.voting.schemas import (
     AgendaResultsResponse,
+    AssemblyResultsResponse,
     QuorumResponse,
     VoteCastRequest,
     VoteCastResponse,
@@ -33,24 +34,15 @@ async def cast_vote(
     db: Session = Depends(get_db),
 ) -> VoteCastResponse:
     """Cast vote for the units linked to a QR code."""
-    qr_code = service.get_qr_code_for_voting(db, payload.qr_token)
-    vote_ids = service.cast_vote(
+    assembly_id, assignment_id, vote_ids = await run_in_threadpool(
+        service.cast_vote_for_token,
         db,
         payload.qr_token,
         payload.agenda_id,
         payload.option_id,
-        qr_code.tenant_id,
     )
-    agenda = agendas_service.get_agenda(db, payload.agenda_id, qr_code.tenant_id)
-    votes_count = (
-        db.query(Vote)
-        .filter(
-            Vote.agenda_id == payload.agenda_id,
-            Vote.is_valid.is_(True),
-        )
-        .count()
-    )
-    await notify_vote_cast(agenda.assembly_id, payload.agenda_id, votes_count)
+    await notify_vote_cast(assembly_id, payload.agenda_id)
+    await notify_ballot_update(assembly_id, assignment_id, payload.agenda_id, True)
     return VoteCastResponse(
         agenda_id=payload.agenda_id,
         option_id=payload.option_id,
@@ -64,12 +56,21 @@ async def cast_vote(
     response_model=VotingStatusResponse,
     summary="Get voting status by QR token",
 )
-async def get_voting_status(
+def get_voting_status(
     qr_token: UUID,
+    request: Request,
     db: Session = Depends(get_db),
-) -> VotingStatusResponse:
+) -> Response:
     """Return current public voting status for a QR token."""
-    return service.get_voting_status(db, qr_token)
+    voting_status = service.get_voting_status(db, qr_token)
+    etag = voting_status.etag
+    if is_not_modified(request, etag):
+        return not_modified(etag, NO_CACHE)
+    return Response(
+        content=voting_status.render(),
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": NO_CACHE},
+    )
 
 
 @router.post(
@@ -85,7 +86,11 @@ async def invalidate_vote(
     current_user=Depends(get_current_user),
 ) -> VoteResponse:
     """Invalidate a vote (audit-friendly)."""
-    vote = service.invalidate_vote(db, vote_id, current_user.id, tenant_id)
+    vote = await run_in_threadpool(service.invalidate_vote, db, vote_id, current_user.id, tenant_id)
+    ballot_state = await run_in_threadpool(service.get_ballot_state, db, vote)
+    if ballot_state:
+        assembly_id, assignment_id, has_voted = ballot_state
+        await notify_ballot_update(assembly_id, assignment_id, vote.agenda_id, has_voted)
     return VoteResponse.model_validate(vote)
 
 
@@ -94,24 +99,56 @@ async def invalidate_vote(
     response_model=AgendaResultsResponse,
     summary="Get agenda results",
 )
-async def get_results(
+def get_results(
     agenda_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
 ) -> AgendaResultsResponse:
     """Get aggregated results for an agenda."""
+    etag = service.get_results_etag(agenda_id, tenant_id)
+    if etag is not None:
+        if is_not_modified(request, etag):
+            return not_modified(etag, NO_CACHE)
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = NO_CACHE
     return service.calculate_results(db, agenda_id, tenant_id)
 
 
+@router.get(
+    "/assemblies/{assembly_id}/results",
+    response_model=AssemblyResultsResponse,
+    summary="Get assembly results",
+)
+def get_assembly_results(
+    assembly_id: int,
+    response: Response,
+    db: Session = Depends(get_db),
+    tenant_id: int = Depends(get_current_tenant),
+) -> AssemblyResultsResponse:
+    """Get aggregated results for every agenda of an assembly."""
+    response.headers["Cache-Control"] = NO_CACHE
+    return service.calculate_assembly_results(db, assembly_id, tenant_id)
+
+
 @router.get(
     "/assemblies/{assembly_id}/quorum",
     response_model=QuorumResponse,
     summary="Get assembly quorum",
 )
-async def get_quorum(
+def get_quorum(
     assembly_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     tenant_id: int = Depends(get_current_tenant),
 ) -> QuorumResponse:
     """Get quorum calculation for an assembly."""
+    etag = service.get_quorum_etag(assembly_id)
+    if is_not_modified(request, etag):
+        service.check_assembly_access(db, assembly_id, tenant_id)
+        return not_modified(etag, NO_CACHE)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = NO_CACHE
     return service.calculate_quorum(db, assembly_id, tenant_id)
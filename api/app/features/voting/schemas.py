@@ -121,3 +121,26 @@ class AgendaResultsResponse(BaseModel):
     total_fraction_present: float
     total_fraction_voted: float
     results: List[OptionResult]
+
+
+class AssemblyAgendaResults(BaseModel):
+    """Schema for one agenda in the assembly results."""
+
+    agenda_id: int
+    title: str
+    description: Optional[str] = None
+    status: str
+    display_order: int
+    total_units_voted: int
+    total_fraction_voted: float
+    results: List[OptionResult]
+
+
+class AssemblyResultsResponse(BaseModel):
+    """Schema for the results of every agenda of an assembly."""
+
+    assembly_id: int
+    total_units: int
+    total_units_present: int
+    total_fraction_present: float
+    agendas: List[AssemblyAgendaResults]
@@ -1,30 +1,39 @@
 """Business logic for voting operations."""
 from __future__ import annotations
 
-from typing import List
+from decimal import Decimal
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
 from app.core.enums import AgendaStatus, QRCodeStatus
+from app.core.etag import BOOT_ID, make_etag
 from app.core.exceptions import AgendaNotOpenError, VoteAlreadyCastError
 from app.features.agendas.models import Agenda, AgendaOption
+from app.features.assemblies.cache import get_assembly_tenant
 from app.features.assemblies.models import Assembly, AssemblyUnit
+from app.features.checkin.attendance import attendance_versions
+from app.features.checkin.service import get_assembly_attendance
 from app.features.checkin.models import QRCodeAssignedUnit, QRCodeAssignment
 from app.features.condominiums.models import Condominium
+from app.features.qr_codes.cache import AssignedUnit, QRTokenEntry, qr_token_cache
 from app.features.qr_codes.models import QRCode
+from app.features.voting.ballot import VotingStatusView, ballot_cache
 from app.features.voting.models import Vote
+from app.features.voting.tally import AgendaTally, TallyOption, tally_registry
 from app.features.voting.schemas import (
     AgendaResultsResponse,
+    AssemblyAgendaResults,
+    AssemblyResultsResponse,
     OptionResult,
     QuorumResponse,
-    VotingStatusAgendaResponse,
-    VotingStatusAssemblyResponse,
-    VotingStatusOptionResponse,
-    VotingStatusResponse,
     VotingStatusUnitResponse,
 )
 
@@ -45,155 +54,218 @@ def _get_agenda(db: Session, agenda_id: int, tenant_id: int) -> Agenda:
     return agenda
 
 
-def _get_option(db: Session, agenda_id: int, option_id: int) -> AgendaOption:
-    option = (
-        db.query(AgendaOption)
-        .filter(
-            AgendaOption.id == option_id,
-            AgendaOption.agenda_id == agenda_id,
-        )
-        .first()
-    )
-    if not option:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agenda option not found")
-    return option
+_units_adapter = TypeAdapter(List[VotingStatusUnitResponse])
 
 
-def get_qr_code_for_voting(db: Session, qr_token: UUID) -> QRCode:
-    """Resolve QR code for public voting flow."""
+def _load_qr_token(db: Session, qr_token: UUID) -> QRTokenEntry | None:
     qr_code = db.query(QRCode).filter(QRCode.token == qr_token).first()
     if not qr_code:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR Code invalido")
-
-    if qr_code.status != QRCodeStatus.active or qr_code.deleted_at is not None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="QR Code desativado. Procure o administrador",
+        return None
+
+    is_active = qr_code.status == QRCodeStatus.active and qr_code.deleted_at is None
+    assignment = None
+    units: tuple[AssignedUnit, ...] = ()
+    if is_active:
+        assignment = (
+            db.query(QRCodeAssignment)
+            .join(Assembly, QRCodeAssignment.assembly_id == Assembly.id)
+            .join(Condominium, Assembly.condominium_id == Condominium.id)
+            .filter(
+                QRCodeAssignment.qr_code_id == qr_code.id,
+                Condominium.tenant_id == qr_code.tenant_id,
+            )
+            .first()
         )
-    return qr_code
-
-
-def _get_assignment(
-    db: Session,
-    qr_code_id: int,
-    assembly_id: int,
-    tenant_id: int,
-) -> QRCodeAssignment:
-    assignment = (
-        db.query(QRCodeAssignment)
-        .join(QRCode, QRCodeAssignment.qr_code_id == QRCode.id)
-        .filter(
-            QRCode.id == qr_code_id,
-            QRCode.tenant_id == tenant_id,
-            QRCode.status == QRCodeStatus.active,
-            QRCodeAssignment.assembly_id == assembly_id,
+    if assignment:
+        units = tuple(
+            AssignedUnit(id=row[0], unit_number=row[1], owner_name=row[2])
+            for row in db.query(
+                AssemblyUnit.id,
+                AssemblyUnit.unit_number,
+                AssemblyUnit.owner_name,
+            )
+            .join(QRCodeAssignedUnit, QRCodeAssignedUnit.assembly_unit_id == AssemblyUnit.id)
+            .filter(QRCodeAssignedUnit.assignment_id == assignment.id)
+            .order_by(AssemblyUnit.unit_number.asc())
+            .all()
         )
-        .first()
+
+    return QRTokenEntry(
+        qr_code_id=qr_code.id,
+        tenant_id=qr_code.tenant_id,
+        is_active=is_active,
+        assignment_id=assignment.id if assignment else None,
+        assembly_id=assignment.assembly_id if assignment else None,
+        units=units,
+        units_json=_units_adapter.dump_json(
+            [
+                VotingStatusUnitResponse(id=unit.id, unit_number=unit.unit_number, owner_name=unit.owner_name)
+                for unit in units
+            ]
+        ),
     )
-    if not assignment:
+
+
+def resolve_qr_token(db: Session, qr_token: UUID) -> QRTokenEntry:
+    """Resolve QR token for public voting flow (cached until check-in or QR changes)."""
+    entry = qr_token_cache.get(qr_token)
+    if entry is None:
+        generation = qr_token_cache.generation
+        entry = _load_qr_token(db, qr_token)
+        if entry is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR Code invalido")
+        qr_token_cache.set(qr_token, entry, generation)
+
+    if not entry.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Aguardando check-in. Procure o secretario",
+            detail="QR Code desativado. Procure o administrador",
         )
-    return assignment
+    return entry
 
 
-def get_voting_status(db: Session, qr_token: UUID) -> VotingStatusResponse:
-    """Get public voting status by QR token."""
-    qr_code = get_qr_code_for_voting(db, qr_token)
+def get_voting_status(db: Session, qr_token: UUID) -> VotingStatusView:
+    """Get public voting status by QR token.
 
-    assignment = (
-        db.query(QRCodeAssignment)
-        .join(Assembly, QRCodeAssignment.assembly_id == Assembly.id)
-        .join(Condominium, Assembly.condominium_id == Condominium.id)
-        .filter(
-            QRCodeAssignment.qr_code_id == qr_code.id,
-            Condominium.tenant_id == qr_code.tenant_id,
-        )
-        .first()
-    )
-    if not assignment:
+    The assembly and open agenda come from the shared ballot snapshot; only the
+    token's units and has_voted (answered by the agenda tally) are per request.
+    """
+    entry = resolve_qr_token(db, qr_token)
+    if entry.assignment_id is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Aguardando check-in. Procure o secretario",
         )
 
-    assembly = (
-        db.query(Assembly)
-        .join(Condominium, Assembly.condominium_id == Condominium.id)
-        .filter(
-            Assembly.id == assignment.assembly_id,
-            Condominium.tenant_id == qr_code.tenant_id,
-        )
-        .first()
-    )
-    if not assembly:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+    ballot = ballot_cache.get_or_build(db, entry.assembly_id, entry.tenant_id)
 
-    agenda = (
-        db.query(Agenda)
-        .filter(
-            Agenda.assembly_id == assembly.id,
-            Agenda.status == AgendaStatus.open,
+    has_voted = False
+    if ballot.agenda_id is not None and entry.units:
+        tally = get_agenda_tally(db, ballot.agenda_id, entry.tenant_id)
+        has_voted = tally.has_voted(entry.unit_ids)
+
+    return VotingStatusView(ballot=ballot, entry=entry, has_voted=has_voted)
+
+
+def _insert_votes(db: Session, agenda_id: int, option_id: int, unit_ids: List[int]) -> List[tuple[int, int]]:
+    """Insert one vote per unit, skipping units that already voted on the agenda."""
+    dialect = db.get_bind().dialect.name
+    insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+    statement = (
+        insert(Vote)
+        .values(
+            [
+                {
+                    "agenda_id": agenda_id,
+                    "assembly_unit_id": unit_id,
+                    "option_id": option_id,
+                    "is_valid": True,
+                }
+                for unit_id in unit_ids
+            ]
         )
-        .order_by(Agenda.display_order.asc(), Agenda.opened_at.asc())
-        .first()
+        .on_conflict_do_nothing(index_elements=["agenda_id", "assembly_unit_id"])
+        .returning(Vote.id, Vote.assembly_unit_id)
     )
+    return [(row[0], row[1]) for row in db.execute(statement).all()]
 
+
+def cast_vote_for_token(
+    db: Session,
+    qr_token: UUID,
+    agenda_id: int,
+    option_id: int,
+    tenant_id: int | None = None,
+) -> tuple[int, int, List[int]]:
+    """Cast a vote for all units linked to a QR code.
+
+    QR code, agenda, option, assignment and units are validated in one joined
+    statement; votes are inserted in one INSERT ... ON CONFLICT DO NOTHING
+    relying on uq_vote_per_unit_agenda. Returns (assembly_id, assignment_id, vote_ids).
+    """
     rows = (
         db.query(
+            QRCode.tenant_id,
+            QRCode.status,
+            QRCode.deleted_at,
+            Condominium.id,
+            Agenda.status,
+            Agenda.assembly_id,
+            AgendaOption.id,
+            QRCodeAssignment.id,
             AssemblyUnit.id,
-            AssemblyUnit.unit_number,
-            AssemblyUnit.owner_name,
+            AssemblyUnit.ideal_fraction,
+        )
+        .select_from(QRCode)
+        .outerjoin(Agenda, Agenda.id == agenda_id)
+        .outerjoin(Assembly, Assembly.id == Agenda.assembly_id)
+        .outerjoin(
+            Condominium,
+            and_(
+                Condominium.id == Assembly.condominium_id,
+                Condominium.tenant_id == (tenant_id if tenant_id is not None else QRCode.tenant_id),
+            ),
+        )
+        .outerjoin(
+            AgendaOption,
+            and_(AgendaOption.id == option_id, AgendaOption.agenda_id == Agenda.id),
         )
-        .join(QRCodeAssignedUnit, QRCodeAssignedUnit.assembly_unit_id == AssemblyUnit.id)
-        .filter(QRCodeAssignedUnit.assignment_id == assignment.id)
-        .order_by(AssemblyUnit.unit_number.asc())
+        .outerjoin(
+            QRCodeAssignment,
+            and_(
+                QRCodeAssignment.qr_code_id == QRCode.id,
+                QRCodeAssignment.assembly_id == Agenda.assembly_id,
+            ),
+        )
+        .outerjoin(QRCodeAssignedUnit, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
+        .outerjoin(AssemblyUnit, AssemblyUnit.id == QRCodeAssignedUnit.assembly_unit_id)
+        .filter(QRCode.token == qr_token)
         .all()
     )
-    units = [
-        VotingStatusUnitResponse(id=row[0], unit_number=row[1], owner_name=row[2])
-        for row in rows
-    ]
-
-    has_voted = False
-    agenda_payload = None
-    if agenda:
-        unit_ids = [unit.id for unit in units]
-        if unit_ids:
-            has_voted = (
-                db.query(Vote)
-                .filter(
-                    Vote.agenda_id == agenda.id,
-                    Vote.assembly_unit_id.in_(unit_ids),
-                    Vote.is_valid.is_(True),
-                )
-                .first()
-                is not None
-            )
+    if not rows:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="QR Code invalido")
 
-        options = (
-            db.query(AgendaOption)
-            .filter(AgendaOption.agenda_id == agenda.id)
-            .order_by(AgendaOption.display_order.asc())
-            .all()
+    (
+        qr_tenant_id,
+        qr_status,
+        qr_deleted_at,
+        condominium_id,
+        agenda_status,
+        assembly_id,
+        found_option_id,
+        assignment_id,
+        _,
+        _,
+    ) = rows[0]
+    if qr_status != QRCodeStatus.active or qr_deleted_at is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="QR Code desativado. Procure o administrador",
         )
-        agenda_payload = VotingStatusAgendaResponse(
-            id=agenda.id,
-            assembly_id=agenda.assembly_id,
-            title=agenda.title,
-            description=agenda.description,
-            status=agenda.status.value,
-            display_order=agenda.display_order,
-            options=[VotingStatusOptionResponse.model_validate(option) for option in options],
+    if condominium_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agenda not found")
+    if agenda_status != AgendaStatus.open:
+        raise AgendaNotOpenError(agenda_status.value)
+    if found_option_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agenda option not found")
+    if assignment_id is None or (tenant_id is not None and qr_tenant_id != tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Aguardando check-in. Procure o secretario",
         )
 
-    return VotingStatusResponse(
-        assembly=VotingStatusAssemblyResponse.model_validate(assembly),
-        agenda=agenda_payload,
-        units=units,
-        has_voted=has_voted,
-    )
+    unit_fractions = {row[8]: row[9] for row in rows if row[8] is not None}
+    if not unit_fractions:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No units assigned to this QR code")
+
+    inserted = _insert_votes(db, agenda_id, option_id, list(unit_fractions))
+    if len(inserted) != len(unit_fractions):
+        db.rollback()
+        raise VoteAlreadyCastError()
+    db.commit()
+
+    tally_registry.record_votes(agenda_id, option_id, unit_fractions.items())
+    return assembly_id, assignment_id, [vote_id for vote_id, _ in inserted]
 
 
 def cast_vote(
@@ -204,47 +276,8 @@ def cast_vote(
     tenant_id: int,
 ) -> List[int]:
     """Cast a vote for all units linked to a QR code."""
-    qr_code = get_qr_code_for_voting(db, qr_token)
-    agenda = _get_agenda(db, agenda_id, tenant_id)
-    if agenda.status != AgendaStatus.open:
-        raise AgendaNotOpenError(agenda.status.value)
-
-    _get_option(db, agenda_id, option_id)
-    assignment = _get_assignment(db, qr_code.id, agenda.assembly_id, tenant_id)
-
-    unit_ids = [
-        row[0]
-        for row in db.query(QRCodeAssignedUnit.assembly_unit_id)
-        .filter(QRCodeAssignedUnit.assignment_id == assignment.id)
-        .all()
-    ]
-    if not unit_ids:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No units assigned to this QR code")
-
-    existing_vote = (
-        db.query(Vote)
-        .filter(
-            Vote.agenda_id == agenda_id,
-            Vote.assembly_unit_id.in_(unit_ids),
-        )
-        .first()
-    )
-    if existing_vote:
-        raise VoteAlreadyCastError()
-
-    votes = [
-        Vote(
-            agenda_id=agenda_id,
-            assembly_unit_id=unit_id,
-            option_id=option_id,
-            is_valid=True,
-        )
-        for unit_id in unit_ids
-    ]
-    db.add_all(votes)
-    db.flush()
-    db.commit()
-    return [vote.id for vote in votes]
+    _, _, vote_ids = cast_vote_for_token(db, qr_token, agenda_id, option_id, tenant_id)
+    return vote_ids
 
 
 def invalidate_vote(db: Session, vote_id: int, invalidated_by: int, tenant_id: int) -> Vote:
@@ -270,134 +303,131 @@ def invalidate_vote(db: Session, vote_id: int, invalidated_by: int, tenant_id: i
     vote.invalidated_at = func.now()
     db.commit()
     db.refresh(vote)
+    tally_registry.record_invalidation(vote.agenda_id, vote.assembly_unit_id)
     return vote
 
 
-def calculate_quorum(db: Session, assembly_id: int, tenant_id: int) -> QuorumResponse:
-    """Calculate quorum for an assembly based on check-in."""
-    assembly = (
-        db.query(Assembly)
-        .join(Condominium, Assembly.condominium_id == Condominium.id)
+def get_ballot_state(db: Session, vote: Vote) -> tuple[int, int, bool] | None:
+    """Return (assembly_id, assignment_id, has_voted) for the QR code that cast a vote."""
+    row = (
+        db.query(QRCodeAssignment.assembly_id, QRCodeAssignment.id)
+        .join(QRCodeAssignedUnit, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
+        .join(Agenda, Agenda.assembly_id == QRCodeAssignment.assembly_id)
         .filter(
-            Assembly.id == assembly_id,
-            Condominium.tenant_id == tenant_id,
+            Agenda.id == vote.agenda_id,
+            QRCodeAssignedUnit.assembly_unit_id == vote.assembly_unit_id,
         )
         .first()
     )
-    if not assembly:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
+    if not row:
+        return None
 
-    total_units = (
-        db.query(func.count(AssemblyUnit.id))
-        .filter(AssemblyUnit.assembly_id == assembly_id)
-        .scalar()
-        or 0
+    assembly_id, assignment_id = row
+    has_voted = (
+        db.query(Vote.id)
+        .join(QRCodeAssignedUnit, QRCodeAssignedUnit.assembly_unit_id == Vote.assembly_unit_id)
+        .filter(
+            QRCodeAssignedUnit.assignment_id == assignment_id,
+            Vote.agenda_id == vote.agenda_id,
+            Vote.is_valid.is_(True),
+        )
+        .first()
+        is not None
     )
+    return assembly_id, assignment_id, has_voted
 
-    present_unit_ids = (
-        select(QRCodeAssignedUnit.assembly_unit_id)
-        .join(QRCodeAssignment, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
-        .filter(QRCodeAssignment.assembly_id == assembly_id)
-        .distinct()
-    )
 
-    present_units_subquery = present_unit_ids.subquery()
-    units_present = db.query(func.count()).select_from(present_units_subquery).scalar() or 0
-    fraction_present = (
-        db.query(func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0.0))
-        .filter(AssemblyUnit.id.in_(present_unit_ids))
-        .scalar()
-        or 0.0
-    )
-    fraction_present = float(fraction_present)
-    quorum_reached = fraction_present >= 50.0
+def get_quorum_etag(assembly_id: int) -> str:
+    """Return ETag for the quorum of an assembly (changes on check-in/undo/import)."""
+    return make_etag(BOOT_ID, "quorum", assembly_id, attendance_versions.get(assembly_id))
 
-    return QuorumResponse(
-        total_units=total_units,
-        units_present=units_present,
-        fraction_present=fraction_present,
-        quorum_reached=quorum_reached,
-    )
 
+def check_assembly_access(db: Session, assembly_id: int, tenant_id: int) -> None:
+    """Ensure the assembly exists for the tenant (no query once its tenant is cached)."""
+    if get_assembly_tenant(db, assembly_id) != tenant_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Assembly not found")
 
-def calculate_results(db: Session, agenda_id: int, tenant_id: int) -> AgendaResultsResponse:
-    """Calculate voting results for an agenda."""
-    agenda = _get_agenda(db, agenda_id, tenant_id)
-    assembly_id = agenda.assembly_id
 
-    present_unit_ids = (
-        select(QRCodeAssignedUnit.assembly_unit_id)
-        .join(QRCodeAssignment, QRCodeAssignedUnit.assignment_id == QRCodeAssignment.id)
-        .filter(QRCodeAssignment.assembly_id == assembly_id)
-        .distinct()
+def calculate_quorum(db: Session, assembly_id: int, tenant_id: int) -> QuorumResponse:
+    """Calculate quorum for an assembly based on check-in."""
+    attendance = get_assembly_attendance(db, assembly_id, tenant_id)
+    return QuorumResponse(
+        total_units=attendance.total_units,
+        units_present=attendance.units_present,
+        fraction_present=attendance.fraction_present,
+        quorum_reached=attendance.fraction_present >= 50.0,
     )
 
-    present_units_subquery = present_unit_ids.subquery()
-    total_units_present = db.query(func.count()).select_from(present_units_subquery).scalar() or 0
-    total_fraction_present = (
-        db.query(func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0.0))
-        .filter(AssemblyUnit.id.in_(present_unit_ids))
-        .scalar()
-        or 0.0
-    )
 
-    total_units_voted = (
-        db.query(func.count(func.distinct(Vote.assembly_unit_id)))
-        .filter(
-            Vote.agenda_id == agenda_id,
-            Vote.is_valid.is_(True),
-        )
-        .scalar()
-        or 0
+def get_agenda_tally(db: Session, agenda_id: int, tenant_id: int) -> AgendaTally:
+    """Return the in-memory tally for an agenda, rebuilding it from votes if needed."""
+    tally = tally_registry.get(agenda_id)
+    if tally is not None:
+        if tally.tenant_id != tenant_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Agenda not found")
+        return tally
+
+    version = tally_registry.version(agenda_id)
+    agenda = _get_agenda(db, agenda_id, tenant_id)
+    options = (
+        db.query(AgendaOption.id, AgendaOption.option_text)
+        .filter(AgendaOption.agenda_id == agenda_id)
+        .order_by(AgendaOption.display_order.asc())
+        .all()
     )
-    total_fraction_voted = (
-        db.query(func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0.0))
-        .join(Vote, AssemblyUnit.id == Vote.assembly_unit_id)
-        .filter(
-            Vote.agenda_id == agenda_id,
-            Vote.is_valid.is_(True),
-        )
-        .scalar()
-        or 0.0
+    tally = AgendaTally(
+        agenda_id=agenda.id,
+        assembly_id=agenda.assembly_id,
+        tenant_id=tenant_id,
+        options=[TallyOption(option_id=row[0], option_text=row[1]) for row in options],
     )
-
-    aggregates = {
-        row.option_id: {
-            "votes_count": row.votes_count or 0,
-            "fraction_sum": float(row.fraction_sum or 0.0),
-        }
-        for row in db.query(
-            Vote.option_id.label("option_id"),
-            func.count(Vote.id).label("votes_count"),
-            func.coalesce(func.sum(AssemblyUnit.ideal_fraction), 0.0).label("fraction_sum"),
-        )
+    votes = (
+        db.query(Vote.assembly_unit_id, Vote.option_id, AssemblyUnit.ideal_fraction)
         .join(AssemblyUnit, AssemblyUnit.id == Vote.assembly_unit_id)
         .filter(
             Vote.agenda_id == agenda_id,
             Vote.is_valid.is_(True),
         )
-        .group_by(Vote.option_id)
-        .all()
-    }
-
-    options = (
-        db.query(AgendaOption)
-        .filter(AgendaOption.agenda_id == agenda_id)
-        .order_by(AgendaOption.display_order.asc())
         .all()
     )
+    for unit_id, option_id, ideal_fraction in votes:
+        tally.add_vote(unit_id, option_id, ideal_fraction)
+    return tally_registry.store(tally, version)
+
+
+def get_results_etag(agenda_id: int, tenant_id: int) -> Optional[str]:
+    """Return ETag for agenda results, or None until the tally is loaded.
+
+    Combines the tally version (votes, invalidations, option edits) with the
+    attendance version of the assembly (units/fraction present).
+    """
+    tally = tally_registry.get(agenda_id)
+    if tally is None or tally.tenant_id != tenant_id:
+        return None
+    return make_etag(
+        BOOT_ID,
+        "results",
+        agenda_id,
+        tally_registry.version(agenda_id),
+        attendance_versions.get(tally.assembly_id),
+    )
+
+
+def calculate_results(db: Session, agenda_id: int, tenant_id: int) -> AgendaResultsResponse:
+    """Calculate voting results for an agenda."""
+    tally = get_agenda_tally(db, agenda_id, tenant_id).snapshot()
+    attendance = get_assembly_attendance(db, tally.assembly_id, tenant_id)
 
     results: List[OptionResult] = []
-    total_fraction_voted = float(total_fraction_voted)
-    for option in options:
-        aggregate = aggregates.get(option.id, {"votes_count": 0, "fraction_sum": 0.0})
-        fraction_sum = aggregate["fraction_sum"]
+    total_fraction_voted = tally.total_fraction_voted
+    for option in tally.options:
+        fraction_sum = tally.option_fractions.get(option.option_id, 0.0)
         percentage = (fraction_sum / total_fraction_voted * 100.0) if total_fraction_voted else 0.0
         results.append(
             OptionResult(
-                option_id=option.id,
+                option_id=option.option_id,
                 option_text=option.option_text,
-                votes_count=aggregate["votes_count"],
+                votes_count=tally.option_counts.get(option.option_id, 0),
                 fraction_sum=fraction_sum,
                 percentage=percentage,
             )
@@ -405,9 +435,100 @@ def calculate_results(db: Session, agenda_id: int, tenant_id: int) -> AgendaResu
 
     return AgendaResultsResponse(
         agenda_id=agenda_id,
-        total_units_present=total_units_present,
-        total_units_voted=total_units_voted,
-        total_fraction_present=float(total_fraction_present),
+        total_units_present=attendance.units_present,
+        total_units_voted=tally.total_units_voted,
+        total_fraction_present=attendance.fraction_present,
         total_fraction_voted=total_fraction_voted,
         results=results,
     )
+
+
+def calculate_assembly_results(db: Session, assembly_id: int, tenant_id: int) -> AssemblyResultsResponse:
+    """Calculate results for every agenda of an assembly.
+
+    Attendance is read once and the votes of all agendas are aggregated in a
+    single grouped query, so the cost does not grow with the agenda count.
+    """
+    attendance = get_assembly_attendance(db, assembly_id, tenant_id)
+
+    rows = (
+        db.query(
+            Agenda.id,
+            Agenda.title,
+            Agenda.description,
+            Agenda.status,
+            Agenda.display_order,
+            AgendaOption.id,
+            AgendaOption.option_text,
+        )
+        .outerjoin(AgendaOption, AgendaOption.agenda_id == Agenda.id)
+        .filter(Agenda.assembly_id == assembly_id)
+        .order_by(Agenda.display_order.asc(), Agenda.id.asc(), AgendaOption.display_order.asc())
+        .all()
+    )
+    totals = {
+        (agenda_id, option_id): (votes_count, fraction_sum)
+        for agenda_id, option_id, votes_count, fraction_sum in (
+            db.query(
+                Vote.agenda_id,
+                Vote.option_id,
+                func.count(Vote.id),
+                func.sum(AssemblyUnit.ideal_fraction),
+            )
+            .join(Agenda, Agenda.id == Vote.agenda_id)
+            .join(AssemblyUnit, AssemblyUnit.id == Vote.assembly_unit_id)
+            .filter(
+                Agenda.assembly_id == assembly_id,
+                Vote.is_valid.is_(True),
+            )
+            .group_by(Vote.agenda_id, Vote.option_id)
+            .all()
+        )
+    }
+
+    agendas: dict[int, dict] = {}
+    for agenda_id, title, description, agenda_status, display_order, option_id, option_text in rows:
+        agenda = agendas.setdefault(
+            agenda_id,
+            {
+                "agenda_id": agenda_id,
+                "title": title,
+                "description": description,
+                "status": agenda_status.value,
+                "display_order": display_order,
+                "options": [],
+            },
+        )
+        if option_id is not None:
+            votes_count, fraction_sum = totals.get((agenda_id, option_id), (0, 0))
+            agenda["options"].append((option_id, option_text, votes_count, Decimal(fraction_sum or 0)))
+
+    agenda_results: List[AssemblyAgendaResults] = []
+    for agenda in agendas.values():
+        options = agenda.pop("options")
+        total_fraction_voted = float(sum((fraction for _, _, _, fraction in options), Decimal("0")))
+        agenda_results.append(
+            AssemblyAgendaResults(
+                **agenda,
+                total_units_voted=sum(votes_count for _, _, votes_count, _ in options),
+                total_fraction_voted=total_fraction_voted,
+                results=[
+                    OptionResult(
+                        option_id=option_id,
+                        option_text=option_text,
+                        votes_count=votes_count,
+                        fraction_sum=float(fraction),
+                        percentage=(float(fraction) / total_fraction_voted * 100.0) if total_fraction_voted else 0.0,
+                    )
+                    for option_id, option_text, votes_count, fraction in options
+                ],
+            )
+        )
+
+    return AssemblyResultsResponse(
+        assembly_id=assembly_id,
+        total_units=attendance.total_units,
+        total_units_present=attendance.units_present,
+        total_fraction_present=attendance.fraction_present,
+        agendas=agenda_results,
+    )
@@ -0,0 +1,187 @@
+"""
+In-memory vote tallies per agenda.
+Kept in sync by cast/invalidate and rebuilt from the votes table on cold start.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+from app.core.pubsub import cache_sync
+
+
+@dataclass(frozen=True)
+class TallyOption:
+    """Option metadata needed to render results."""
+
+    option_id: int
+    option_text: str
+
+
+@dataclass(frozen=True)
+class TallySnapshot:
+    """Consistent read-only view of an agenda tally."""
+
+    agenda_id: int
+    assembly_id: int
+    options: tuple[TallyOption, ...]
+    option_counts: dict[int, int]
+    option_fractions: dict[int, float]
+    total_units_voted: int
+    total_fraction_voted: float
+
+
+class AgendaTally:
+    """Option counts, fraction sums and voted units for one agenda."""
+
+    def __init__(
+        self,
+        agenda_id: int,
+        assembly_id: int,
+        tenant_id: int,
+        options: Iterable[TallyOption],
+    ) -> None:
+        self.agenda_id = agenda_id
+        self.assembly_id = assembly_id
+        self.tenant_id = tenant_id
+        self.options = tuple(options)
+        self.option_counts: dict[int, int] = {option.option_id: 0 for option in self.options}
+        self.option_fractions: dict[int, Decimal] = {option.option_id: Decimal("0") for option in self.options}
+        self.unit_votes: dict[int, tuple[int, Decimal]] = {}
+        self._lock = threading.Lock()
+
+    def add_vote(self, unit_id: int, option_id: int, ideal_fraction: float | Decimal) -> None:
+        """Count a valid vote (ignored if the unit already voted)."""
+        fraction = Decimal(str(ideal_fraction))
+        with self._lock:
+            if unit_id in self.unit_votes:
+                return
+            self.unit_votes[unit_id] = (option_id, fraction)
+            self.option_counts[option_id] = self.option_counts.get(option_id, 0) + 1
+            self.option_fractions[option_id] = self.option_fractions.get(option_id, Decimal("0")) + fraction
+
+    def remove_vote(self, unit_id: int) -> None:
+        """Discount the vote of a unit (used when a vote is invalidated)."""
+        with self._lock:
+            entry = self.unit_votes.pop(unit_id, None)
+            if entry is None:
+                return
+            option_id, fraction = entry
+            self.option_counts[option_id] -= 1
+            self.option_fractions[option_id] -= fraction
+
+    def has_voted(self, unit_ids: Iterable[int]) -> bool:
+        """Return True if any of the units has a valid vote."""
+        with self._lock:
+            return any(unit_id in self.unit_votes for unit_id in unit_ids)
+
+    def snapshot(self) -> TallySnapshot:
+        """Return a consistent copy of the current counters."""
+        with self._lock:
+            total_fraction_voted = sum((fraction for _, fraction in self.unit_votes.values()), Decimal("0"))
+            return TallySnapshot(
+                agenda_id=self.agenda_id,
+                assembly_id=self.assembly_id,
+                options=self.options,
+                option_counts=dict(self.option_counts),
+                option_fractions={key: float(value) for key, value in self.option_fractions.items()},
+                total_units_voted=len(self.unit_votes),
+                total_fraction_voted=float(total_fraction_voted),
+            )
+
+
+class TallyRegistry:
+    """Process-wide registry of agenda tallies.
+
+    Every mutation bumps a per-agenda version so a tally built from the
+    database concurrently with a vote is discarded instead of stored stale.
+    """
+
+    def __init__(self) -> None:
+        self._tallies: dict[int, AgendaTally] = {}
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, agenda_id: int) -> AgendaTally | None:
+        """Return cached tally for an agenda, if loaded."""
+        return self._tallies.get(agenda_id)
+
+    def version(self, agenda_id: int) -> int:
+        """Return current mutation version for an agenda."""
+        return self._versions.get(agenda_id, 0)
+
+    def store(self, tally: AgendaTally, version: int) -> AgendaTally:
+        """Cache a freshly built tally unless the agenda changed meanwhile."""
+        with self._lock:
+            if self._versions.get(tally.agenda_id, 0) == version:
+                self._tallies.setdefault(tally.agenda_id, tally)
+                return self._tallies[tally.agenda_id]
+        return tally
+
+    def _bump(self, agenda_id: int) -> AgendaTally | None:
+        with self._lock:
+            self._versions[agenda_id] = self._versions.get(agenda_id, 0) + 1
+            return self._tallies.get(agenda_id)
+
+    def record_votes(
+        self,
+        agenda_id: int,
+        option_id: int,
+        unit_fractions: Iterable[tuple[int, float | Decimal]],
+    ) -> None:
+        """Apply committed votes to the cached tally (in every process)."""
+        units = [(unit_id, str(ideal_fraction)) for unit_id, ideal_fraction in unit_fractions]
+        self.apply_votes({"agenda_id": agenda_id, "option_id": option_id, "units": units})
+        cache_sync.publish("tally_votes", {"agenda_id": agenda_id, "option_id": option_id, "units": units})
+
+    def apply_votes(self, delta: dict) -> None:
+        """Apply committed votes in this process only."""
+        tally = self._bump(delta["agenda_id"])
+        if tally is not None:
+            for unit_id, ideal_fraction in delta["units"]:
+                tally.add_vote(unit_id, delta["option_id"], Decimal(ideal_fraction))
+
+    def record_invalidation(self, agenda_id: int, unit_id: int) -> None:
+        """Apply a committed vote invalidation to the cached tally (in every process)."""
+        self.apply_invalidation({"agenda_id": agenda_id, "unit_id": unit_id})
+        cache_sync.publish("tally_invalidation", {"agenda_id": agenda_id, "unit_id": unit_id})
+
+    def apply_invalidation(self, delta: dict) -> None:
+        """Apply a committed vote invalidation in this process only."""
+        tally = self._bump(delta["agenda_id"])
+        if tally is not None:
+            tally.remove_vote(delta["unit_id"])
+
+    def invalidate(self, agenda_id: int) -> None:
+        """Drop cached tally so the next read rebuilds it."""
+        self.drop(agenda_id)
+        cache_sync.publish("tally", agenda_id)
+
+    def drop(self, agenda_id: int) -> None:
+        """Drop cached tally in this process only (votes changed elsewhere)."""
+        with self._lock:
+            self._versions[agenda_id] = self._versions.get(agenda_id, 0) + 1
+            self._tallies.pop(agenda_id, None)
+
+    def reset(self) -> None:
+        """Drop every cached tally, keeping versions monotonic."""
+        with self._lock:
+            for agenda_id in set(self._versions) | set(self._tallies):
+                self._versions[agenda_id] = self._versions.get(agenda_id, 0) + 1
+            self._tallies.clear()
+
+    def clear(self) -> None:
+        """Drop every cached tally."""
+        with self._lock:
+            self._tallies.clear()
+            self._versions.clear()
+
+
+tally_registry = TallyRegistry()
+# Votes travel as deltas; a whole tally is only dropped when its options
+# change or after messages may have been missed.
+cache_sync.register("tally", tally_registry.drop, tally_registry.reset)
+cache_sync.register("tally_votes", tally_registry.apply_votes)
+cache_sync.register("tally_invalidation", tally_registry.apply_invalidation)
@@ -2,6 +2,9 @@
 FastAPI application entry point.
 Configures CORS, middleware, and base health endpoint.
 """
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -9,6 +12,7 @@ from fastapi.responses import JSONResponse
 
 from app.core.config import settings
 from app.core.exception_handlers import register_exception_handlers
+from app.core.pubsub import pubsub
 from app.core.tenancy import TenantMiddleware
 from app.features.auth.router import router as auth_router
 from app.features.assemblies.router import router as assemblies_router
@@ -18,10 +22,23 @@ from app.features.checkin.router import router as checkin_router
 from app.features.qr_codes.router import router as qr_codes_router
 from app.features.users.router import router as users_router
 from app.features.voting.router import router as voting_router
-from app.features.realtime.sse import router as realtime_router
+from app.features.realtime.sse import heartbeat, router as realtime_router
 from app.features.reports.router import router as reports_router
 from app import models  # noqa: F401
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Size the worker threadpool and run the real-time pub/sub backend."""
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    await pubsub.start()
+    try:
+        yield
+    finally:
+        heartbeat.stop()
+        await pubsub.stop()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="API para votacao de assembleias de condominio",
@@ -29,6 +46,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
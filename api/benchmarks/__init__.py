@@ -0,0 +1 @@
+"""Load-testing harnesses for the API hot paths."""
@@ -17,9 +17,16 @@ os.environ.setdefault("SECRET_KEY", "test-secret-key")
 
 from app.core import database as core_database  # noqa: E402
 from app.core.enums import UserRole, UserStatus  # noqa: E402
+from app.features.assemblies.cache import assembly_tenant_cache  # noqa: E402
 from app.features.auth.security import hash_password  # noqa: E402
+from app.features.checkin.attendance import attendance_versions  # noqa: E402
+from app.features.checkin.search import unit_search_cache  # noqa: E402
 from app.features.tenants.models import Tenant  # noqa: E402
+from app.features.qr_codes.cache import qr_token_cache  # noqa: E402
+from app.features.realtime.sse import vote_updates  # noqa: E402
 from app.features.users.models import User  # noqa: E402
+from app.features.voting.ballot import ballot_cache  # noqa: E402
+from app.features.voting.tally import tally_registry  # noqa: E402
 from app.main import app  # noqa: E402
 from app.core.database import get_db  # noqa: E402
 from app import models  # noqa: F401, E402
@@ -57,6 +64,13 @@ def db_session() -> Generator[Session, None, None]:
                     table.constraints.remove(constraint)
 
     core_database.Base.metadata.create_all(bind=engine)
+    tally_registry.clear()
+    qr_token_cache.clear()
+    ballot_cache.clear()
+    attendance_versions.clear()
+    assembly_tenant_cache.clear()
+    unit_search_cache.clear()
+    vote_updates.clear()
     db = TestingSessionLocal()
     try:
         yield db
@@ -1,14 +1,18 @@
 """Integration tests for check-in router payload and QR identifier resolution."""
 from __future__ import annotations
 
+import json
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app.core.enums import AssemblyType, QRCodeStatus
 from app.features.assemblies.models import Assembly, AssemblyUnit
+from app.features.checkin import service
+from app.features.checkin.models import AttendanceStats, QRCodeAssignment
 from app.features.condominiums.models import Condominium
 from app.features.qr_codes.models import QRCode
 from app.features.users.models import User
@@ -177,3 +181,384 @@ def test_checkin_returns_404_for_missing_or_inactive_visual_number(
         },
     )
     assert inactive_response.status_code == 404
+
+
+def test_quorum_etag_changes_after_checkin(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    unit = _create_unit(db_session, assembly.id, "105")
+    qr = _create_qr_code(db_session, sample_tenant.id, 9)
+    db_session.commit()
+
+    quorum_url = f"/api/v1/voting/assemblies/{assembly.id}/quorum"
+    first = authenticated_client.get(quorum_url)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    unchanged = authenticated_client.get(quorum_url, headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+
+    checkin_response = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin",
+        json={"qr_token": str(qr.token), "unit_ids": [unit.id], "is_proxy": False},
+    )
+    assert checkin_response.status_code == 201
+
+    changed = authenticated_client.get(quorum_url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["units_present"] == 1
+    assert changed.headers["etag"] != etag
+
+
+def test_quorum_follows_checkin_and_undo_deltas(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    units = [_create_unit(db_session, assembly.id, number) for number in ("201", "202", "203")]
+    qr_a = _create_qr_code(db_session, sample_tenant.id, 11)
+    qr_b = _create_qr_code(db_session, sample_tenant.id, 12)
+    db_session.commit()
+    quorum_url = f"/api/v1/voting/assemblies/{assembly.id}/quorum"
+
+    assert authenticated_client.get(quorum_url).json()["units_present"] == 0
+    stats = db_session.get(AttendanceStats, assembly.id)
+    assert stats is not None
+
+    authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin",
+        json={"qr_token": str(qr_a.token), "unit_ids": [units[0].id, units[1].id], "is_proxy": False},
+    )
+    second = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin",
+        json={"qr_token": str(qr_b.token), "unit_ids": [units[2].id], "is_proxy": False},
+    )
+    db_session.refresh(stats)
+    assert (stats.units_present, float(stats.fraction_present)) == (3, 7.5)
+    assert authenticated_client.get(quorum_url).json() == {
+        "total_units": 3,
+        "units_present": 3,
+        "fraction_present": 7.5,
+        "quorum_reached": False,
+    }
+
+    undo = authenticated_client.delete(f"/api/v1/checkin/assignments/{second.json()['id']}")
+    assert undo.status_code == 204
+    after_undo = authenticated_client.get(quorum_url).json()
+    assert after_undo["units_present"] == 2
+    assert after_undo["fraction_present"] == 5.0
+
+    db_session.delete(stats)
+    db_session.commit()
+    assert authenticated_client.get(quorum_url).json() == after_undo
+
+
+def test_attendance_read_does_not_commit_the_session(
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    _create_unit(db_session, assembly.id, "211")
+    db_session.commit()
+    pending = _create_unit(db_session, assembly.id, "212")
+
+    attendance = service.get_assembly_attendance(db_session, assembly.id, sample_tenant.id)
+    db_session.rollback()
+
+    assert attendance.total_units == 2
+    assert db_session.get(AssemblyUnit, pending.id) is None
+    assert db_session.get(AttendanceStats, assembly.id) is None
+
+
+def test_bulk_checkin_reports_per_entry_errors_and_notifies_once(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    notifications: list[tuple[int, int, float]] = []
+
+    async def _capture(assembly_id: int, units_present: int, fraction_present: float) -> None:
+        notifications.append((assembly_id, units_present, fraction_present))
+
+    monkeypatch.setattr("app.features.checkin.router.notify_checkin", _capture)
+
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    units = [_create_unit(db_session, assembly.id, number) for number in ("301", "302", "303", "304")]
+    qr_a = _create_qr_code(db_session, sample_tenant.id, 21)
+    qr_b = _create_qr_code(db_session, sample_tenant.id, 22)
+    qr_c = _create_qr_code(db_session, sample_tenant.id, 23)
+    inactive = _create_qr_code(db_session, sample_tenant.id, 24, status=QRCodeStatus.inactive)
+    db_session.commit()
+
+    response = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin/bulk",
+        json={
+            "entries": [
+                {"qr_token": str(qr_a.token), "unit_ids": [units[0].id, units[1].id]},
+                {"qr_visual_number": 22, "unit_ids": [units[2].id], "is_proxy": True},
+                {"qr_visual_number": 21, "unit_ids": [units[3].id]},
+                {"qr_token": str(qr_c.token), "unit_ids": [units[2].id]},
+                {"qr_token": str(inactive.token), "unit_ids": [units[3].id]},
+                {"qr_visual_number": 23, "unit_ids": [999999]},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert [item["qr_code_id"] for item in payload["created"]] == [qr_a.id, qr_b.id]
+    assert [item["is_proxy"] for item in payload["created"]] == [False, True]
+    assert [(error["index"], error["status_code"]) for error in payload["errors"]] == [
+        (2, 400),
+        (3, 400),
+        (4, 404),
+        (5, 400),
+    ]
+    assert payload["errors"][0]["detail"] == "QR code is already assigned to this assembly"
+    assert payload["errors"][1]["detail"] == "One or more units are already checked in"
+    assert notifications == [(assembly.id, 3, 7.5)]
+
+    attendance = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly.id}/attendance").json()
+    assert sorted(len(item["units"]) for item in attendance["items"]) == [1, 2]
+
+
+def test_checkin_rejects_reused_qr_and_units(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    other_assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    unit = _create_unit(db_session, assembly.id, "401")
+    foreign_unit = _create_unit(db_session, other_assembly.id, "402")
+    qr_a = _create_qr_code(db_session, sample_tenant.id, 31)
+    qr_b = _create_qr_code(db_session, sample_tenant.id, 32)
+    db_session.commit()
+    url = f"/api/v1/checkin/assemblies/{assembly.id}/checkin"
+
+    created = authenticated_client.post(url, json={"qr_token": str(qr_a.token), "unit_ids": [unit.id]})
+    assert created.status_code == 201
+    assert created.json()["qr_code_id"] == qr_a.id
+    assert created.json()["assigned_at"] is not None
+
+    cases = [
+        ({"qr_visual_number": 31, "unit_ids": [unit.id]}, 400, "QR code is already assigned to this assembly"),
+        ({"qr_visual_number": 32, "unit_ids": [unit.id]}, 400, "One or more units are already checked in"),
+        ({"qr_visual_number": 32, "unit_ids": [foreign_unit.id]}, 400, "One or more units not found for this assembly"),
+        ({"qr_visual_number": 99, "unit_ids": [unit.id]}, 404, "QR code not found"),
+    ]
+    for payload, status_code, detail in cases:
+        response = authenticated_client.post(url, json=payload)
+        assert (response.status_code, response.json()["detail"]) == (status_code, detail)
+
+    missing = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id + 1000}/checkin",
+        json={"qr_token": str(qr_b.token), "unit_ids": [unit.id]},
+    )
+    assert missing.status_code == 404
+    assert missing.json()["detail"] == "Assembly not found"
+
+
+def test_checkin_race_on_a_unit_is_settled_by_the_database(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    unit = _create_unit(db_session, assembly.id, "411")
+    qr_a = _create_qr_code(db_session, sample_tenant.id, 33)
+    qr_b = _create_qr_code(db_session, sample_tenant.id, 34)
+    db_session.commit()
+    url = f"/api/v1/checkin/assemblies/{assembly.id}/checkin"
+    assert authenticated_client.post(url, json={"qr_token": str(qr_a.token), "unit_ids": [unit.id]}).status_code == 201
+
+    # The second desk validated before the first one committed.
+    check_assignment = service._check_assignment
+
+    def _stale_check(*args, **kwargs):
+        return [(*row[:6], False) for row in check_assignment(*args, **kwargs)]
+
+    monkeypatch.setattr(service, "_check_assignment", _stale_check)
+    response = authenticated_client.post(url, json={"qr_token": str(qr_b.token), "unit_ids": [unit.id]})
+
+    assert (response.status_code, response.json()["detail"]) == (400, "One or more units are already checked in")
+    stats = db_session.get(AttendanceStats, assembly.id)
+    db_session.refresh(stats)
+    assert (stats.units_present, float(stats.fraction_present)) == (1, 2.5)
+    assert db_session.query(QRCodeAssignment).filter(QRCodeAssignment.qr_code_id == qr_b.id).count() == 0
+
+
+def test_select_units_by_owner_ignores_case_accents_and_spacing(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    first = _create_unit(db_session, assembly.id, "401")
+    second = _create_unit(db_session, assembly.id, "402")
+    other = _create_unit(db_session, assembly.id, "403")
+    first.owner_name = "José  da Silva"
+    second.owner_name = " JOSE DA SILVA "
+    other.owner_name = "Maria da Silva"
+    db_session.commit()
+
+    response = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/select-units-by-owner",
+        json={"owner_name": "jose da  silva"},
+    )
+    assert response.status_code == 200
+    assert sorted(response.json()) == [first.id, second.id]
+
+
+def test_unit_search_reports_checkin_status(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    present = _create_unit(db_session, assembly.id, "501")
+    absent = _create_unit(db_session, assembly.id, "502")
+    qr = _create_qr_code(db_session, sample_tenant.id, 50)
+    db_session.commit()
+
+    checkin_response = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin",
+        json={"qr_token": str(qr.token), "unit_ids": [present.id], "is_proxy": False},
+    )
+    assert checkin_response.status_code == 201
+
+    response = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly.id}/units/search?q=50")
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(item["id"], item["checked_in"]) for item in items] == [(present.id, True), (absent.id, False)]
+
+    missing_response = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly.id + 1}/units/search?q=50")
+    assert missing_response.status_code == 404
+
+
+def test_attendance_pages_by_cursor_and_streams_ndjson(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    units = [_create_unit(db_session, assembly.id, str(601 + index)) for index in range(4)]
+    qrs = [_create_qr_code(db_session, sample_tenant.id, 60 + index) for index in range(3)]
+    db_session.commit()
+    for qr, unit_ids in zip(qrs, [[units[0].id, units[1].id], [units[2].id], [units[3].id]]):
+        response = authenticated_client.post(
+            f"/api/v1/checkin/assemblies/{assembly.id}/checkin",
+            json={"qr_token": str(qr.token), "unit_ids": unit_ids, "is_proxy": False},
+        )
+        assert response.status_code == 201
+
+    url = f"/api/v1/checkin/assemblies/{assembly.id}/attendance"
+    full = authenticated_client.get(url).json()
+    assert full["next_cursor"] is None
+    assert [item["qr_visual_number"] for item in full["items"]] == [60, 61, 62]
+    assert [unit["unit_number"] for unit in full["items"][0]["units"]] == ["601", "602"]
+
+    first = authenticated_client.get(url, params={"limit": 2}).json()
+    assert [item["qr_visual_number"] for item in first["items"]] == [60, 61]
+    second = authenticated_client.get(url, params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [item["qr_visual_number"] for item in second["items"]] == [62]
+    assert second["next_cursor"] is None
+
+    stream = authenticated_client.get(f"{url}/stream")
+    assert stream.status_code == 200
+    assert stream.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in stream.text.splitlines()] == full["items"]
+
+    missing = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly.id + 1}/attendance/stream")
+    assert missing.status_code == 404
+
+
+def test_sync_applies_operation_log_once(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    notifications: list[tuple[int, int, float]] = []
+
+    async def _capture(assembly_id: int, units_present: int, fraction_present: float) -> None:
+        notifications.append((assembly_id, units_present, fraction_present))
+
+    monkeypatch.setattr("app.features.checkin.router.notify_checkin", _capture)
+
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    units = [_create_unit(db_session, assembly.id, number) for number in ("701", "702", "703")]
+    qr_a = _create_qr_code(db_session, sample_tenant.id, 71)
+    _create_qr_code(db_session, sample_tenant.id, 72)
+    db_session.commit()
+
+    url = f"/api/v1/checkin/assemblies/{assembly.id}/checkin/sync"
+    operations = [
+        {"idempotency_key": "desk1-1", "operation": "checkin", "qr_token": str(qr_a.token), "unit_ids": [units[0].id]},
+        {"idempotency_key": "desk1-2", "operation": "checkin", "qr_visual_number": 72, "unit_ids": [units[1].id]},
+        {"idempotency_key": "desk1-3", "operation": "undo", "qr_visual_number": 71},
+        {"idempotency_key": "desk1-4", "operation": "checkin", "qr_visual_number": 72, "unit_ids": [units[2].id]},
+        {"idempotency_key": "desk1-5", "operation": "checkin", "qr_visual_number": 71, "unit_ids": [units[0].id]},
+    ]
+    response = authenticated_client.post(url, json={"operations": operations})
+    assert response.status_code == 200
+    payload = response.json()
+    assert [(result["status_code"], result["replayed"]) for result in payload["results"]] == [
+        (201, False),
+        (201, False),
+        (200, False),
+        (400, False),
+        (201, False),
+    ]
+    assert payload["results"][3]["detail"] == "QR code is already assigned to this assembly"
+    assert payload["results"][2]["assignment_id"] == payload["results"][0]["assignment_id"]
+    assert (payload["units_present"], payload["fraction_present"]) == (2, 5.0)
+    assert payload["checked_in_unit_ids"] == [units[0].id, units[1].id]
+    assert notifications == [(assembly.id, 2, 5.0)]
+
+    undo_b = {"idempotency_key": "desk1-6", "operation": "undo", "qr_visual_number": 72}
+    retry = authenticated_client.post(url, json={"operations": operations[3:] + [undo_b]})
+    assert retry.status_code == 200
+    retried = retry.json()
+    assert [(result["status_code"], result["replayed"]) for result in retried["results"]] == [
+        (400, True),
+        (201, True),
+        (200, False),
+    ]
+    assert retried["results"][1]["assignment_id"] == payload["results"][4]["assignment_id"]
+    assert (retried["units_present"], retried["checked_in_unit_ids"]) == (1, [units[0].id])
+
+    quorum = authenticated_client.get(f"/api/v1/voting/assemblies/{assembly.id}/quorum").json()
+    assert quorum["units_present"] == 1
+
+
+def test_sync_rejects_malformed_operations(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    sample_tenant,
+) -> None:
+    assembly = _create_assembly(db_session, sample_tenant.id, sample_user.id)
+    db_session.commit()
+
+    response = authenticated_client.post(
+        f"/api/v1/checkin/assemblies/{assembly.id}/checkin/sync",
+        json={"operations": [{"idempotency_key": "k", "operation": "undo", "qr_visual_number": 1, "unit_ids": [1]}]},
+    )
+    assert response.status_code == 422
@@ -132,3 +132,62 @@ def test_import_and_list_units_snapshot(
     assert data["total"] == 3
     assert round(data["fraction_sum"], 2) == 8.0
     assert [item["unit_number"] for item in data["items"]] == ["301", "302", "303"]
+
+    quorum = authenticated_client.get(f"/api/v1/voting/assemblies/{assembly_id}/quorum").json()
+    assert (quorum["total_units"], quorum["units_present"], quorum["fraction_present"]) == (3, 0, 0.0)
+
+
+def test_units_list_supports_conditional_get(
+    authenticated_client: TestClient,
+    sample_user: User,
+) -> None:
+    assembly_id = _create_assembly(authenticated_client, sample_user)
+
+    empty_response = authenticated_client.get(f"/api/v1/assemblies/{assembly_id}/units")
+    assert empty_response.status_code == 200
+    assert empty_response.headers["cache-control"] == "no-cache"
+    empty_etag = empty_response.headers["etag"]
+
+    payload = _build_csv([("401", "Ana Costa", "2.5", "123.456.789-09")])
+    import_response = authenticated_client.post(
+        f"/api/v1/assemblies/{assembly_id}/units/import",
+        files={"file": ("units.csv", payload, "text/csv")},
+    )
+    assert import_response.status_code == 200
+
+    imported_response = authenticated_client.get(
+        f"/api/v1/assemblies/{assembly_id}/units",
+        headers={"If-None-Match": empty_etag},
+    )
+    assert imported_response.status_code == 200
+    assert imported_response.json()["total"] == 1
+    assert "immutable" in imported_response.headers["cache-control"]
+
+    cached_response = authenticated_client.get(
+        f"/api/v1/assemblies/{assembly_id}/units",
+        headers={"If-None-Match": imported_response.headers["etag"]},
+    )
+    assert cached_response.status_code == 304
+    assert cached_response.content == b""
+
+
+def test_unit_search_sees_imported_units(
+    authenticated_client: TestClient,
+    sample_user: User,
+) -> None:
+    assembly_id = _create_assembly(authenticated_client, sample_user)
+
+    empty_response = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly_id}/units/search?q=ana")
+    assert empty_response.status_code == 200
+    assert empty_response.json()["items"] == []
+
+    payload = _build_csv([("501", "Ana Costa", "2.5", "123.456.789-09")])
+    import_response = authenticated_client.post(
+        f"/api/v1/assemblies/{assembly_id}/units/import",
+        files={"file": ("units.csv", payload, "text/csv")},
+    )
+    assert import_response.status_code == 200
+
+    search_response = authenticated_client.get(f"/api/v1/checkin/assemblies/{assembly_id}/units/search?q=ana")
+    assert search_response.status_code == 200
+    assert [item["unit_number"] for item in search_response.json()["items"]] == ["501"]
@@ -5,13 +5,18 @@ from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 import pytest
 from fastapi.testclient import TestClient
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
+from app.core import database as core_database
+from app.core.config import settings
 from app.core.enums import AgendaStatus, AssemblyType
 from app.features.agendas.models import Agenda, AgendaOption
+from app.features.assemblies.cache import assembly_tenant_cache
 from app.features.assemblies.models import Assembly, AssemblyUnit
 from app.features.condominiums.models import Condominium
 from app.features.qr_codes.models import QRCode
+from app.features.realtime.sse import _authorize_stream, broadcaster
 from app.features.users.models import User
 
 
@@ -147,10 +152,10 @@ async def test_vote_triggers_notification(
     sample_tenant,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    captured: list[tuple[int, int, int]] = []
+    captured: list[tuple[int, int]] = []
 
-    async def _capture(assembly_id: int, agenda_id: int, votes_count: int) -> None:
-        captured.append((assembly_id, agenda_id, votes_count))
+    async def _capture(assembly_id: int, agenda_id: int) -> None:
+        captured.append((assembly_id, agenda_id))
 
     monkeypatch.setattr("app.features.voting.router.notify_vote_cast", _capture)
 
@@ -175,7 +180,93 @@ async def test_vote_triggers_notification(
         json={"qr_token": str(qr.token), "agenda_id": agenda.id, "option_id": option_yes.id},
     )
     assert response.status_code == 201
-    assert captured
-    assert captured[-1][0] == assembly.id
-    assert captured[-1][1] == agenda.id
-    assert captured[-1][2] >= 1
+    assert captured == [(assembly.id, agenda.id)]
+
+
+def test_operator_stream_requires_auth_and_tenant(
+    client: TestClient,
+    db_session: Session,
+    sample_user: User,
+) -> None:
+    other_tenant_assembly = _create_assembly(
+        db_session,
+        tenant_id=sample_user.tenant_id + 1,
+        operator_id=sample_user.id,
+    )
+    db_session.commit()
+    url = f"/api/v1/realtime/assemblies/{other_tenant_assembly.id}/stream"
+
+    assert client.get(url).status_code == 401
+
+    client.post("/api/v1/auth/login", json={"email": sample_user.email, "password": "test123"})
+    response = client.get(url)
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Assembly not found"
+
+
+def test_stream_authorization_releases_its_session(
+    db_session: Session,
+    sample_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assembly = _create_assembly(db_session, sample_user.tenant_id, sample_user.id)
+    db_session.commit()
+
+    sessions: list[Session] = []
+    session_factory = core_database.SessionLocal
+
+    def _tracking_session() -> Session:
+        session = session_factory()
+        sessions.append(session)
+        return session
+
+    monkeypatch.setattr(core_database, "SessionLocal", _tracking_session)
+
+    _authorize_stream(sample_user.id, assembly.id)
+
+    assert assembly_tenant_cache.get(assembly.id) == sample_user.tenant_id
+    assert len(sessions) == 1
+    assert not sessions[0].in_transaction()
+
+    with pytest.raises(HTTPException) as exc:
+        _authorize_stream(sample_user.id, assembly.id + 1000)
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_realtime_metrics_list_every_tenant_to_the_operator_token(
+    client: TestClient,
+    db_session: Session,
+    sample_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "REALTIME_METRICS_TOKEN", "ops-secret")
+    own = _create_assembly(db_session, sample_user.tenant_id, sample_user.id)
+    other = _create_assembly(db_session, sample_user.tenant_id + 1, sample_user.id)
+    db_session.commit()
+    own_queue = await broadcaster.connect(own.id)
+    other_queue = await broadcaster.connect(other.id)
+    try:
+        response = client.get("/api/v1/realtime/metrics", headers={"Authorization": "Bearer ops-secret"})
+    finally:
+        await broadcaster.disconnect(own.id, own_queue)
+        await broadcaster.disconnect(other.id, other_queue)
+
+    assert response.status_code == 200
+    operator_channel = response.json()["channels"][0]
+    assert operator_channel["channel"] == "operator"
+    assert operator_channel["connections"] >= 2
+    listed = [item["assembly_id"] for item in operator_channel["assemblies"]]
+    assert own.id in listed and other.id in listed
+
+
+def test_realtime_metrics_are_not_open_to_tenant_users(
+    authenticated_client: TestClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert authenticated_client.get("/api/v1/realtime/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "REALTIME_METRICS_TOKEN", "ops-secret")
+    assert authenticated_client.get("/api/v1/realtime/metrics").status_code == 401
+    response = authenticated_client.get("/api/v1/realtime/metrics", headers={"Authorization": "Bearer wrong"})
+    assert response.status_code == 401
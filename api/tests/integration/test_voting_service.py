@@ -5,6 +5,7 @@ from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
 import pytest
+from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.enums import AgendaStatus, AssemblyType, UserRole, UserStatus
@@ -15,6 +16,7 @@ from app.features.checkin.models import QRCodeAssignedUnit, QRCodeAssignment
 from app.features.condominiums.models import Condominium
 from app.features.qr_codes.models import QRCode
 from app.features.users.models import User
+from app.features.voting.models import Vote
 from app.features.voting import service
 
 
@@ -167,3 +169,155 @@ def test_invalidate_vote_marks_invalid(db_session: Session) -> None:
 
     assert vote.is_valid is False
     assert vote.invalidated_by == context["user_id"]
+
+
+def test_calculate_results_tracks_votes_in_memory(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    tenant_id = context["tenant_id"]
+
+    empty = service.calculate_results(db_session, context["agenda_id"], tenant_id)
+    assert empty.total_units_voted == 0
+    assert service.tally_registry.get(context["agenda_id"]) is not None
+
+    vote_ids = service.cast_vote(
+        db_session,
+        context["qr_token"],
+        context["agenda_id"],
+        context["option_id"],
+        tenant_id,
+    )
+    results = service.calculate_results(db_session, context["agenda_id"], tenant_id)
+    assert results.total_units_voted == 1
+    assert results.total_fraction_voted == pytest.approx(2.5)
+    assert results.results[0].votes_count == 1
+    assert results.results[0].percentage == pytest.approx(100.0)
+
+    service.invalidate_vote(db_session, vote_ids[0], context["user_id"], tenant_id)
+    results = service.calculate_results(db_session, context["agenda_id"], tenant_id)
+    assert results.total_units_voted == 0
+    assert results.results[0].votes_count == 0
+
+
+def test_calculate_results_rebuilds_tally_from_votes(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    service.cast_vote(
+        db_session,
+        context["qr_token"],
+        context["agenda_id"],
+        context["option_id"],
+        context["tenant_id"],
+    )
+
+    service.tally_registry.clear()
+    results = service.calculate_results(db_session, context["agenda_id"], context["tenant_id"])
+
+    assert results.total_units_voted == 1
+    assert results.results[0].fraction_sum == pytest.approx(2.5)
+
+
+def test_calculate_results_enforces_tenant_on_cached_tally(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    service.calculate_results(db_session, context["agenda_id"], context["tenant_id"])
+
+    with pytest.raises(HTTPException) as exc:
+        service.calculate_results(db_session, context["agenda_id"], context["tenant_id"] + 1)
+
+    assert exc.value.status_code == 404
+
+
+def test_calculate_assembly_results_matches_agenda_results(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    tenant_id = context["tenant_id"]
+    assembly_id = db_session.get(Agenda, context["agenda_id"]).assembly_id
+    second = Agenda(
+        assembly_id=assembly_id,
+        title="Pauta 2",
+        display_order=2,
+        status=AgendaStatus.pending,
+    )
+    db_session.add(second)
+    db_session.flush()
+    db_session.add_all(
+        [
+            AgendaOption(agenda_id=second.id, option_text="Nao", display_order=2),
+            AgendaOption(agenda_id=second.id, option_text="Sim", display_order=1),
+        ]
+    )
+    db_session.commit()
+    service.cast_vote(
+        db_session,
+        context["qr_token"],
+        context["agenda_id"],
+        context["option_id"],
+        tenant_id,
+    )
+
+    results = service.calculate_assembly_results(db_session, assembly_id, tenant_id)
+
+    assert results.total_units == 1
+    assert results.total_units_present == 1
+    assert [agenda.agenda_id for agenda in results.agendas] == [context["agenda_id"], second.id]
+    first = results.agendas[0]
+    expected = service.calculate_results(db_session, context["agenda_id"], tenant_id)
+    assert first.status == AgendaStatus.open.value
+    assert first.total_units_voted == expected.total_units_voted
+    assert first.total_fraction_voted == pytest.approx(expected.total_fraction_voted)
+    assert first.results == expected.results
+    assert [option.option_text for option in results.agendas[1].results] == ["Sim", "Nao"]
+    assert results.agendas[1].total_units_voted == 0
+
+    with pytest.raises(HTTPException) as exc:
+        service.calculate_assembly_results(db_session, assembly_id, tenant_id + 1)
+    assert exc.value.status_code == 404
+
+
+def test_cast_vote_is_all_or_nothing_for_multiple_units(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    assignment = db_session.query(QRCodeAssignment).one()
+    agenda = db_session.get(Agenda, context["agenda_id"])
+    extra_unit = AssemblyUnit(
+        assembly_id=agenda.assembly_id,
+        unit_number="102",
+        owner_name="Joao",
+        ideal_fraction=1.5,
+        cpf_cnpj="123.456.789-09",
+    )
+    db_session.add(extra_unit)
+    db_session.flush()
+    db_session.add(QRCodeAssignedUnit(assignment_id=assignment.id, assembly_unit_id=extra_unit.id))
+    db_session.add(
+        Vote(
+            agenda_id=context["agenda_id"],
+            assembly_unit_id=extra_unit.id,
+            option_id=context["option_id"],
+            is_valid=True,
+        )
+    )
+    db_session.commit()
+
+    with pytest.raises(VoteAlreadyCastError):
+        service.cast_vote(
+            db_session,
+            context["qr_token"],
+            context["agenda_id"],
+            context["option_id"],
+            context["tenant_id"],
+        )
+
+    assert db_session.query(Vote).filter(Vote.agenda_id == context["agenda_id"]).count() == 1
+
+
+def test_cast_vote_for_token_returns_assembly(db_session: Session) -> None:
+    context = _setup_voting_context(db_session)
+    agenda = db_session.get(Agenda, context["agenda_id"])
+
+    assembly_id, assignment_id, vote_ids = service.cast_vote_for_token(
+        db_session,
+        context["qr_token"],
+        context["agenda_id"],
+        context["option_id"],
+    )
+
+    assert assembly_id == agenda.assembly_id
+    assert assignment_id == db_session.query(QRCodeAssignment).one().id
+    assert len(vote_ids) == 1
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
@@ -169,3 +169,92 @@ def test_cast_vote_works_without_authentication(client: TestClient, db_session:
     status_response = client.get(f"/api/v1/voting/status/{context['qr_token']}")
     assert status_response.status_code == 200
     assert status_response.json()["has_voted"] is True
+
+
+def test_voting_status_cache_is_invalidated_on_qr_deactivation(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_tenant,
+) -> None:
+    context = _seed_context(db_session, tenant_id=sample_tenant.id)
+    qr_code = db_session.query(QRCode).filter(QRCode.token == UUID(context["qr_token"])).one()
+
+    first = authenticated_client.get(f"/api/v1/voting/status/{context['qr_token']}")
+    assert first.status_code == 200
+
+    delete_response = authenticated_client.delete(f"/api/v1/qr-codes/{qr_code.id}")
+    assert delete_response.status_code == 204
+
+    second = authenticated_client.get(f"/api/v1/voting/status/{context['qr_token']}")
+    assert second.status_code == 400
+    assert "desativado" in second.json()["detail"]
+
+
+def test_voter_stream_requires_checkin(client: TestClient, db_session: Session) -> None:
+    context = _seed_context(db_session, with_assignment=False)
+
+    response = client.get(f"/api/v1/realtime/voting/{context['qr_token']}/stream")
+
+    assert response.status_code == 400
+    assert "Aguardando check-in" in response.json()["detail"]
+
+
+def test_voting_status_follows_agenda_status_changes(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_tenant,
+) -> None:
+    context = _seed_context(db_session, tenant_id=sample_tenant.id, agenda_status=AgendaStatus.pending)
+
+    first = authenticated_client.get(f"/api/v1/voting/status/{context['qr_token']}")
+    assert first.status_code == 200
+    assert first.json()["agenda"] is None
+
+    update_response = authenticated_client.put(
+        f"/api/v1/agendas/{context['agenda_id']}",
+        json={"status": "open"},
+    )
+    assert update_response.status_code == 200
+
+    second = authenticated_client.get(f"/api/v1/voting/status/{context['qr_token']}")
+    assert second.status_code == 200
+    payload = second.json()
+    assert payload["agenda"]["id"] == context["agenda_id"]
+    assert payload["agenda"]["options"][0]["option_text"] == "Sim"
+    assert payload["assembly"]["title"] == "Assembleia Publica"
+    assert payload["units"] == [{"id": payload["units"][0]["id"], "unit_number": "101", "owner_name": "Maria"}]
+
+
+def test_voting_status_and_results_support_conditional_get(
+    authenticated_client: TestClient,
+    db_session: Session,
+    sample_tenant,
+) -> None:
+    context = _seed_context(db_session, tenant_id=sample_tenant.id)
+    status_url = f"/api/v1/voting/status/{context['qr_token']}"
+    results_url = f"/api/v1/voting/agendas/{context['agenda_id']}/results"
+
+    status_etag = authenticated_client.get(status_url).headers["etag"]
+    assert authenticated_client.get(status_url, headers={"If-None-Match": status_etag}).status_code == 304
+
+    authenticated_client.get(results_url)
+    results_etag = authenticated_client.get(results_url).headers["etag"]
+    assert authenticated_client.get(results_url, headers={"If-None-Match": results_etag}).status_code == 304
+
+    vote_response = authenticated_client.post(
+        "/api/v1/voting/vote",
+        json={
+            "qr_token": context["qr_token"],
+            "agenda_id": context["agenda_id"],
+            "option_id": context["option_id"],
+        },
+    )
+    assert vote_response.status_code == 201
+
+    status_response = authenticated_client.get(status_url, headers={"If-None-Match": status_etag})
+    assert status_response.status_code == 200
+    assert status_response.json()["has_voted"] is True
+
+    results_response = authenticated_client.get(results_url, headers={"If-None-Match": results_etag})
+    assert results_response.status_code == 200
+    assert results_response.json()["total_units_voted"] == 1
@@ -0,0 +1,46 @@
+"""Unit tests for the ballot snapshot cache."""
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.features.voting import ballot
+from app.features.voting.ballot import BallotCache, BallotSnapshot
+
+
+def test_slow_build_does_not_block_other_assemblies(monkeypatch: pytest.MonkeyPatch) -> None:
+    building = threading.Event()
+    release = threading.Event()
+
+    def _build(_db, assembly_id: int, tenant_id: int, version: int) -> BallotSnapshot:
+        if assembly_id == 1:
+            building.set()
+            release.wait(timeout=5)
+        return BallotSnapshot(assembly_id, tenant_id, version, None, b"{}", b"null")
+
+    monkeypatch.setattr(ballot, "build_ballot", _build)
+    cache = BallotCache()
+    slow = threading.Thread(target=cache.get_or_build, args=(None, 1, 100))
+    slow.start()
+    assert building.wait(timeout=5)
+
+    try:
+        assert cache.get_or_build(None, 2, 100).assembly_id == 2
+        assert slow.is_alive()
+    finally:
+        release.set()
+        slow.join(timeout=5)
+    assert cache.get(1) is not None
+
+
+def test_snapshot_built_across_an_invalidation_is_not_stored(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = BallotCache()
+
+    def _build(_db, assembly_id: int, tenant_id: int, version: int) -> BallotSnapshot:
+        cache.drop(assembly_id)
+        return BallotSnapshot(assembly_id, tenant_id, version, None, b"{}", b"null")
+
+    monkeypatch.setattr(ballot, "build_ballot", _build)
+    assert cache.get_or_build(None, 3, 100).assembly_id == 3
+    assert cache.get(3) is None
@@ -0,0 +1,50 @@
+"""Unit tests for the bounded TTL cache."""
+from __future__ import annotations
+
+import time
+
+from app.core.cache import TTLCache, VersionCounter
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_cache_expires_entries() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_seconds=0.01)
+    cache.set("a", 1)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_cache_skips_values_loaded_before_invalidation() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_seconds=60)
+    generation = cache.generation
+
+    cache.invalidate("a")
+    cache.set("a", 1, generation)
+
+    assert cache.get("a") is None
+
+
+def test_version_counter_reset_changes_unseen_keys() -> None:
+    versions: VersionCounter[int] = VersionCounter()
+    seen = versions.bump(1)
+    unseen = versions.get(2)
+
+    versions.bump_all()
+
+    assert versions.get(1) > seen
+    assert versions.get(2) > unseen
+    assert versions.bump(2) > versions.get(1)
@@ -0,0 +1,30 @@
+"""Unit tests for conditional GET helpers."""
+from __future__ import annotations
+
+from starlette.requests import Request
+
+from app.core.etag import is_not_modified, make_etag, not_modified
+
+
+def _request(if_none_match: str | None) -> Request:
+    headers = [] if if_none_match is None else [(b"if-none-match", if_none_match.encode())]
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_is_not_modified_matches_listed_and_weak_tags() -> None:
+    etag = make_etag("quorum", 1, 3)
+
+    assert is_not_modified(_request(etag), etag) is True
+    assert is_not_modified(_request(f'"other", W/{etag}'), etag) is True
+    assert is_not_modified(_request("*"), etag) is True
+    assert is_not_modified(_request('"other"'), etag) is False
+    assert is_not_modified(_request(None), etag) is False
+
+
+def test_not_modified_has_no_body() -> None:
+    response = not_modified('"v1"', "no-cache")
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == '"v1"'
+    assert response.headers["cache-control"] == "no-cache"
@@ -0,0 +1,91 @@
+"""Unit tests for pub/sub backends and cross-process cache sync."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.core.pubsub import PROCESS_ID, CacheSync, InMemoryBackend, _postgres_dsn
+from app.features.realtime.sse import EventBroadcaster
+
+
+class SharedMemoryBackend(InMemoryBackend):
+    """In-memory backend that claims to reach other processes."""
+
+    shared = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.published: list[tuple[str, dict]] = []
+
+    def publish(self, channel: str, message: dict) -> None:
+        self.published.append((channel, message))
+        super().publish(channel, message)
+
+
+def test_cache_sync_applies_only_remote_invalidations() -> None:
+    backend = SharedMemoryBackend()
+    sync = CacheSync(backend)
+    dropped: list[int] = []
+    resets: list[bool] = []
+    sync.register("tally", dropped.append, lambda: resets.append(True))
+
+    sync.publish("tally", 7)
+    backend.publish(CacheSync.CHANNEL, {"origin": "other-worker", "topic": "tally", "key": 8})
+    sync.reset()
+
+    assert backend.published[0] == (CacheSync.CHANNEL, {"origin": PROCESS_ID, "topic": "tally", "key": 7})
+    assert dropped == [8]
+    assert resets == [True]
+
+
+def test_cache_sync_does_not_publish_on_local_backend() -> None:
+    backend = SharedMemoryBackend()
+    backend.shared = False
+    sync = CacheSync(backend)
+
+    sync.publish("tally", 1)
+
+    assert backend.published == []
+
+
+@pytest.mark.asyncio
+async def test_cache_sync_publishes_from_the_event_loop() -> None:
+    backend = SharedMemoryBackend()
+    published: list[tuple[str, dict]] = []
+
+    async def _publish_async(channel: str, message: dict) -> None:
+        published.append((channel, message))
+
+    backend.publish_async = _publish_async
+    sync = CacheSync(backend)
+
+    await sync.publish_async("vote_updates", 3)
+
+    assert published == [(CacheSync.CHANNEL, {"origin": PROCESS_ID, "topic": "vote_updates", "key": 3})]
+    assert backend.published == []
+
+
+@pytest.mark.asyncio
+async def test_broadcasters_share_backend_without_crossing_channels() -> None:
+    backend = SharedMemoryBackend()
+    operators = EventBroadcaster("operator", backend)
+    voters = EventBroadcaster("voter", backend)
+    operator_queue = await operators.connect(assembly_id=5)
+    voter_queue = await voters.connect(assembly_id=5)
+
+    await operators.broadcast(5, "vote_update", {"votes_count": 1})
+    await operators.broadcast(6, "vote_update", {"votes_count": 1})
+
+    event = await asyncio.wait_for(operator_queue.get(), timeout=1)
+    assert event["data"] == {"votes_count": 1}
+    assert operator_queue.empty()
+    assert voter_queue.empty()
+    # Shared backends publish even without local subscribers (other workers may have some).
+    assert len(backend.published) == 2
+
+
+def test_postgres_dsn_drops_sqlalchemy_driver() -> None:
+    dsn = _postgres_dsn("postgresql+psycopg2://user:secret@db:5432/delibera")
+
+    assert dsn == "postgresql://user:secret@db:5432/delibera"
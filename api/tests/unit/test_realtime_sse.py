@@ -5,17 +5,13 @@ import asyncio
 
 import pytest
 
-from app.features.realtime.sse import EventBroadcaster, event_generator
-
-
-class DummyRequest:
-    """Minimal request stub for event_generator tests."""
-
-    def __init__(self) -> None:
-        self.disconnected = False
-
-    async def is_disconnected(self) -> bool:
-        return self.disconnected
+from app.features.realtime.sse import (
+    HEARTBEAT_FRAME,
+    EventBroadcaster,
+    HeartbeatTicker,
+    event_generator,
+    notify_agenda_status,
+)
 
 
 @pytest.mark.asyncio
@@ -35,21 +31,262 @@ async def test_broadcaster_connect_broadcast_disconnect() -> None:
 
 
 @pytest.mark.asyncio
-async def test_event_generator_emits_event_and_stops_on_disconnect() -> None:
-    queue: asyncio.Queue = asyncio.Queue()
-    request = DummyRequest()
+async def test_event_generator_emits_event_and_unregisters_on_disconnect() -> None:
+    broadcaster = EventBroadcaster()
+    queue = await broadcaster.connect(assembly_id=10)
 
     await queue.put({"type": "agenda_update", "data": {"agenda_id": 10}})
 
-    generator = event_generator(request, assembly_id=10, queue=queue)
+    generator = event_generator(assembly_id=10, queue=queue, source=broadcaster)
+
+    frame = await anext(generator)
+
+    assert frame == b'event: agenda_update\ndata: {"agenda_id":10}\n\n'
+
+    # StreamingResponse closes the generator when the client disconnects.
+    await generator.aclose()
+    assert 10 not in broadcaster.connections
+
+
+@pytest.mark.asyncio
+async def test_event_generator_filters_events_for_other_recipients() -> None:
+    voters = EventBroadcaster()
+    queue = await voters.connect(assembly_id=20)
+
+    await voters.broadcast(20, "ballot_update", {"has_voted": True}, recipient=2)
+    await voters.broadcast(20, "ballot_update", {"has_voted": True}, recipient=1)
+
+    generator = event_generator(assembly_id=20, queue=queue, source=voters, recipient=1)
+
+    frame = await anext(generator)
+    assert frame.endswith(b'event: ballot_update\ndata: {"has_voted":true}\n\n')
+    assert frame.startswith(b"id: ")
+    assert queue.empty()
+
+    await generator.aclose()
+    assert 20 not in voters.connections
+
+
+@pytest.mark.asyncio
+async def test_agenda_status_reaches_voter_channel(monkeypatch: pytest.MonkeyPatch) -> None:
+    voters = EventBroadcaster()
+    monkeypatch.setattr("app.features.realtime.sse.voter_broadcaster", voters)
+    queue = await voters.connect(assembly_id=30)
+
+    await notify_agenda_status(30, 7, "open")
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+
+    assert event["type"] == "agenda_update"
+    assert event["data"] == {"agenda_id": 7, "status": "open"}
+    assert "recipient" not in event
+
+
+@pytest.mark.asyncio
+async def test_full_queue_coalesces_state_events() -> None:
+    broadcaster = EventBroadcaster(queue_size=2, policy="coalesce")
+    queue = await broadcaster.connect(assembly_id=40)
+
+    await broadcaster.broadcast(40, "vote_update", {"agenda_id": 1, "votes_count": 1})
+    await broadcaster.broadcast(40, "checkin_update", {"units_present": 3})
+    await broadcaster.broadcast(40, "vote_update", {"agenda_id": 1, "votes_count": 2})
 
-    event_line = await anext(generator)
-    data_line = await anext(generator)
+    assert queue.qsize() == 2
+    assert (await queue.get())["data"] == {"agenda_id": 1, "votes_count": 2}
+    assert (await queue.get())["data"] == {"units_present": 3}
+    assert broadcaster.coalesced == 1
+    assert broadcaster.dropped == 0
 
-    assert event_line == "event: agenda_update\n"
-    assert data_line == 'data: {"agenda_id": 10}\n\n'
 
-    request.disconnected = True
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected() -> None:
+    broadcaster = EventBroadcaster(queue_size=1, policy="disconnect")
+    slow = await broadcaster.connect(assembly_id=41)
+
+    await broadcaster.broadcast(41, "vote_update", {"agenda_id": 1, "votes_count": 1})
+    await broadcaster.broadcast(41, "vote_update", {"agenda_id": 1, "votes_count": 2})
+
+    assert slow.closed is True
+    assert 41 not in broadcaster.connections
+    assert broadcaster.dropped == 1
+    assert broadcaster.disconnected == 1
 
+    generator = event_generator(assembly_id=41, queue=slow, source=broadcaster)
     with pytest.raises(StopAsyncIteration):
         await anext(generator)
+
+
+@pytest.mark.asyncio
+async def test_recipient_events_only_reach_their_connection() -> None:
+    voters = EventBroadcaster()
+    mine = await voters.connect(assembly_id=42, recipient=1)
+    other = await voters.connect(assembly_id=42, recipient=2)
+
+    await voters.broadcast(42, "ballot_update", {"has_voted": True}, recipient=1)
+    await voters.broadcast(42, "agenda_update", {"agenda_id": 3, "status": "open"})
+
+    assert mine.qsize() == 2
+    assert other.qsize() == 1
+
+
+@pytest.mark.asyncio
+async def test_frame_is_encoded_once_and_shared() -> None:
+    broadcaster = EventBroadcaster()
+    first = await broadcaster.connect(assembly_id=50)
+    second = await broadcaster.connect(assembly_id=50)
+
+    await broadcaster.broadcast(50, "vote_update", {"agenda_id": 1, "votes_count": 4})
+    await broadcaster.broadcast(50, "vote_update", {"agenda_id": 1, "votes_count": 5})
+
+    event_a = await first.get()
+    event_b = await second.get()
+    assert event_a["frame"] is event_b["frame"]
+    assert event_a["frame"] == (
+        f"id: {event_a['id']}\nevent: vote_update\ndata: {{\"agenda_id\":1,\"votes_count\":4}}\n\n".encode()
+    )
+    assert (await first.get())["id"] != event_a["id"]
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_missed_events() -> None:
+    broadcaster = EventBroadcaster(replay_size=3)
+    queue = await broadcaster.connect(assembly_id=60)
+    await broadcaster.broadcast(60, "checkin_update", {"units_present": 1})
+    last_seen = (await queue.get())["id"]
+    await broadcaster.disconnect(60, queue)
+
+    await broadcaster.broadcast(60, "checkin_update", {"units_present": 2})
+    await broadcaster.broadcast(60, "agenda_update", {"agenda_id": 1, "status": "open"})
+
+    frames = broadcaster.replay(60, last_seen)
+    assert [frame.split(b"\n")[1] for frame in frames] == [b"event: checkin_update", b"event: agenda_update"]
+    assert frames[0].endswith(b'data: {"units_present":2}\n\n')
+    assert broadcaster.replay(60, frames[-1].split(b"\n")[0][4:].decode()) == []
+
+    generator = event_generator(60, await broadcaster.connect(60), source=broadcaster, replay=frames)
+    assert await anext(generator) == frames[0]
+    assert await anext(generator) == frames[1]
+    await generator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_after_buffer_overflow_gets_resync() -> None:
+    broadcaster = EventBroadcaster(replay_size=2)
+    queue = await broadcaster.connect(assembly_id=61)
+    await broadcaster.broadcast(61, "checkin_update", {"units_present": 1})
+    last_seen = (await queue.get())["id"]
+    for count in range(2, 5):
+        await broadcaster.broadcast(61, "checkin_update", {"units_present": count})
+
+    frames = broadcaster.replay(61, last_seen)
+    assert frames == [b'event: resync\ndata: {"reason":"events_expired"}\n\n']
+    assert broadcaster.replay(62, "unknown-1") == frames
+
+
+@pytest.mark.asyncio
+async def test_missed_messages_push_resync_to_connected_clients() -> None:
+    broadcaster = EventBroadcaster()
+    queue = await broadcaster.connect(assembly_id=64)
+    await broadcaster.broadcast(64, "checkin_update", {"units_present": 1})
+    last_seen = (await queue.get())["id"]
+
+    broadcaster.backend._run_reconnect_hooks()
+
+    event = await asyncio.wait_for(queue.get(), timeout=1)
+    assert event["frame"] == b'event: resync\ndata: {"reason":"events_expired"}\n\n'
+    assert broadcaster.replay(64, last_seen) == [event["frame"]]
+
+
+@pytest.mark.asyncio
+async def test_replay_buffer_is_dropped_after_last_connection_expires() -> None:
+    broadcaster = EventBroadcaster(replay_retention=60)
+    queue = await broadcaster.connect(assembly_id=65)
+    await broadcaster.broadcast(65, "checkin_update", {"units_present": 1})
+    last_seen = (await queue.get())["id"]
+    await broadcaster.disconnect(65, queue)
+
+    await broadcaster.broadcast(65, "checkin_update", {"units_present": 2})
+    assert len(broadcaster.replay(65, last_seen)) == 1
+
+    broadcaster.replay_retention = 0
+    await broadcaster.broadcast(65, "checkin_update", {"units_present": 3})
+    assert 65 not in broadcaster.history
+    assert broadcaster.replay(65, last_seen) == [b'event: resync\ndata: {"reason":"events_expired"}\n\n']
+
+
+@pytest.mark.asyncio
+async def test_replay_skips_other_recipients() -> None:
+    voters = EventBroadcaster()
+    queue = await voters.connect(assembly_id=63, recipient=1)
+    await voters.broadcast(63, "ballot_update", {"has_voted": False}, recipient=1)
+    last_seen = (await queue.get())["id"]
+
+    await voters.broadcast(63, "ballot_update", {"has_voted": True}, recipient=2)
+    await voters.broadcast(63, "ballot_update", {"has_voted": True}, recipient=1)
+
+    frames = voters.replay(63, last_seen, recipient=1)
+    assert len(frames) == 1
+    assert frames[0].endswith(b'data: {"has_voted":true}\n\n')
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_ticker_only_pings_idle_connections() -> None:
+    ticker = HeartbeatTicker(interval=3600)
+    broadcaster = EventBroadcaster(ticker=ticker)
+    busy = await broadcaster.connect(assembly_id=70)
+    idle = await broadcaster.connect(assembly_id=71)
+
+    idle.last_event -= 1800
+    await broadcaster.broadcast(70, "vote_update", {"agenda_id": 1, "votes_count": 1})
+    sent = busy.last_event
+    assert ticker.tick(now=sent + 1000) == 2
+    assert busy.qsize() == 1
+    assert idle.qsize() == 1
+
+    generator = event_generator(71, idle, source=broadcaster)
+    assert await anext(generator) == HEARTBEAT_FRAME
+    await generator.aclose()
+
+    # Half the interval without a write is enough for the next heartbeat.
+    await busy.get()
+    assert ticker.tick(now=sent + 1799) == 1
+    assert busy.empty()
+    assert ticker.tick(now=sent + 1800) == 1
+    assert (await busy.get())["frame"] == HEARTBEAT_FRAME
+
+    await broadcaster.disconnect(70, busy)
+    assert ticker.tick() == 0
+    ticker.stop()
+
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_connections_counters_and_latency() -> None:
+    broadcaster = EventBroadcaster("operator", queue_size=2, policy="disconnect")
+    reader = await broadcaster.connect(assembly_id=80)
+    await broadcaster.connect(assembly_id=81)
+    await broadcaster.connect(assembly_id=81)
+    await broadcaster.connect(assembly_id=82)
+
+    await broadcaster.broadcast(80, "checkin_update", {"units_present": 1})
+    await broadcaster.broadcast(80, "checkin_update", {"units_present": 2})
+    generator = event_generator(80, reader, source=broadcaster)
+    await anext(generator)
+    await anext(generator)  # resuming after the first write records its latency
+    await generator.aclose()
+
+    await broadcaster.broadcast(81, "checkin_update", {"units_present": 1})
+    for count in range(1, 4):
+        await broadcaster.broadcast(82, "agenda_update", {"agenda_id": count, "status": "open"})
+
+    metrics = broadcaster.metrics()
+    assert metrics["channel"] == "operator"
+    assert metrics["connections"] == 2
+    assert metrics["published"] == 6
+    assert metrics["delivered"] == 6
+    assert metrics["dropped"] == 1
+    assert metrics["disconnected"] == 1
+    assert metrics["assemblies"] == [
+        {"assembly_id": 81, "connections": 2, "queued_events": 2, "max_queue_depth": 1},
+    ]
+    assert metrics["fanout_latency"]["count"] == 1
+    assert metrics["fanout_latency"]["buckets"][-1] == {"le": "+Inf", "count": 1}
@@ -0,0 +1,54 @@
+"""Unit tests for the check-in desk unit search index."""
+from __future__ import annotations
+
+from app.features.checkin.search import IndexedUnit, UnitSearchIndex
+
+
+def _index() -> UnitSearchIndex:
+    units = [
+        IndexedUnit(1, "101", "José da Silva", 1.0, "123.456.789-01"),
+        IndexedUnit(2, "102", "Maria Souza", 1.0, "987.654.321-00"),
+        IndexedUnit(3, "1010", "Ana Silveira", 1.0, "12.345.678/0001-90"),
+        IndexedUnit(4, "B-12", "Joao Silva Neto", 1.0, "111.222.333-44"),
+    ]
+    return UnitSearchIndex(1, units)
+
+
+def _ids(index: UnitSearchIndex, query: str, limit: int = 20) -> list[int]:
+    return [unit.id for unit in index.search(query, limit)]
+
+
+def test_search_matches_unit_number_prefix() -> None:
+    index = _index()
+
+    assert _ids(index, "101") == [1, 3]
+    assert _ids(index, "b-1") == [4]
+
+
+def test_search_matches_owner_word_prefixes_ignoring_case_and_accents() -> None:
+    index = _index()
+
+    assert _ids(index, "silv") == [3, 4, 1]
+    assert _ids(index, "JOSE sil") == [1]
+    assert _ids(index, "jo si") == [4, 1]
+    assert _ids(index, "souza ana") == []
+
+
+def test_search_matches_exact_document_with_or_without_punctuation() -> None:
+    index = _index()
+
+    assert _ids(index, "98765432100") == [2]
+    assert _ids(index, "12.345.678/0001-90") == [3]
+    assert _ids(index, "9876543210") == []
+
+
+def test_search_ranks_documents_then_unit_numbers_then_owners_and_applies_limit() -> None:
+    units = [
+        IndexedUnit(1, "7", "Owner 7", 1.0, "7"),
+        IndexedUnit(2, "70", "Owner 70", 1.0, "70"),
+        IndexedUnit(3, "C1", "Owner 7 Junior", 1.0, "71"),
+    ]
+    index = UnitSearchIndex(1, units)
+
+    assert _ids(index, "7") == [1, 2, 3]
+    assert _ids(index, "7", limit=2) == [1, 2]
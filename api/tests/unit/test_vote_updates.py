@@ -0,0 +1,106 @@
+"""Unit tests for rate-limited vote_update events."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.features.realtime.vote_updates import VoteUpdateCoalescer
+from app.features.voting.tally import AgendaTally, TallyOption, TallyRegistry
+
+
+def _registry() -> TallyRegistry:
+    registry = TallyRegistry()
+    tally = AgendaTally(
+        agenda_id=1,
+        assembly_id=10,
+        tenant_id=100,
+        options=[TallyOption(option_id=1, option_text="Sim"), TallyOption(option_id=2, option_text="Nao")],
+    )
+    registry.store(tally, registry.version(1))
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_votes_are_batched_with_option_deltas() -> None:
+    registry = _registry()
+    sent: list[tuple[int, dict]] = []
+
+    async def _send(assembly_id: int, data: dict) -> None:
+        sent.append((assembly_id, data))
+
+    coalescer = VoteUpdateCoalescer(rate=10, send=_send, load=lambda *_: None, registry=registry)
+
+    registry.record_votes(1, 1, [(1, 2.5)])
+    coalescer.mark(10, 1)
+    await asyncio.sleep(0)
+    assert len(sent) == 1
+    assert sent[0][1]["votes_count"] == 1
+
+    for unit_id in (2, 3, 4):
+        registry.record_votes(1, 2, [(unit_id, 1.5)])
+        coalescer.mark(10, 1)
+    await asyncio.sleep(0)
+    assert len(sent) == 1
+
+    await asyncio.sleep(0.15)
+    assert len(sent) == 2
+    assembly_id, data = sent[1]
+    assert assembly_id == 10
+    assert data["votes_count"] == 4
+    assert data["fraction_voted"] == pytest.approx(7.0)
+    assert data["options"] == [
+        {"option_id": 1, "votes_count": 1, "fraction_sum": 2.5, "votes_delta": 0, "fraction_delta": 0.0},
+        {"option_id": 2, "votes_count": 3, "fraction_sum": 4.5, "votes_delta": 3, "fraction_delta": 4.5},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cold_tally_is_loaded_off_the_vote_path() -> None:
+    registry = _registry()
+    registry.record_votes(1, 1, [(1, 2.5)])
+    snapshot = registry.get(1).snapshot()
+    registry.drop(1)
+    sent: list[dict] = []
+    loads: list[tuple[int, int]] = []
+
+    async def _send(_assembly_id: int, data: dict) -> None:
+        sent.append(data)
+
+    def _load(assembly_id: int, agenda_id: int):
+        loads.append((assembly_id, agenda_id))
+        return snapshot
+
+    coalescer = VoteUpdateCoalescer(rate=10, send=_send, load=_load, registry=registry)
+    coalescer.mark(10, 1)
+    assert loads == []
+
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+        if sent:
+            break
+    assert loads == [(10, 1)]
+    assert sent[0]["votes_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_closed_agenda_is_forgotten_after_its_last_event() -> None:
+    registry = _registry()
+    sent: list[tuple[int, dict]] = []
+
+    async def _send(assembly_id: int, data: dict) -> None:
+        sent.append((assembly_id, data))
+
+    coalescer = VoteUpdateCoalescer(rate=10, send=_send, load=lambda *_: None, registry=registry)
+    registry.record_votes(1, 1, [(1, 2.5)])
+    coalescer.mark(10, 1)
+    await asyncio.sleep(0)
+    registry.record_votes(1, 2, [(2, 1.5)])
+    coalescer.mark(10, 1)
+
+    coalescer.forget(1)
+    await asyncio.sleep(0.15)
+
+    assert len(sent) == 2
+    assert coalescer._sent == {}
+    assert coalescer._last_flush == {}
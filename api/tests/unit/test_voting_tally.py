@@ -0,0 +1,99 @@
+"""Unit tests for in-memory agenda tallies."""
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from app.features.voting import tally
+from app.features.voting.tally import AgendaTally, TallyOption, TallyRegistry
+
+
+def _tally() -> AgendaTally:
+    return AgendaTally(
+        agenda_id=1,
+        assembly_id=10,
+        tenant_id=100,
+        options=[TallyOption(option_id=1, option_text="Sim"), TallyOption(option_id=2, option_text="Nao")],
+    )
+
+
+def test_tally_counts_votes_and_fractions() -> None:
+    tally = _tally()
+    tally.add_vote(unit_id=1, option_id=1, ideal_fraction=2.5)
+    tally.add_vote(unit_id=2, option_id=2, ideal_fraction=1.25)
+    tally.add_vote(unit_id=1, option_id=2, ideal_fraction=2.5)
+
+    snapshot = tally.snapshot()
+
+    assert snapshot.option_counts == {1: 1, 2: 1}
+    assert snapshot.option_fractions == {1: 2.5, 2: 1.25}
+    assert snapshot.total_units_voted == 2
+    assert snapshot.total_fraction_voted == pytest.approx(3.75)
+
+
+def test_tally_remove_vote() -> None:
+    tally = _tally()
+    tally.add_vote(unit_id=1, option_id=1, ideal_fraction=2.5)
+    tally.remove_vote(unit_id=1)
+    tally.remove_vote(unit_id=1)
+
+    snapshot = tally.snapshot()
+
+    assert snapshot.option_counts == {1: 0, 2: 0}
+    assert snapshot.total_units_voted == 0
+    assert snapshot.total_fraction_voted == 0.0
+
+
+def test_registry_discards_tally_built_during_mutation() -> None:
+    registry = TallyRegistry()
+    version = registry.version(1)
+    registry.record_votes(1, 1, [(5, 1.0)])
+
+    registry.store(_tally(), version)
+
+    assert registry.get(1) is None
+
+
+def test_registry_applies_votes_to_cached_tally() -> None:
+    registry = TallyRegistry()
+    registry.store(_tally(), registry.version(1))
+
+    registry.record_votes(1, 2, [(5, 1.0), (6, 2.0)])
+    registry.record_invalidation(1, 5)
+
+    snapshot = registry.get(1).snapshot()
+    assert snapshot.option_counts[2] == 1
+    assert snapshot.total_fraction_voted == pytest.approx(2.0)
+
+    registry.invalidate(1)
+    assert registry.get(1) is None
+
+
+def test_remote_votes_are_applied_as_deltas(monkeypatch: pytest.MonkeyPatch) -> None:
+    published: list[tuple[str, dict]] = []
+    monkeypatch.setattr(tally.cache_sync, "publish", lambda topic, key: published.append((topic, key)))
+    local = TallyRegistry()
+    remote = TallyRegistry()
+    remote.store(_tally(), remote.version(1))
+    version = remote.version(1)
+    handlers = {"tally_votes": remote.apply_votes, "tally_invalidation": remote.apply_invalidation}
+
+    local.record_votes(1, 2, [(5, Decimal("1.25")), (6, 2.0)])
+    local.record_invalidation(1, 6)
+    for topic, key in published:
+        handlers[topic](json.loads(json.dumps(key)))
+
+    snapshot = remote.get(1).snapshot()
+    assert snapshot.option_counts[2] == 1
+    assert snapshot.option_fractions[2] == pytest.approx(1.25)
+    assert remote.version(1) > version
+
+
+def test_has_voted_checks_any_unit() -> None:
+    tally = AgendaTally(1, 1, 1, [TallyOption(10, "Sim")])
+    tally.add_vote(5, 10, 1.0)
+
+    assert tally.has_voted([4, 5]) is True
+    assert tally.has_voted([4]) is False
@@ -1,5 +1,7 @@
+import { useCallback, useRef } from 'react';
 import { useMutation, useQuery, useQueryClient } from '@tanstack/react-query';
 import { toast } from 'sonner';
+import { useSSE, type SSEEventPayload } from '@/hooks/useSSE';
 import { api, APIError } from '@/lib/api-client';
 import type { AgendaResponse, AssemblyResponse } from '@/types/api';
 
@@ -31,15 +33,34 @@ function getErrorMessage(error: unknown, fallback: string) {
 
 export function useVoting(token: string) {
   const queryClient = useQueryClient();
+  const streamOpenRef = useRef(false);
 
   const statusQuery = useQuery({
     queryKey: ['voting', token],
     queryFn: () => api.get<VotingStatusResponse>(`/api/v1/voting/status/${token}`),
     enabled: Boolean(token),
-    refetchInterval: 5000,
+    refetchInterval: (query) => (streamOpenRef.current && query.state.status === 'success' ? false : 5000),
     retry: 1,
   });
 
+  // Agenda open/close and has-voted changes are pushed; polling is only a fallback.
+  const handleEvent = useCallback(
+    (payload: SSEEventPayload) => {
+      if (payload.event !== 'heartbeat') {
+        queryClient.invalidateQueries({ queryKey: ['voting', token] });
+      }
+    },
+    [queryClient, token]
+  );
+
+  const stream = useSSE({
+    endpoint: `/api/v1/realtime/voting/${token}/stream`,
+    enabled: Boolean(token) && statusQuery.isSuccess,
+    withCredentials: false,
+    onEvent: handleEvent,
+  });
+  streamOpenRef.current = stream.status === 'open';
+
   const voteMutation = useMutation({
     mutationFn: ({ agenda_id, option_id }: CastVotePayload) =>
       api.post('/api/v1/voting/vote', {
@@ -22,6 +22,15 @@ export function useRealtimeAssembly(assemblyId: number) {
 
   const handleEvent = useCallback(
     (payload: { event: string; data: unknown }) => {
+      if (payload.event === 'resync') {
+        // Missed events are no longer buffered on the server: refetch everything.
+        queryClient.invalidateQueries({ queryKey: ['operator', 'agendas', assemblyId] });
+        queryClient.invalidateQueries({ queryKey: ['operator', 'agenda-results'] });
+        queryClient.invalidateQueries({ queryKey: ['checkin', 'attendance', assemblyId] });
+        queryClient.invalidateQueries({ queryKey: ['checkin', 'quorum', assemblyId] });
+        return;
+      }
+
       if (payload.event === 'vote_update') {
         const data = payload.data as VoteUpdatePayload;
         if (typeof data.agenda_id === 'number') {
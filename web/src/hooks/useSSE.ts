@@ -35,6 +35,7 @@ export function useSSE({
   const eventSourceRef = useRef<EventSource | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
   const onEventRef = useRef<typeof onEvent>(onEvent);
+  const lastEventIdRef = useRef<string | null>(null);
 
   const url = useMemo(() => `${API_BASE_URL}${endpoint}`, [endpoint]);
 
@@ -47,6 +48,7 @@ export function useSSE({
     }
 
     let cancelled = false;
+    lastEventIdRef.current = null;
 
     const clearReconnect = () => {
       if (reconnectTimeoutRef.current !== null) {
@@ -70,7 +72,11 @@ export function useSSE({
       }, reconnectDelayMs);
     };
 
-    const handleMessage = (eventName: string, rawData: string) => {
+    const handleMessage = (eventName: string, event: MessageEvent) => {
+      if (event.lastEventId) {
+        lastEventIdRef.current = event.lastEventId;
+      }
+      const rawData: string = event.data;
       let parsedData: unknown = rawData;
       try {
         parsedData = JSON.parse(rawData);
@@ -89,7 +95,13 @@ export function useSSE({
       clearReconnect();
       setStatus('connecting');
 
-      const source = new EventSource(url, { withCredentials });
+      // A new EventSource does not send Last-Event-ID, so pass it explicitly
+      // to get the events missed while disconnected replayed.
+      const lastEventId = lastEventIdRef.current;
+      const sourceUrl = lastEventId
+        ? `${url}${url.includes('?') ? '&' : '?'}last_event_id=${encodeURIComponent(lastEventId)}`
+        : url;
+      const source = new EventSource(sourceUrl, { withCredentials });
       eventSourceRef.current = source;
 
       source.onopen = () => {
@@ -105,16 +117,22 @@ export function useSSE({
       };
 
       source.addEventListener('vote_update', (event) => {
-        handleMessage('vote_update', (event as MessageEvent).data);
+        handleMessage('vote_update', event as MessageEvent);
       });
       source.addEventListener('checkin_update', (event) => {
-        handleMessage('checkin_update', (event as MessageEvent).data);
+        handleMessage('checkin_update', event as MessageEvent);
       });
       source.addEventListener('agenda_update', (event) => {
-        handleMessage('agenda_update', (event as MessageEvent).data);
+        handleMessage('agenda_update', event as MessageEvent);
+      });
+      source.addEventListener('ballot_update', (event) => {
+        handleMessage('ballot_update', event as MessageEvent);
+      });
+      source.addEventListener('resync', (event) => {
+        handleMessage('resync', event as MessageEvent);
       });
       source.addEventListener('heartbeat', (event) => {
-        handleMessage('heartbeat', (event as MessageEvent).data);
+        handleMessage('heartbeat', event as MessageEvent);
       });
     };
 